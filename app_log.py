@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结构化日志 - 日志先放进有界的内存队列，由后台线程写入按大小轮转的 JSON Lines 文件
+
+    log = app_log.get_logger(__name__)
+    log.info("定时器已启动", intervals=intervals)
+    log.error(f"保存设置时出错: {e}", file=path)
+
+    - 记录日志只是把一条记录放进队列，不会等待磁盘或终端；队列满时丢弃并计数
+    - 每行一条 JSON：{"ts", "level", "module", "msg", 以及调用时传入的其他字段}
+    - 日志级别按模块设置（config.LOG_LEVELS），低于级别的日志在放进队列前就被过滤
+    - 控制台输出也由后台线程完成：标准输出是没人读取的管道时只会卡住后台线程，
+      队列满后新日志被丢弃，界面线程不受影响
+
+后台线程在第一次记录日志时才启动，进程退出时写完队列中剩余的日志。
+"""
+
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+try:
+    import config
+except ImportError:
+    config = None
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning", ERROR: "error"}
+_LEVELS_BY_NAME = {name: level for level, name in LEVEL_NAMES.items()}
+
+
+def parse_level(value):
+    """把 "info"、"WARNING" 或数字转换为日志级别"""
+    if isinstance(value, int):
+        return value
+    try:
+        return _LEVELS_BY_NAME[str(value).lower()]
+    except KeyError:
+        raise ValueError(f"未知的日志级别: {value!r}（可用: {', '.join(_LEVELS_BY_NAME)}）")
+
+
+class Logger:
+    """某个模块的日志记录器，由 get_logger 创建"""
+
+    __slots__ = ("name", "level")
+
+    def __init__(self, name, level):
+        self.name = name
+        self.level = level
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def log(self, level, message, **fields):
+        if level < self.level:
+            return
+        _pipeline().submit((time.time(), level, self.name, message, fields))
+
+    def debug(self, message, **fields):
+        self.log(DEBUG, message, **fields)
+
+    def info(self, message, **fields):
+        self.log(INFO, message, **fields)
+
+    def warning(self, message, **fields):
+        self.log(WARNING, message, **fields)
+
+    def error(self, message, **fields):
+        self.log(ERROR, message, **fields)
+
+
+class LogPipeline:
+    """日志队列和后台写入线程"""
+
+    def __init__(self, path=None, max_bytes=1024 * 1024, backup_count=3,
+                 queue_size=1000, console=True):
+        """
+        path: 日志文件路径，None 表示不写文件
+        max_bytes: 日志文件超过这个大小时轮转，保留 backup_count 个旧文件（.1 最新）
+        queue_size: 队列容量，写入跟不上时超出的日志被丢弃
+        console: 是否同时输出到标准输出
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.console = console
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._lock = threading.Lock()
+        self._writer = None
+        self._closed = False
+        self.dropped = 0   # 队列满时丢弃的日志数
+        self.written = 0   # 已写出的日志数
+        self._reported_drops = 0
+
+    def submit(self, record):
+        """放进一条日志记录（不阻塞，队列满时丢弃并计数）"""
+        if self._writer is None:
+            self._start()
+        elif self._closed and not self._writer.is_alive():
+            # 管道已关闭（如 atexit 中较晚执行的清理函数），直接写出
+            self._write([record])
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stats(self):
+        return {"queued": self._queue.qsize(), "written": self.written, "dropped": self.dropped}
+
+    def close(self, timeout=2.0):
+        """写完队列中剩余的日志后停止后台线程"""
+        with self._lock:
+            if self._writer is None or self._closed:
+                return
+            self._closed = True
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._writer.join(timeout)
+
+    def _start(self):
+        with self._lock:
+            if self._writer is None and not self._closed:
+                self._writer = threading.Thread(target=self._writer_loop, name="log-writer", daemon=True)
+                self._writer.start()
+
+    # ---- 写入（后台线程） ----
+
+    def _writer_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            # 一次取出队列中积攒的全部日志，合并为一次写入
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            records = [record for record in batch if record is not None]
+            if self.dropped != self._reported_drops:
+                records.append((time.time(), WARNING, __name__,
+                                f"日志队列已满，丢弃了 {self.dropped - self._reported_drops} 条日志",
+                                {"dropped_total": self.dropped}))
+                self._reported_drops = self.dropped
+            self._write(records)
+            if stop:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write(self, records):
+        if self.path is not None:
+            lines = "".join(self._format_json(record) for record in records)
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(lines)
+                self._file.flush()
+                if self._file.tell() > self.max_bytes:
+                    self._rotate()
+            except OSError as e:
+                # 日志文件不可写时只输出到控制台
+                self.path = None
+                self._file = None
+                self._write_console(f"写入日志文件时出错，不再写入文件: {e}\n")
+        self.written += len(records)
+        if self.console:
+            self._write_console("".join(self._format_text(record) for record in records))
+
+    @staticmethod
+    def _write_console(text):
+        stream = sys.stdout
+        if stream is None:
+            return  # 没有控制台（如 pythonw、打包为窗口程序）
+        try:
+            stream.write(text)
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _format_json(record):
+        ts, level, module, message, fields = record
+        entry = {"ts": datetime.fromtimestamp(ts).isoformat(timespec="milliseconds"),
+                 "level": LEVEL_NAMES.get(level, str(level)), "module": module, "msg": message}
+        entry.update(fields)
+        return json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+
+    @staticmethod
+    def _format_text(record):
+        ts, _, _, message, _ = record
+        return f"[{datetime.fromtimestamp(ts).strftime('%H:%M:%S')}] {message}\n"
+
+    def _rotated_path(self, index):
+        root, ext = os.path.splitext(self.path)
+        return f"{root}.{index}{ext}"
+
+    def _rotate(self):
+        """当前文件改名为 .1，已有的备份依次后移，超出数量的删除"""
+        self._file.close()
+        self._file = None
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self._rotated_path(index)
+            if os.path.exists(source):
+                os.replace(source, self._rotated_path(index + 1))
+        if self.backup_count > 0:
+            os.replace(self.path, self._rotated_path(1))
+        else:
+            os.remove(self.path)
+
+
+_PIPELINE = None
+_LOGGERS = {}
+_LEVELS = None  # 模块名 -> 日志级别，"" 为默认级别
+
+
+def _pipeline():
+    global _PIPELINE
+    if _PIPELINE is None:
+        path = getattr(config, "LOG_FILE", "logs/eyecare.log")
+        if path:
+            from app_paths import data_path
+            path = data_path(path)
+        configure(LogPipeline(path=path or None,
+                              max_bytes=getattr(config, "LOG_MAX_BYTES", 1024 * 1024),
+                              backup_count=getattr(config, "LOG_BACKUP_COUNT", 3),
+                              queue_size=getattr(config, "LOG_QUEUE_SIZE", 1000),
+                              console=getattr(config, "LOG_CONSOLE", True)))
+    return _PIPELINE
+
+
+def configure(pipeline):
+    """替换日志管道（之前的管道写完剩余日志后停止）"""
+    global _PIPELINE
+    previous, _PIPELINE = _PIPELINE, pipeline
+    if previous is not None:
+        previous.close()
+
+
+def _configured_levels():
+    global _LEVELS
+    if _LEVELS is None:
+        levels = {"": parse_level(getattr(config, "LOG_LEVEL", "info"))}
+        for name, level in getattr(config, "LOG_LEVELS", {}).items():
+            levels[name] = parse_level(level)
+        _LEVELS = levels
+    return _LEVELS
+
+
+def _level_for(name):
+    """按模块名查找级别：先找完全匹配，再依次找上级包（a.b.c -> a.b -> a），最后用默认级别"""
+    levels = _configured_levels()
+    while name:
+        if name in levels:
+            return levels[name]
+        name = name.rpartition(".")[0]
+    return levels[""]
+
+
+def get_logger(name):
+    """获取模块的日志记录器，通常传入 __name__"""
+    logger = _LOGGERS.get(name)
+    if logger is None:
+        logger = _LOGGERS[name] = Logger(name, _level_for(name))
+    return logger
+
+
+def set_level(name, level):
+    """运行时修改某个模块（"" 为默认）的日志级别"""
+    _configured_levels()[name] = parse_level(level)
+    for logger in _LOGGERS.values():
+        logger.level = _level_for(logger.name)
+
+
+def stats():
+    """日志管道的计数：队列中、已写出、已丢弃"""
+    if _PIPELINE is None:
+        return {"queued": 0, "written": 0, "dropped": 0}
+    return _PIPELINE.stats()
+
+
+def shutdown(timeout=2.0):
+    """写完队列中剩余的日志"""
+    if _PIPELINE is not None:
+        _PIPELINE.close(timeout)
+
+
+atexit.register(shutdown)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+程序目录和数据目录
+
+从源码运行时，用户设置、提醒计划、提醒历史、日志、锁文件等可写文件都放在项目目录中（与以前相同）。
+打包后（sys.frozen）程序代码位于安装目录的 _internal/ 中，该目录可能只读，升级时还会被整个替换，
+因此可写文件改放到当前用户的数据目录:
+    Windows   %LOCALAPPDATA%\\Eyecare
+    macOS     ~/Library/Application Support/Eyecare
+    其他      $XDG_DATA_HOME/eyecare（默认 ~/.local/share/eyecare）
+设置环境变量 EYECARE_DATA_DIR 可以指定其他目录（源码运行时也有效）。
+
+本模块不依赖 Qt，也不导入其他项目模块。
+"""
+
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_data_dir = None
+
+
+def _default_data_dir():
+    if not getattr(sys, "frozen", False):
+        return BASE_DIR
+    if os.name == "nt":
+        root = os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA") or os.path.expanduser("~")
+        return os.path.join(root, "Eyecare")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Application Support/Eyecare")
+    root = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(root, "eyecare")
+
+
+def data_dir():
+    """可写文件所在的目录（第一次调用时创建）"""
+    global _data_dir
+    if _data_dir is None:
+        path = os.environ.get("EYECARE_DATA_DIR") or _default_data_dir()
+        os.makedirs(path, exist_ok=True)
+        _data_dir = path
+    return _data_dir
+
+
+def data_path(*parts):
+    """数据目录下的路径；parts 为绝对路径时原样返回"""
+    return os.path.join(data_dir(), *parts)
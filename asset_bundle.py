@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+资源包 - 全部图片按窗口实际使用的尺寸预先缩放，打包成一个可内存映射的文件
+
+    python asset_bundle.py build [--output assets.pak] [--scales 1,1.5,2]   生成资源包
+    python asset_bundle.py list [资源包路径]                                 列出资源包内容
+
+eyecare.spec 打包前会自动生成资源包，打包后的程序只带资源包，不再带图片文件。
+
+文件格式：文件头（魔数、索引长度、数据起始位置）、JSON 索引、按 64 字节对齐的像素数据。
+每张图片保存为预乘 ARGB32 的原始像素，QImage 直接引用映射的内存，不解码、不缩放；
+转成 QPixmap 时像素会复制一次（和从图片文件加载相同）。
+
+原始像素比 JPEG 大得多：每个缩放比例约 4 MiB（2x 约 16 MiB），源图片合计约 0.5 MiB。
+因此默认只打包 1x（ASSET_BUNDLE_SCALES），其他缩放比例的屏幕按需从源图片解码缩放，
+结果由 image_cache 的磁盘缓存保存，之后的启动同样不再解码。
+
+运行时第一次取图片或图标时打开并映射资源包，之后都只查索引。资源包不存在、已过期
+（从源码运行且源图片被修改过）或不含所需尺寸时，回退到 image_cache 从程序目录读取图片文件。
+图片路径都以程序目录为准，与当前工作目录无关。
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon, QImage, QPixmap
+
+import app_log
+
+try:
+    import config
+except ImportError:
+    config = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+log = app_log.get_logger("asset_bundle")
+
+# 托盘和设置窗口的程序图标
+APP_ICON = "drink.png"
+
+# 文件头：魔数、JSON 索引的字节数、像素数据的起始位置
+_HEADER = struct.Struct("<8sII")
+_MAGIC = b"EYEPAK01"
+_ALIGN = 64
+
+KIND_IMAGE = "image"
+KIND_ICON = "icon"
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def image_aspect_mode(reminder_type):
+    """提醒图片缩放到图片区域时的宽高比处理方式"""
+    return Qt.KeepAspectRatio if reminder_type.keep_aspect else Qt.IgnoreAspectRatio
+
+
+class AssetBundle:
+    """只读的资源包，按名称和尺寸查找图片"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_size, data_start = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC:
+            raise ValueError(f"不是资源包文件: {path}")
+        index = json.loads(self._map[_HEADER.size:_HEADER.size + index_size].decode("utf-8"))
+        self.sources = index["sources"]  # 名称 -> [源文件大小, 修改时间]
+        self.entries = index["entries"]
+        self._data_start = data_start
+        self._images = {}  # (名称, 宽, 高, 缩放模式) -> {设备像素比: 条目}
+        self._icons = {}   # 名称 -> [条目, ...]
+        for entry in self.entries:
+            if entry["kind"] == KIND_ICON:
+                self._icons.setdefault(entry["name"], []).append(entry)
+            else:
+                key = (entry["name"], entry["width"], entry["height"], entry["mode"])
+                self._images.setdefault(key, {})[entry["dpr"]] = entry
+
+    def changed_sources(self, base_dir=BASE_DIR):
+        """打包后被修改过的源图片（源图片不存在时视为未修改，如打包后的程序）"""
+        changed = []
+        for name, (size, mtime) in self.sources.items():
+            try:
+                st = os.stat(os.path.join(base_dir, name))
+            except OSError:
+                continue
+            if st.st_size != size or st.st_mtime_ns != mtime:
+                changed.append(name)
+        return changed
+
+    def _qimage(self, entry):
+        start = self._data_start + entry["offset"]
+        length = entry["bytes_per_line"] * entry["pixel_height"]
+        # QImage 引用映射的内存，资源包在进程退出前一直保持映射
+        image = QImage(memoryview(self._map)[start:start + length],
+                       entry["pixel_width"], entry["pixel_height"],
+                       entry["bytes_per_line"], QImage.Format(entry["format"]))
+        image.setDevicePixelRatio(entry["dpr"])
+        return image
+
+    def image(self, name, width, height, dpr=1.0, aspect_mode=Qt.KeepAspectRatio):
+        """设备像素比完全一致的图片，没有时返回 None"""
+        scales = self._images.get((name, int(width), int(height), int(aspect_mode)))
+        entry = scales.get(round(float(dpr), 2)) if scales else None
+        return self._qimage(entry) if entry is not None else None
+
+    def nearest_image(self, name, width, height, dpr=1.0, aspect_mode=Qt.KeepAspectRatio):
+        """设备像素比最接近的图片（优先不小于 dpr 的），没有该尺寸时返回 None"""
+        scales = self._images.get((name, int(width), int(height), int(aspect_mode)))
+        if not scales:
+            return None
+        larger = [scale for scale in scales if scale >= dpr]
+        return self._qimage(scales[min(larger) if larger else max(scales)])
+
+    def icon_images(self, name):
+        """图标的各个尺寸"""
+        return [self._qimage(entry) for entry in self._icons.get(name, ())]
+
+
+def bundle_path():
+    """配置的资源包路径，未启用时返回 None"""
+    path = getattr(config, "ASSET_BUNDLE", "assets.pak")
+    return os.path.join(BASE_DIR, path) if path else None
+
+
+_bundle = None
+_bundle_loaded = False
+
+
+def get_bundle():
+    """获取进程内共享的资源包，没有可用的资源包时返回 None"""
+    global _bundle, _bundle_loaded
+    if _bundle_loaded:
+        return _bundle
+    _bundle_loaded = True
+    path = bundle_path()
+    if path is None:
+        return None
+    try:
+        bundle = AssetBundle(path)
+    except FileNotFoundError:
+        log.debug("没有资源包，直接读取图片文件", path=path)
+        return None
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        log.warning(f"无法读取资源包，直接读取图片文件: {e}", path=path)
+        return None
+    if not getattr(sys, "frozen", False):
+        changed = bundle.changed_sources()
+        if changed:
+            log.warning(f"资源包已过期（{', '.join(changed)} 已修改），直接读取图片文件；"
+                        "请重新运行 python asset_bundle.py build")
+            return None
+    _bundle = bundle
+    return _bundle
+
+
+def _to_pixmap(image):
+    pixmap = QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(image.devicePixelRatio())
+    return pixmap
+
+
+def get_pixmap(name, width, height, dpr=1.0, aspect_mode=Qt.KeepAspectRatio):
+    """获取缩放到 width x height（逻辑像素）的图片，失败时返回空 QPixmap
+
+    name 为相对程序目录的图片路径，如 "eye/eye.jpg"。
+    """
+    dpr = round(float(dpr), 2)
+    bundle = get_bundle()
+    if bundle is not None:
+        image = bundle.image(name, width, height, dpr, aspect_mode)
+        if image is not None:
+            return _to_pixmap(image)
+
+    from image_cache import get_image_cache
+
+    pixmap = get_image_cache().get_pixmap(os.path.join(BASE_DIR, name), width, height,
+                                          dpr, aspect_mode)
+    if pixmap.isNull() and bundle is not None:
+        # 没有源图片：用资源包中最接近的比例，绘制时由 Qt 缩放
+        image = bundle.nearest_image(name, width, height, dpr, aspect_mode)
+        if image is not None:
+            return _to_pixmap(image)
+    return pixmap
+
+
+def get_icon(name=APP_ICON):
+    """获取图标，资源包中没有时从程序目录读取图片文件"""
+    icon = QIcon()
+    bundle = get_bundle()
+    if bundle is not None:
+        for image in bundle.icon_images(name):
+            icon.addPixmap(QPixmap.fromImage(image))
+    if icon.isNull():
+        icon = QIcon(os.path.join(BASE_DIR, name))
+    return icon
+
+
+# ---- 生成资源包 ----
+
+def bundle_specs(scales, icon_sizes):
+    """资源包的内容：(名称, 类型, 宽, 高, 缩放模式, 设备像素比) 列表，由提醒类型注册表生成"""
+    from reminder_types import REMINDER_TYPES
+
+    specs = []
+    for reminder_type in REMINDER_TYPES:
+        _, _, width, height = reminder_type.image_rect
+        mode = int(image_aspect_mode(reminder_type))
+        for scale in scales:
+            specs.append((reminder_type.image, KIND_IMAGE, width, height, mode, round(float(scale), 2)))
+    icons = [APP_ICON] + [reminder_type.icon for reminder_type in REMINDER_TYPES]
+    for name in dict.fromkeys(icons):
+        for size in icon_sizes:
+            specs.append((name, KIND_ICON, size, size, int(Qt.KeepAspectRatio), 1.0))
+    return specs
+
+
+def build_bundle(path, scales, icon_sizes, base_dir=BASE_DIR):
+    """从程序目录下的图片生成资源包，返回索引条目列表"""
+    from image_cache import decode_and_scale
+
+    entries, blobs, sources = [], [], {}
+    offset = 0
+    for name, kind, width, height, mode, dpr in bundle_specs(scales, icon_sizes):
+        source = os.path.join(base_dir, name)
+        image = decode_and_scale(source, width, height, dpr, Qt.AspectRatioMode(mode))
+        if image is None:
+            raise ValueError(f"无法读取图片: {source}")
+        st = os.stat(source)
+        sources[name] = [st.st_size, st.st_mtime_ns]
+        ptr = image.constBits()
+        ptr.setsize(image.bytesPerLine() * image.height())
+        data = ptr.asstring()
+        entries.append({"name": name, "kind": kind, "width": width, "height": height,
+                        "mode": mode, "dpr": dpr,
+                        "pixel_width": image.width(), "pixel_height": image.height(),
+                        "bytes_per_line": image.bytesPerLine(), "format": int(image.format()),
+                        "offset": offset})
+        blobs.append(data)
+        offset = _aligned(offset + len(data))
+
+    index = json.dumps({"sources": sources, "entries": entries}, ensure_ascii=False).encode("utf-8")
+    data_start = _aligned(_HEADER.size + len(index))
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(index), data_start))
+        f.write(index)
+        for entry, data in zip(entries, blobs):
+            f.seek(data_start + entry["offset"])
+            f.write(data)
+    os.replace(temp_path, path)
+    return entries
+
+
+def _parse_scales(text):
+    return tuple(float(value) for value in text.split(",") if value.strip())
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="生成或查看资源包")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="从图片文件生成资源包")
+    build.add_argument("--output", default=bundle_path() or os.path.join(BASE_DIR, "assets.pak"),
+                       help="资源包路径（默认 config.ASSET_BUNDLE）")
+    build.add_argument("--scales", type=_parse_scales,
+                       default=tuple(getattr(config, "ASSET_BUNDLE_SCALES", (1.0,))),
+                       help="提醒图片的设备像素比，逗号分隔，如 1,1.5,2")
+    listing = sub.add_parser("list", help="列出资源包内容")
+    listing.add_argument("path", nargs="?", default=bundle_path())
+    args = parser.parse_args()
+
+    if args.command == "build":
+        icon_sizes = tuple(getattr(config, "ASSET_ICON_SIZES", (16, 24, 32, 48, 64, 128)))
+        entries = build_bundle(args.output, args.scales, icon_sizes)
+        print(f"已生成 {args.output}：{len(entries)} 张图片，{os.path.getsize(args.output) / 1024 / 1024:.1f} MiB")
+        return 0
+
+    bundle = AssetBundle(args.path)
+    for entry in bundle.entries:
+        size = entry["bytes_per_line"] * entry["pixel_height"]
+        print(f"{entry['kind']:5s} {entry['name']:20s} {entry['width']:4d}x{entry['height']:<4d} "
+              f"@{entry['dpr']:<4} -> {entry['pixel_width']}x{entry['pixel_height']} "
+              f"{size / 1024:8.1f} KiB")
+    changed = bundle.changed_sources()
+    if changed:
+        print(f"已过期：{', '.join(changed)} 在打包后被修改过")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
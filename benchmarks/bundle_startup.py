@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+打包程序冷启动测量 - 比较统一打包（eyecare.spec）和原来每个脚本单独打包的提醒窗口启动时间
+
+每个测量项是一条命令行，测量从创建进程到提醒窗口出现的时间:
+    - 指定了窗口标题时（仅 Windows），轮询直到出现该标题的窗口，然后结束进程；
+      原来的单独打包程序也能这样测量
+    - 否则设置 EYECARE_STARTUP_PROBE=1，等待程序输出 READY（reminder_window.py 支持）
+
+用法（Windows，在 D:\\Eyecare 下）:
+    python benchmarks/bundle_startup.py --repeat 5 ^
+        --case "bundle-eye=dist\\eyecare\\eyecare.exe reminder eye|眼睛休息提醒" ^
+        --case "legacy-eye=eye\\dist\\eyecare.exe|眼睛休息提醒" ^
+        --case "legacy-water=dist\\drink_water.exe|窗口样式Demo"
+
+Linux/macOS 上没有窗口标题测量，原来的单独打包程序需要带上 startup_probe_hook.py 重新打包
+（见该文件说明），之后与统一打包程序一样按 READY 测量:
+    python benchmarks/bundle_startup.py --repeat 10 \
+        --case "bundle-eye=dist/eyecare/eyecare reminder eye" \
+        --case "legacy-eye=eye/dist/eyecare"
+
+不打包时也可以测量源码运行的启动时间:
+    python benchmarks/bundle_startup.py --case "source-eye=python reminder_window.py eye"
+
+结果以 JSON 输出，格式与 run_benchmarks.py 相同。
+"""
+
+import argparse
+import json
+import os
+import platform
+import shlex
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+_qpa_platform = os.environ.get("QT_QPA_PLATFORM")
+from run_benchmarks import summarize, git_commit
+# run_benchmarks 导入时默认使用 offscreen；这里要测真实窗口，只在没有显示器时才用 offscreen
+if _qpa_platform is None:
+    os.environ.pop("QT_QPA_PLATFORM", None)
+
+
+def parse_case(text):
+    """解析 "名称=命令行|窗口标题"（窗口标题可省略）"""
+    label, _, rest = text.partition("=")
+    command, _, title = rest.partition("|")
+    args = shlex.split(command, posix=os.name != "nt")
+    if args and args[0] == "python":
+        args[0] = sys.executable
+    return label, args, title or None
+
+
+def _find_window(title):
+    import ctypes
+    return bool(ctypes.windll.user32.FindWindowW(None, title))
+
+
+def _kill_tree(proc):
+    if os.name == "nt":
+        # 单文件打包程序会再启动一个子进程，需要结束整个进程树
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        proc.kill()
+    proc.wait()
+
+
+def measure(args, title, timeout):
+    """启动一次，返回到窗口出现的毫秒数"""
+    env = dict(os.environ, EYECARE_STARTUP_PROBE="1")
+    start = time.perf_counter()
+    if title is not None:
+        if os.name != "nt":
+            raise RuntimeError("按窗口标题测量只支持 Windows")
+        proc = subprocess.Popen(args, cwd=ROOT_DIR, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while not _find_window(title):
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError(f"{timeout} 秒内没有出现窗口 {title!r}")
+                time.sleep(0.002)
+            return (time.perf_counter() - start) * 1000
+        finally:
+            _kill_tree(proc)
+
+    proc = subprocess.Popen(args, cwd=ROOT_DIR, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, text=True)
+    try:
+        for line in proc.stdout:
+            if line.strip() == "READY":
+                return (time.perf_counter() - start) * 1000
+            if time.perf_counter() - start > timeout:
+                break
+        raise TimeoutError("程序没有输出 READY（需要支持 EYECARE_STARTUP_PROBE）")
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            _kill_tree(proc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="打包程序冷启动测量")
+    parser.add_argument("--case", action="append", required=True,
+                        help='测量项："名称=命令行|窗口标题"，可指定多个')
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复次数")
+    parser.add_argument("--timeout", type=float, default=30.0, help="单次启动的超时（秒）")
+    parser.add_argument("--output", help="结果 JSON 文件路径（默认输出到标准输出）")
+    args = parser.parse_args()
+
+    if "QT_QPA_PLATFORM" not in os.environ and os.name != "nt" and not os.environ.get("DISPLAY"):
+        os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {},
+    }
+    for text in args.case:
+        label, command, title = parse_case(text)
+        print(f"测量 {label} ...", file=sys.stderr)
+        samples = [measure(command, title, args.timeout) for _ in range(args.repeat)]
+        report["results"][label] = {
+            "command": command,
+            "window_title": title,
+            "spawn_to_window_ms": summarize(samples),
+        }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+健康提醒助手基准测试 - 可在无显示器的 Linux 上运行（QT_QPA_PLATFORM=offscreen）
+
+测量项目:
+    startup        调度器冷启动时间（子进程，从启动到初始化完成）
+    reminder       各类提醒从定时器触发到窗口显示/首次绘制的延迟（首次和复用）
+    memory         连续显示 N 次提醒后的峰值内存和新增 Python 对象数
+    settings_ui    设置窗口首次绘制时间
+    settings_io    SettingsManager 读取和保存的吞吐量
+    timing_wheel   分层时间轮在大量定时项下的插入/取消/重新排期/到期吞吐量和每项内存
+
+用法:
+    python benchmarks/run_benchmarks.py [--output result.json] [--only startup,reminder]
+                                        [--repeat 5] [--reminders 50] [--entries 1000000]
+
+结果以 JSON 输出，便于在不同提交之间比较。
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+
+def rss_bytes():
+    """当前进程的常驻内存（字节），无法获取时返回 None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_bytes():
+    """当前进程的峰值常驻内存（字节）"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 上单位为 KB，macOS 上为字节
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def summarize(samples):
+    """样本统计（毫秒）"""
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+        "samples": samples,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---- 冷启动 ----
+
+def bench_startup(args):
+    """在子进程中启动调度器，测量从进程创建到初始化完成的时间"""
+    results = {}
+    harness = os.path.join(BENCH_DIR, "startup_harness.py")
+    for mode in ("normal", "fast_start"):
+        wall, ready, constructed = [], [], []
+        for _ in range(args.repeat):
+            cmd = [sys.executable, harness] + (["--fast-start"] if mode == "fast_start" else [])
+            start = time.perf_counter()
+            proc = subprocess.Popen(cmd, cwd=ROOT_DIR, stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL, text=True)
+            report = None
+            for line in proc.stdout:
+                if line.startswith("READY "):
+                    wall.append((time.perf_counter() - start) * 1000)
+                    report = json.loads(line[len("READY "):])
+                    break
+            proc.stdout.close()
+            proc.wait(timeout=30)
+            if report is None:
+                raise RuntimeError(f"调度器启动失败（退出码 {proc.returncode}）")
+            ready.append(report["ready_ms"])
+            constructed.append(report["constructed_ms"])
+        results[mode] = {
+            "spawn_to_ready_ms": summarize(wall),
+            "in_process_ready_ms": summarize(ready),
+            "in_process_constructed_ms": summarize(constructed),
+        }
+    return results
+
+
+# ---- 提醒延迟 ----
+
+_qt_app = None
+
+
+def _app():
+    """进程内共享的 QApplication（需保持引用，否则会被回收）"""
+    global _qt_app
+    if _qt_app is None:
+        from PyQt5.QtWidgets import QApplication
+        _qt_app = QApplication.instance() or QApplication(sys.argv)
+    return _qt_app
+
+
+def _wait_for(predicate, timeout=5.0):
+    """处理事件直到 predicate() 为真"""
+    from PyQt5.QtCore import QEventLoop
+    app = _app()
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("等待事件超时")
+        app.processEvents(QEventLoop.AllEvents, 10)
+
+
+class _EventProbe:
+    """记录窗口第一次收到 Show 和 Paint 事件的时间"""
+
+    def __init__(self, widget):
+        from PyQt5.QtCore import QObject, QEvent
+
+        probe = self
+
+        class _Filter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Show and probe.shown is None:
+                    probe.shown = time.perf_counter()
+                elif event.type() == QEvent.Paint and probe.painted is None:
+                    probe.painted = time.perf_counter()
+                return False
+
+        self.shown = None
+        self.painted = None
+        self._filter = _Filter()
+        widget.installEventFilter(self._filter)
+
+    def reset(self):
+        self.shown = None
+        self.painted = None
+
+
+def bench_reminder(args):
+    """用真实的调度引擎触发提醒，测量触发到窗口显示和首次绘制的延迟"""
+    from reminder_engine import ReminderEngine
+    from reminder_types import reminder_type_ids
+    from reminder_windows import ReminderWindowManager, MODE_INPROCESS
+
+    _app()
+    results = {}
+    for kind in reminder_type_ids():
+        manager = ReminderWindowManager(mode=MODE_INPROCESS)
+        fired = []
+
+        def on_due(kinds, manager=manager):
+            fired.append(time.perf_counter())
+            manager.show_reminder(kinds[0])
+
+        engine = ReminderEngine(on_due, coalesce_window=0)
+        engine.start()
+        show_ms, paint_ms = [], []
+        probe = None
+        for _ in range(args.repeat + 1):
+            fired.clear()
+            engine.add(kind, 10 ** 9, first_delay_ms=0)
+            if probe is not None:
+                probe.reset()
+            _wait_for(lambda: fired)
+            window = manager.windows[kind]
+            if probe is None:
+                # 首次触发时窗口才创建，探针在创建后安装，只能测到绘制
+                probe = _EventProbe(window)
+                _wait_for(lambda: window.isVisible())
+                first_show = (time.perf_counter() - fired[0]) * 1000
+            else:
+                _wait_for(lambda: probe.shown is not None and probe.painted is not None)
+                show_ms.append((probe.shown - fired[0]) * 1000)
+                paint_ms.append((probe.painted - fired[0]) * 1000)
+            manager.hide_all()
+            _wait_for(lambda: not window.isVisible())
+        engine.stop()
+        results[kind] = {
+            "first_fire_to_visible_ms": first_show,
+            "warm_fire_to_show_ms": summarize(show_ms),
+            "warm_fire_to_first_paint_ms": summarize(paint_ms),
+        }
+        for window in manager.windows.values():
+            window.deleteLater()
+    return results
+
+
+# ---- 内存 ----
+
+def bench_memory(args):
+    """连续显示并关闭 N 次提醒，测量内存增长和新增的 Python 对象"""
+    from reminder_types import reminder_type_ids
+    from reminder_windows import ReminderWindowManager, MODE_INPROCESS
+
+    _app()
+    manager = ReminderWindowManager(mode=MODE_INPROCESS)
+    kinds = reminder_type_ids()
+    # 先各显示一次，排除窗口首次创建的开销
+    for kind in kinds:
+        manager.show_reminder(kind)
+    manager.hide_all()
+    _wait_for(lambda: True)
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    rss_before = rss_bytes()
+
+    for i in range(args.reminders):
+        kind = kinds[i % len(kinds)]
+        manager.show_reminder(kind)
+        window = manager.windows[kind]
+        _wait_for(lambda: window.isVisible())
+        manager.hide_all()
+        _wait_for(lambda: not window.isVisible())
+
+    gc.collect()
+    objects_after = len(gc.get_objects())
+    rss_after = rss_bytes()
+    return {
+        "reminders": args.reminders,
+        "rss_before_bytes": rss_before,
+        "rss_after_bytes": rss_after,
+        "rss_growth_bytes": None if rss_before is None else rss_after - rss_before,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "leaked_objects": objects_after - objects_before,
+    }
+
+
+# ---- 设置窗口 ----
+
+def bench_settings_ui(args):
+    """测量设置窗口从创建到首次绘制的时间"""
+    _app()
+    from settings_manager import SettingsManager
+    settings = SettingsManager().load_settings()
+    samples = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        from settings_window import SettingsWindow
+        window = SettingsWindow(settings)
+        probe = _EventProbe(window)
+        window.show()
+        _wait_for(lambda: probe.painted is not None)
+        samples.append((probe.painted - start) * 1000)
+        window.close()
+        window.deleteLater()
+    return {"create_to_first_paint_ms": summarize(samples)}
+
+
+# ---- 设置读写 ----
+
+def bench_settings_io(args):
+    """SettingsManager 的读取和保存吞吐量（次/秒）"""
+    from settings_manager import SettingsManager
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "user_settings.json")
+        manager = SettingsManager(path)
+        manager.save_settings(manager.default_settings.copy())
+        manager.flush()
+
+        def rate(func, count):
+            start = time.perf_counter()
+            for i in range(count):
+                func(i)
+            return count / (time.perf_counter() - start)
+
+        results["get_setting_per_s"] = rate(lambda i: manager.get_setting("eye_interval"), 100000)
+        # invalidate 后下一次读取会重新解析设置文件
+        results["load_cold_per_s"] = rate(lambda i: (manager.invalidate(), manager.load_settings()), 2000)
+        results["save_settings_per_s"] = rate(lambda i: manager.set_setting("eye_interval", i % 100 + 1), 10000)
+        results["save_and_flush_per_s"] = rate(
+            lambda i: (manager.set_setting("eye_interval", i % 100 + 1), manager.flush()), 200)
+        manager.flush()
+    return results
+
+
+# ---- 时间轮 ----
+
+class _NullTimer:
+    def __init__(self, callback):
+        pass
+
+    def start(self, delay):
+        pass
+
+    def stop(self):
+        pass
+
+
+def bench_timing_wheel(args):
+    """在时间轮中放入 N 个定时项，测量各操作的吞吐量（次/秒）和每项内存；堆调度核心作为对比"""
+    import random
+    import tracemalloc
+    from timing_wheel import TimingWheel
+    from scheduler_core import SchedulerCore
+
+    count = args.entries
+    rng = random.Random(0)
+    # 到期时间分布在一周内（秒）
+    delays = [rng.randint(1, 7 * 86400) for _ in range(count)]
+
+    def rate(n, seconds):
+        return n / seconds if seconds > 0 else None
+
+    results = {"entries": count}
+
+    # 每项内存：单独测一遍，避免 tracemalloc 影响计时
+    gc.collect()
+    tracemalloc.start()
+    wheel = TimingWheel()
+    base = tracemalloc.get_traced_memory()[0]
+    entries = [wheel.insert(i, delay) for i, delay in enumerate(delays)]
+    # 减去保存句柄的列表本身
+    used = tracemalloc.get_traced_memory()[0] - base - sys.getsizeof(entries)
+    tracemalloc.stop()
+    results["wheel_bytes_per_entry"] = used / count
+    del wheel, entries
+    gc.collect()
+
+    wheel = TimingWheel()
+    start = time.perf_counter()
+    entries = [wheel.insert(i, delay) for i, delay in enumerate(delays)]
+    results["wheel_insert_per_s"] = rate(count, time.perf_counter() - start)
+
+    moved = entries[::2]
+    start = time.perf_counter()
+    for entry, delay in zip(moved, delays):
+        wheel.reschedule(entry, delay)
+    results["wheel_reschedule_per_s"] = rate(len(moved), time.perf_counter() - start)
+
+    cancelled = entries[1::4]
+    start = time.perf_counter()
+    for entry in cancelled:
+        wheel.cancel(entry)
+    results["wheel_cancel_per_s"] = rate(len(cancelled), time.perf_counter() - start)
+
+    remaining = len(wheel)
+    start = time.perf_counter()
+    expired = 0
+    # 每次推进一小时，模拟定时器按批处理到期项
+    now = 0.0
+    while len(wheel):
+        now += 3600
+        expired += len(wheel.advance(now))
+    elapsed = time.perf_counter() - start
+    results["wheel_expire_per_s"] = rate(expired, elapsed)
+    results["wheel_expire_total_s"] = elapsed
+    assert expired == remaining
+    del wheel, entries, moved, cancelled
+    gc.collect()
+
+    # 对比：堆调度核心（每类提醒一个键）；内存在较小的样本上测量
+    def heap_core():
+        return SchedulerCore(lambda kinds: None, _NullTimer, coalesce_window=0, clock=lambda: 0.0)
+
+    core = heap_core()
+    start = time.perf_counter()
+    for i, delay in enumerate(delays):
+        core.add(i, delay * 1000)
+    results["heap_insert_per_s"] = rate(count, time.perf_counter() - start)
+    del core
+    gc.collect()
+    sample = min(count, 100000)
+    tracemalloc.start()
+    core = heap_core()
+    base = tracemalloc.get_traced_memory()[0]
+    for i in range(sample):
+        core.add(i, delays[i] * 1000)
+    results["heap_bytes_per_entry"] = (tracemalloc.get_traced_memory()[0] - base) / sample
+    tracemalloc.stop()
+    del core
+    gc.collect()
+    return results
+
+
+BENCHMARKS = {
+    "startup": bench_startup,
+    "reminder": bench_reminder,
+    "memory": bench_memory,
+    "settings_ui": bench_settings_ui,
+    "settings_io": bench_settings_io,
+    "timing_wheel": bench_timing_wheel,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="健康提醒助手基准测试")
+    parser.add_argument("--output", help="结果 JSON 文件路径（默认输出到标准输出）")
+    parser.add_argument("--only", help="只运行指定的项目，逗号分隔: " + ",".join(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复次数")
+    parser.add_argument("--reminders", type=int, default=50, help="内存测试中连续提醒的次数")
+    parser.add_argument("--entries", type=int, default=10 ** 6, help="时间轮测试中的定时项数")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "qpa_platform": os.environ.get("QT_QPA_PLATFORM"),
+        "results": {},
+    }
+    # 被测模块的输出转到标准错误，标准输出只保留 JSON 结果
+    with contextlib.redirect_stdout(sys.stderr):
+        for name in names:
+            print(f"运行 {name} ...")
+            report["results"][name] = BENCHMARKS[name](args)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+冷启动测量用的调度器启动器 - 由 run_benchmarks.py 在子进程中运行
+
+无系统托盘的环境（如 QT_QPA_PLATFORM=offscreen）下视为托盘可用，
+调度器完成全部初始化后输出一行 READY 和各阶段耗时，然后退出。
+"""
+
+import json
+import os
+import sys
+import time
+
+_start = time.perf_counter()
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QSystemTrayIcon
+
+QSystemTrayIcon.isSystemTrayAvailable = staticmethod(lambda: True)
+
+import simple_scheduler
+
+
+def main():
+    fast_start = "--fast-start" in sys.argv
+    scheduler = simple_scheduler.SimpleScheduler(fast_start=fast_start)
+    constructed = time.perf_counter()
+
+    def ready():
+        result = {
+            "constructed_ms": (constructed - _start) * 1000,
+            "ready_ms": (time.perf_counter() - _start) * 1000,
+        }
+        print("READY " + json.dumps(result), flush=True)
+        scheduler.quit_app()
+
+    # 排在 finish_startup 之后执行，即全部初始化完成、事件循环空闲时
+    QTimer.singleShot(0, ready)
+    return scheduler.app.exec_()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+PyInstaller 运行时钩子 - 让原来单独打包的提醒窗口程序也能在非 Windows 系统上测量冷启动
+
+原来的 drink_water.py、eye/eyecare.py 不支持 EYECARE_STARTUP_PROBE，也无法按窗口标题测量
+（只支持 Windows）。打包时加上本钩子，设置了 EYECARE_STARTUP_PROBE 时，事件循环开始后
+（窗口已经显示）输出一行 READY 并退出，与 reminder_window.py 的探针相同:
+
+    pyinstaller -F --runtime-hook benchmarks/startup_probe_hook.py drink_water.py
+"""
+
+import os
+
+if os.environ.get("EYECARE_STARTUP_PROBE"):
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    _exec = QApplication.exec_
+
+    def _probe_exec(*args):
+        QTimer.singleShot(0, lambda: (print("READY", flush=True), QApplication.quit()))
+        return _exec()
+
+    QApplication.exec_ = _probe_exec
@@ -7,7 +7,7 @@ EYE_REMINDER_INTERVAL = 40
 # 喝水提醒间隔（分钟）
 WATER_REMINDER_INTERVAL = 30
 
-# 提醒窗口显示时间（秒）
+# 提醒窗口显示时间（秒），到时后自动淡出关闭，0 表示不自动关闭（用户设置中的 display_time 优先）
 REMINDER_DISPLAY_TIME = 5
 
 # 是否启用系统托盘
@@ -15,3 +15,112 @@ ENABLE_SYSTEM_TRAY = True
 
 # 是否在启动时显示消息
 SHOW_STARTUP_MESSAGE = True
+
+# 提醒窗口模式："inprocess" 在调度器进程内复用窗口，"subprocess" 每次启动新进程
+REMINDER_WINDOW_MODE = "inprocess"
+
+# 合并提醒窗口（秒）：在此时间内先后到期的提醒合并为一次显示
+REMINDER_COALESCE_WINDOW = 60
+
+# 程序停止期间错过提醒时的处理方式：
+# "fire_once" 启动后 MISSED_REMINDER_DELAY 秒补一次提醒（错过多次也只补一次）
+# "skip" 跳过错过的提醒，按原来的节奏等待下一次
+MISSED_REMINDER_POLICY = "fire_once"
+
+# 补发错过提醒前的等待时间（秒）
+MISSED_REMINDER_DELAY = 60
+
+# 快速启动：先显示托盘图标，菜单、历史记录等在事件循环启动后再创建
+FAST_START = True
+
+# 多用户守护进程（reminder_daemon.py）监听的 Unix 套接字。套接字所在目录只有守护进程的用户可写
+# （不存在时创建，已存在但权限过宽时拒绝启动），其他用户不能替换或删除套接字
+DAEMON_SOCKET = "/tmp/eyecare-daemon/daemon.sock"
+
+# 可以连接守护进程的用户组：套接字和目录属于这个组，只有组内用户能连接；
+# 空字符串或该组不存在时只有守护进程的用户自己能连接
+DAEMON_SOCKET_GROUP = "eyecare"
+
+# 不支持对端凭据（SO_PEERCRED）的平台上，是否改用客户端 hello 消息中的 "user" 字段确定用户。
+# 开启后能连接套接字的用户可以冒充其他用户，只应在单用户或完全可信的环境中开启；默认拒绝这类连接
+DAEMON_TRUST_CLIENT_USER = False
+
+# 每个客户端连接最多积压多少字节未读出的消息；客户端不读取、积压超过上限时断开连接，
+# 避免守护进程的内存无限增长
+DAEMON_CLIENT_BUFFER_LIMIT = 64 * 1024
+
+# 多用户守护进程保存各用户设置的目录（每个用户一个 <用户名>.json），相对路径以数据目录为准（见 app_paths.py）
+DAEMON_PROFILE_DIR = "profiles"
+
+# 子进程模式下同时存在的提醒窗口进程上限
+REMINDER_MAX_PROCESSES = 3
+
+# 提醒窗口进程的存活时间上限（秒），超过后结束该进程；0 表示不限
+REMINDER_PROCESS_LIFETIME = 600
+
+# 提醒窗口自动关闭后的处理："pool" 保留窗口并释放图片，下次复用；"close" 销毁窗口
+REMINDER_DISMISS_MODE = "pool"
+
+# 空闲内存整理：空闲这么多分钟后释放缓存的图片和未显示的提醒窗口并整理内存；0 表示关闭
+IDLE_TRIM_MINUTES = 10
+
+# 提醒窗口关闭后是否立即（稍等几秒）释放图片缓存并整理内存；提醒窗口保留，下次提醒直接复用
+IDLE_TRIM_AFTER_REMINDER = True
+
+# 日志文件（JSON Lines，每行一条），相对路径以数据目录为准（见 app_paths.py）；空字符串表示不写文件
+LOG_FILE = "logs/eyecare.log"
+
+# 日志文件超过这个大小（字节）时轮转，保留 LOG_BACKUP_COUNT 个旧文件
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+# 默认日志级别（"debug"、"info"、"warning"、"error"）
+LOG_LEVEL = "info"
+
+# 按模块设置的日志级别，如 {"settings_manager": "warning", "reminder_processes": "debug"}
+LOG_LEVELS = {}
+
+# 是否同时输出到控制台（由后台线程输出，控制台阻塞时丢弃日志，不会卡住界面）
+LOG_CONSOLE = True
+
+# 日志队列容量，写入跟不上时超出的日志被丢弃并计数
+LOG_QUEUE_SIZE = 1000
+
+# 系统休眠唤醒后，休眠期间到期的提醒的处理方式：
+# "fire_once" 合并为一次提醒（错过多次也只提醒一次）
+# "skip" 跳过，按原来的节奏等下一次
+# "spread" 每隔 RESUME_SPREAD_INTERVAL 秒显示一个，不同时弹出
+RESUME_POLICY = "fire_once"
+RESUME_SPREAD_INTERVAL = 120
+
+# 判定为休眠唤醒的时间差（秒）：墙上时间比单调时钟多走了这么多，或定时器迟到了这么多
+RESUME_DETECT_THRESHOLD = 30
+
+# 休眠唤醒总会在下一个提醒到期、定时器醒来时发现（比较单调时钟和墙上时间）。
+# 在 Linux 上单调时钟不计入休眠，唤醒后要再等剩余的倒计时才会发现，休眠期间到期的提醒最多晚一个间隔。
+# 这里设置定时器最长等待时间（秒），到期前至少每隔这么久醒来检查一次，发现唤醒最多晚这么久；
+# 代价是空闲时多醒来几次（间隔 40 分钟、检查间隔 15 分钟时每个间隔多醒来约 2 次）。0 表示只在提醒到期时检查
+RESUME_CHECK_INTERVAL = 15 * 60
+
+# 运行指标（默认关闭），Prometheus 文本格式，供本机采集程序读取：
+# 监听地址，如 "127.0.0.1:9464" 或 "unix:/tmp/eyecare-metrics.sock"；空字符串表示不监听
+METRICS_LISTEN = ""
+
+# 定期写入的指标快照文件（相对路径以数据目录为准），空字符串表示不写；写入间隔（秒）
+METRICS_SNAPSHOT_FILE = ""
+METRICS_SNAPSHOT_INTERVAL = 60
+
+# 诊断报告（托盘菜单“诊断”或 diag 命令）保存的目录，相对路径以数据目录为准
+DIAGNOSTICS_DIR = "diagnostics"
+
+# 资源包：全部图片预先缩放好的一个文件（相对路径以程序目录为准），由 python asset_bundle.py build 生成，
+# 打包时自动生成；文件不存在或设为空字符串时直接读取图片文件
+ASSET_BUNDLE = "assets.pak"
+
+# 资源包中提醒图片的设备像素比（屏幕缩放比例），每个比例保存一份未压缩的原始像素：
+# 1x 约 4 MiB，2x 再加约 16 MiB（源图片合计约 0.5 MiB）。默认只打包 1x；
+# 其他缩放比例从源图片（打包时一并带上）解码缩放一次，之后由图片磁盘缓存读取
+ASSET_BUNDLE_SCALES = (1.0,)
+
+# 资源包中程序图标（托盘、窗口）的尺寸（像素）
+ASSET_ICON_SIZES = (16, 24, 32, 48, 64, 128)
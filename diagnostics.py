@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行诊断 - 在运行中的程序里按需开启 CPU 分析（cProfile）和内存分配对比（tracemalloc）
+
+    diagnostics = Diagnostics()
+    diagnostics.start_cpu()       开始 CPU 分析（只分析调用它的线程，即界面线程）
+    diagnostics.stop_cpu()        停止并写出报告，返回报告路径
+    diagnostics.start_memory()    开始跟踪内存分配，记录基准快照
+    diagnostics.stop_memory()     与基准快照对比，写出增长最多的分配位置，停止跟踪
+    diagnostics.dump()            写出对象统计（Qt 对象、Python 对象、线程、内存）
+
+报告写入 DIAGNOSTICS_DIR 下以时间命名的目录，一次诊断（从开始第一项分析到全部停止）共用一个目录。
+未开启分析时不安装任何钩子，没有额外开销；本模块只在第一次使用诊断功能时导入。
+"""
+
+import gc
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+try:
+    import config
+except ImportError:
+    config = None
+
+# 诊断命令（命令通道和菜单共用）
+ACTIONS = ("cpu-start", "cpu-stop", "mem-start", "mem-stop", "dump", "status")
+
+
+def qt_object_counts():
+    """按类名统计 Qt 对象：全部窗口部件（含没有 Python 包装的），以及 Python 持有的 QObject
+
+    程序没有加载 Qt 时返回 None。只能在界面线程中调用。
+    """
+    widgets_module = sys.modules.get("PyQt5.QtWidgets")
+    core_module = sys.modules.get("PyQt5.QtCore")
+    if widgets_module is None or core_module is None:
+        return None
+    widgets = Counter()
+    app = widgets_module.QApplication.instance()
+    if app is not None:
+        for widget in app.allWidgets():
+            widgets[widget.metaObject().className()] += 1
+    wrappers = Counter()
+    qobject = core_module.QObject
+    for obj in gc.get_objects():
+        if isinstance(obj, qobject):
+            wrappers[type(obj).__name__] += 1
+    return {"widgets": widgets, "python_qobjects": wrappers}
+
+
+def _format_counter(counter, top=30):
+    lines = [f"    {count:6d}  {name}" for name, count in counter.most_common(top)]
+    if len(counter) > top:
+        lines.append(f"    ...（共 {len(counter)} 种）")
+    return "\n".join(lines) or "    （无）"
+
+
+class Diagnostics:
+    """CPU 和内存分析会话"""
+
+    def __init__(self, report_root=None, frames=25):
+        """
+        report_root: 报告的根目录，默认取 config.DIAGNOSTICS_DIR（相对数据目录）
+        frames: tracemalloc 为每次分配记录的调用栈深度
+        """
+        if report_root is None:
+            from app_paths import data_path
+            report_root = data_path(getattr(config, "DIAGNOSTICS_DIR", "diagnostics"))
+        self.report_root = report_root
+        self.frames = frames
+        self._profile = None
+        self._baseline = None
+        self._started_tracing = False
+        self._session_dir = None
+
+    @property
+    def cpu_running(self):
+        return self._profile is not None
+
+    @property
+    def memory_running(self):
+        return self._baseline is not None
+
+    def report_dir(self):
+        """当前诊断的报告目录（第一次需要时创建）"""
+        if self._session_dir is None:
+            name = time.strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(self.report_root, name)
+            suffix = 1
+            while os.path.exists(path):
+                suffix += 1
+                path = os.path.join(self.report_root, f"{name}-{suffix}")
+            os.makedirs(path)
+            self._session_dir = path
+        return self._session_dir
+
+    def _end_session_if_idle(self):
+        if not self.cpu_running and not self.memory_running:
+            self._session_dir = None
+
+    def _write(self, name, text):
+        path = os.path.join(self.report_dir(), name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    # ---- CPU ----
+
+    def start_cpu(self):
+        if self._profile is not None:
+            return False
+        import cProfile
+
+        self.report_dir()
+        self._profile = cProfile.Profile()
+        self._cpu_started = time.perf_counter()
+        self._cpu_thread = threading.current_thread().name
+        self._profile.enable()
+        return True
+
+    def stop_cpu(self, top=40):
+        """停止 CPU 分析，写出 cpu.pstats（可用 snakeviz 等工具查看）和 cpu.txt，返回 cpu.txt 路径"""
+        if self._profile is None:
+            return None
+        import io
+        import pstats
+
+        profile, self._profile = self._profile, None
+        profile.disable()
+        elapsed = time.perf_counter() - self._cpu_started
+        directory = self.report_dir()
+        profile.dump_stats(os.path.join(directory, "cpu.pstats"))
+        out = io.StringIO()
+        out.write(f"CPU 分析：{elapsed:.1f} 秒，只包含开始分析的线程（{self._cpu_thread}）\n\n")
+        stats = pstats.Stats(profile, stream=out)
+        stats.strip_dirs()
+        out.write("== 按累计耗时 ==\n")
+        stats.sort_stats("cumulative").print_stats(top)
+        out.write("\n== 按自身耗时 ==\n")
+        stats.sort_stats("tottime").print_stats(top)
+        path = self._write("cpu.txt", out.getvalue())
+        self._end_session_if_idle()
+        return path
+
+    # ---- 内存 ----
+
+    def start_memory(self):
+        if self._baseline is not None:
+            return False
+        import tracemalloc
+
+        self.report_dir()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._baseline = tracemalloc.take_snapshot()
+        self._memory_started = time.perf_counter()
+        return True
+
+    @staticmethod
+    def _snapshot():
+        import tracemalloc
+
+        return tracemalloc.take_snapshot()
+
+    @staticmethod
+    def _interesting(stats, top):
+        """去掉导入机制、诊断本身（tracemalloc、cProfile 报告、本模块）的分配，取前 top 项
+
+        只检查排在前面的统计项；Snapshot.filter_traces 逐条过滤全部分配，开启 CPU 分析时要几秒。
+        """
+        excluded = {__file__, "<frozen importlib._bootstrap>",
+                    "<frozen importlib._bootstrap_external>", "<unknown>"}
+        for name in ("tracemalloc", "cProfile", "pstats", "linecache"):
+            module = sys.modules.get(name)
+            if module is not None:
+                excluded.add(module.__file__)
+        result = []
+        for stat in stats:
+            if stat.traceback[0].filename not in excluded:
+                result.append(stat)
+                if len(result) >= top:
+                    break
+        return result
+
+    @classmethod
+    def format_top_sites(cls, snapshot, top=15, frames=8):
+        """按调用栈统计的分配最多的位置"""
+        lines = []
+        for index, stat in enumerate(cls._interesting(snapshot.statistics("traceback"), top), 1):
+            lines.append(f"#{index}: {stat.size / 1024:.1f} KiB，{stat.count} 个对象")
+            lines.extend("    " + line for line in stat.traceback.format(limit=frames))
+        return "\n".join(lines) or "（无）"
+
+    def stop_memory(self, top=30):
+        """与基准快照对比，写出 memory.txt 并停止跟踪，返回报告路径"""
+        if self._baseline is None:
+            return None
+        import tracemalloc
+
+        baseline, self._baseline = self._baseline, None
+        snapshot = self._snapshot()
+        elapsed = time.perf_counter() - self._memory_started
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"内存分配对比：{elapsed:.1f} 秒，当前跟踪 {current / 1024:.1f} KiB，峰值 {peak / 1024:.1f} KiB",
+                 "", "== 增长最多的位置（按行） =="]
+        for stat in self._interesting(snapshot.compare_to(baseline, "lineno"), top):
+            lines.append(str(stat))
+        lines += ["", "== 当前分配最多的位置（按调用栈） ==", self.format_top_sites(snapshot)]
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        path = self._write("memory.txt", "\n".join(lines) + "\n")
+        self._end_session_if_idle()
+        return path
+
+    # ---- 对象统计 ----
+
+    def dump(self):
+        """写出对象统计 objects.txt，返回报告路径；必须在界面线程中调用"""
+        import tracemalloc
+        from memory_trim import rss_bytes, format_bytes
+
+        lines = [f"时间: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+                 f"进程: {os.getpid()}，常驻内存 {format_bytes(rss_bytes())}，"
+                 f"CPU 时间 {time.process_time():.2f} 秒"]
+        threads = threading.enumerate()
+        lines.append(f"线程（{len(threads)}）: " + ", ".join(thread.name for thread in threads))
+        lines.append(f"垃圾回收: 各代对象数 {gc.get_count()}，已回收统计 {gc.get_stats()}")
+
+        qt_counts = qt_object_counts()
+        if qt_counts is not None:
+            widgets, wrappers = qt_counts["widgets"], qt_counts["python_qobjects"]
+            lines += ["", f"== Qt 窗口部件（{sum(widgets.values())}） ==", _format_counter(widgets),
+                      "", f"== Python 持有的 QObject（{sum(wrappers.values())}） ==", _format_counter(wrappers)]
+
+        python_types = Counter(type(obj).__name__ for obj in gc.get_objects())
+        lines += ["", f"== Python 对象（{sum(python_types.values())}，垃圾回收跟踪的） ==",
+                  _format_counter(python_types, 25)]
+
+        if tracemalloc.is_tracing():
+            lines += ["", "== 分配最多的位置（按调用栈） ==", self.format_top_sites(self._snapshot())]
+        else:
+            lines += ["", "（未开启内存分析，没有分配位置统计）"]
+        path = self._write("objects.txt", "\n".join(lines) + "\n")
+        self._end_session_if_idle()
+        return path
+
+    # ---- 命令 ----
+
+    def status_text(self):
+        parts = [f"CPU 分析: {'进行中' if self.cpu_running else '未开启'}",
+                 f"内存分析: {'进行中' if self.memory_running else '未开启'}"]
+        if self._session_dir is not None:
+            parts.append(f"报告目录: {self._session_dir}")
+        return "，".join(parts)
+
+    def run(self, action):
+        """执行诊断命令（见 ACTIONS），返回回复文字"""
+        if action == "cpu-start":
+            return "CPU 分析已开始" if self.start_cpu() else "CPU 分析已在进行中"
+        if action == "cpu-stop":
+            path = self.stop_cpu()
+            return f"CPU 分析报告: {path}" if path else "CPU 分析没有在进行"
+        if action == "mem-start":
+            return "内存分析已开始" if self.start_memory() else "内存分析已在进行中"
+        if action == "mem-stop":
+            path = self.stop_memory()
+            return f"内存分析报告: {path}" if path else "内存分析没有在进行"
+        if action == "dump":
+            return f"对象统计: {self.dump()}"
+        if action == "status":
+            return self.status_text()
+        return f"未知的诊断命令: {action}（可用: {', '.join(ACTIONS)}）"
+
+    def stop_all(self):
+        """停止进行中的分析并写出报告，返回报告路径列表"""
+        paths = [self.stop_cpu(), self.stop_memory()]
+        return [path for path in paths if path]
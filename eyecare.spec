@@ -0,0 +1,98 @@
+# -*- mode: python ; coding: utf-8 -*-
+# 健康提醒助手打包配置：一个可执行程序包含调度器、提醒窗口和设置窗口
+#
+#     pyinstaller eyecare.spec
+#
+# 输出 dist/eyecare/（onedir）：eyecare.exe 和共用的 _internal/ 目录（Python 运行时、Qt、资源包）。
+# 不使用 onefile，避免每次弹出提醒都把整个程序解压到临时目录。
+# 用法见 eyecare_main.py，例如 eyecare.exe scheduler、eyecare.exe reminder eye。
+
+import os
+import sys
+
+sys.path.insert(0, SPECPATH)
+import config
+from asset_bundle import build_bundle
+
+# 图片预先缩放后打包成一个资源包（见 asset_bundle.py）。源图片也一并带上（合计约 0.5 MiB），
+# 屏幕缩放比例不在 ASSET_BUNDLE_SCALES 中时从源图片解码缩放
+from reminder_types import REMINDER_TYPES
+
+_bundle = os.path.join(SPECPATH, config.ASSET_BUNDLE)
+build_bundle(_bundle, config.ASSET_BUNDLE_SCALES, config.ASSET_ICON_SIZES)
+datas = [
+    (_bundle, os.path.dirname(config.ASSET_BUNDLE) or '.'),
+]
+for _image in dict.fromkeys([t.image for t in REMINDER_TYPES] + [t.icon for t in REMINDER_TYPES]):
+    datas.append((os.path.join(SPECPATH, _image), os.path.dirname(_image) or '.'))
+
+# 在函数内按需导入的模块，显式列出以免分析时遗漏
+hiddenimports = [
+    'simple_scheduler',
+    'reminder_window',
+    'reminder_windows',
+    'reminder_engine',
+    'reminder_history',
+    'reminder_processes',
+    'settings_window',
+    'settings_manager',
+    'single_instance',
+    'schedule_state',
+    'image_cache',
+    'asset_bundle',
+    'app_paths',
+    'memory_trim',
+    'notify_backends',
+    'startup_profiler',
+    'sqlite3',
+]
+
+# 用不到的大模块（构建环境中装了它们时会被钩子拉进来）
+excludes = [
+    'tkinter',
+    'numpy',
+    'matplotlib',
+    'PyQt5.QtNetwork',
+    'PyQt5.QtQml',
+    'PyQt5.QtQuick',
+    'PyQt5.QtWebEngineWidgets',
+    'PyQt5.QtWebEngineCore',
+    'PyQt5.QtMultimedia',
+    'PyQt5.QtSql',
+    'PyQt5.QtTest',
+    'PyQt5.QtXml',
+]
+
+a = Analysis(
+    ['eyecare_main.py'],
+    pathex=[],
+    binaries=[],
+    datas=datas,
+    hiddenimports=hiddenimports,
+    hookspath=[],
+    runtime_hooks=[],
+    excludes=excludes,
+    noarchive=False,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='eyecare',
+    debug=False,
+    strip=False,
+    upx=False,
+    console=False,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    name='eyecare',
+)
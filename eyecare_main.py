@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+健康提醒助手统一入口 - 打包为单个可执行程序（eyecare.spec）时的入口
+
+用法:
+    eyecare [scheduler] [--fast-start] [trigger eye|status|reload|trim|quit]
+                                        托盘调度器（默认子命令）
+    eyecare reminder eye|water|posture [显示秒数]
+                                        显示一个提醒窗口
+    eyecare settings                    打开设置窗口，保存到 user_settings.json
+                                        （正在运行的调度器会自动重新加载）
+
+各子命令只导入自己需要的模块，显示提醒窗口时不会加载调度器、历史记录等模块。
+"""
+
+import sys
+
+
+def run_scheduler(argv):
+    if "--profile-startup" in argv:
+        import startup_profiler
+        startup_profiler.install()
+    # 单实例检查在导入 Qt 之前完成，重复启动时转发命令后立即退出
+    import single_instance
+    guard, command = single_instance.acquire_or_forward(argv)
+    import simple_scheduler
+    return simple_scheduler.main(argv, guard, command)
+
+
+def run_reminder(argv):
+    if not argv:
+        print("用法: eyecare reminder <类型标识> [显示秒数]")
+        return 1
+    import reminder_window
+    return reminder_window.run_reminder(argv[0], float(argv[1]) if len(argv) > 1 else 0)
+
+
+def run_settings(argv):
+    from PyQt5.QtWidgets import QApplication
+    from settings_manager import SettingsManager
+    from settings_window import SettingsWindow
+
+    app = QApplication(sys.argv)
+    manager = SettingsManager()
+    window = SettingsWindow(manager.load_settings())
+    window.settings_changed.connect(manager.save_settings)
+    window.exec_()
+    manager.flush()
+    return 0
+
+
+SUBCOMMANDS = {
+    "scheduler": run_scheduler,
+    "reminder": run_reminder,
+    "settings": run_settings,
+}
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+    if argv and argv[0] in ("-h", "--help"):
+        print(__doc__)
+        return 0
+    # 没有子命令时运行调度器（参数原样交给调度器）
+    return run_scheduler(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
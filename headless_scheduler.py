@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+无界面调度器 - 在 asyncio 上运行调度核心，不加载 Qt
+
+用法:
+    python headless_scheduler.py [--backend stdout] [--backend socket:/tmp/eyecare.sock]
+                                 [--no-state] [--no-history] [--diagnose]
+
+适合无显示器的服务器和 CI。设置、计划状态和提醒历史与托盘程序共用同一套文件；
+设置文件被改写后自动生效（定期检查修改时间）。
+
+--diagnose 从启动起进行 CPU 分析和内存分配对比，退出时写出报告（见 diagnostics.py）；
+运行中收到 SIGUSR1 时写出一次对象统计。
+"""
+
+import argparse
+import asyncio
+import signal
+import time
+
+from reminder_types import REMINDER_TYPES
+from scheduler_core import (SchedulerCore, AsyncioTimer, intervals_from_settings,
+                            start_schedule, apply_intervals)
+from settings_manager import SettingsManager
+from notify_backends import StdoutBackend, UnixSocketBackend
+from reminder_history import EVENT_FIRED, EVENT_SHOWN, EVENT_SKIPPED
+import app_log
+
+log = app_log.get_logger("headless_scheduler")
+
+
+class HeadlessScheduler:
+    """asyncio 驱动的提醒调度器"""
+
+    def __init__(self, backends, loop, settings_manager=None, schedule_state=None,
+                 history=None, reload_interval=2.0):
+        self.backends = backends
+        self.loop = loop
+        self.settings_manager = settings_manager or SettingsManager()
+        self.schedule_state = schedule_state
+        self.history = history
+        self.reload_interval = reload_interval
+        self.settings = self.settings_manager.load_settings()
+        self.intervals = intervals_from_settings(self.settings, REMINDER_TYPES)
+        self.core = SchedulerCore(self.on_reminders_due,
+                                  lambda callback: AsyncioTimer(callback, loop),
+                                  listener=self.record_schedule, on_resume=self.on_resume)
+        self._reload_task = None
+
+    def start(self):
+        states = self.schedule_state.load() if self.schedule_state is not None else {}
+        for kind in start_schedule(self.core, self.intervals, states):
+            self.record_event(kind, EVENT_SKIPPED)
+        self._reload_task = self.loop.create_task(self._watch_settings())
+        log.info("调度已启动 - " + ", ".join(f"{t.name}: {self.intervals[t.id]}分钟" for t in REMINDER_TYPES),
+                 intervals=self.intervals)
+
+    def stop(self):
+        self.core.stop()
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+        for backend in self.backends:
+            backend.close()
+        if self.schedule_state is not None:
+            self.schedule_state.close()
+        if self.history is not None:
+            self.history.close()
+        self.settings_manager.flush()
+
+    def record_event(self, kind, event):
+        if self.history is not None:
+            self.history.record(kind, event)
+
+    def on_resume(self, gap, overdue, skipped):
+        for kind in skipped:
+            self.record_event(kind, EVENT_SKIPPED)
+
+    def record_schedule(self, kind, remaining, fired):
+        if self.schedule_state is None:
+            return
+        now = time.time()
+        self.schedule_state.update(kind, now + remaining, last_fired=now if fired else None)
+
+    def on_reminders_due(self, kinds):
+        for kind in kinds:
+            self.record_event(kind, EVENT_FIRED)
+        delivered = False
+        for backend in self.backends:
+            try:
+                delivered = backend.notify(kinds) or delivered
+            except Exception as e:
+                log.error(f"通知后端 {type(backend).__name__} 出错: {e}", kinds=kinds)
+        if delivered:
+            for kind in kinds:
+                self.record_event(kind, EVENT_SHOWN)
+
+    async def _watch_settings(self):
+        """定期检查设置文件，只重新排期间隔有变化的提醒"""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            self.settings_manager.invalidate()
+            settings = self.settings_manager.load_settings()
+            changed = apply_intervals(self.core, self.intervals, settings, REMINDER_TYPES)
+            self.settings = settings
+            if changed:
+                log.info(f"设置文件已变化，重新排期: {', '.join(changed)}", intervals=self.intervals)
+
+
+def create_backends(specs):
+    """根据命令行参数创建通知后端"""
+    backends = []
+    for spec in specs or ["stdout"]:
+        if spec == "stdout":
+            backends.append(StdoutBackend())
+        elif spec.startswith("socket:"):
+            backends.append(UnixSocketBackend(spec[len("socket:"):]))
+        else:
+            raise ValueError(f"未知的通知后端: {spec}")
+    return backends
+
+
+async def main_async(args):
+    loop = asyncio.get_running_loop()
+    backends = create_backends(args.backend)
+    for backend in backends:
+        if isinstance(backend, UnixSocketBackend):
+            await backend.start()
+
+    schedule_state = None
+    if not args.no_state:
+        from schedule_state import ScheduleStateStore
+        schedule_state = ScheduleStateStore()
+    history = None
+    if not args.no_history:
+        from reminder_history import ReminderHistory
+        history = ReminderHistory()
+
+    diagnostics = None
+    if args.diagnose:
+        from diagnostics import Diagnostics
+        diagnostics = Diagnostics()
+        diagnostics.start_cpu()
+        diagnostics.start_memory()
+        print(f"诊断已开启，退出时写出报告: {diagnostics.report_dir()}", flush=True)
+
+    def dump_objects():
+        nonlocal diagnostics
+        if diagnostics is None:
+            from diagnostics import Diagnostics
+            diagnostics = Diagnostics()
+        print(f"对象统计: {diagnostics.dump()}", flush=True)
+
+    scheduler = HeadlessScheduler(backends, loop, schedule_state=schedule_state, history=history)
+    scheduler.start()
+
+    stop_event = asyncio.Event()
+    for sig, handler in ((signal.SIGINT, stop_event.set), (signal.SIGTERM, stop_event.set),
+                         (getattr(signal, "SIGUSR1", None), dump_objects)):
+        if sig is None:
+            continue
+        try:
+            loop.add_signal_handler(sig, handler)
+        except (NotImplementedError, AttributeError):
+            pass
+    try:
+        await stop_event.wait()
+    finally:
+        scheduler.stop()
+        if diagnostics is not None:
+            for path in diagnostics.stop_all():
+                print(f"诊断报告: {path}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无界面健康提醒调度器")
+    parser.add_argument("--backend", action="append",
+                        help="通知后端: stdout 或 socket:<路径>，可指定多个（默认 stdout）")
+    parser.add_argument("--no-state", action="store_true", help="不读写提醒计划状态文件")
+    parser.add_argument("--no-history", action="store_true", help="不记录提醒历史")
+    parser.add_argument("--diagnose", action="store_true", help="进行 CPU 和内存分析，退出时写出报告")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
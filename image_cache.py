@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图片缓存 - 缓存已解码并缩放好的提醒图片
+
+缓存键为 (路径, 修改时间, 目标尺寸, 设备像素比)。内存中使用按字节预算淘汰的
+LRU，磁盘上保存已缩放好的原始像素缓冲区，再次启动时无需 JPEG 解码和重采样。
+"""
+
+import os
+import struct
+import hashlib
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap
+
+import app_log
+from app_paths import data_path
+
+log = app_log.get_logger("image_cache")
+DEFAULT_DISK_DIR = data_path(".image_cache")
+
+# 磁盘缓存文件头：魔数、宽、高、每行字节数、像素格式
+_HEADER = struct.Struct("<8sIIII")
+_MAGIC = b"EYEIMG01"
+
+# 缓存和资源包中图片的像素格式（绘制时不需要再转换）
+PIXEL_FORMAT = QImage.Format_ARGB32_Premultiplied
+
+
+class ImageCache:
+    """已缩放图片的两级缓存（内存 LRU + 磁盘原始缓冲区）"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, disk_dir=DEFAULT_DISK_DIR,
+                 max_disk_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+
+    def make_key(self, path, width, height, dpr=1.0, aspect_mode=Qt.KeepAspectRatio):
+        """生成缓存键，源文件被修改后键随之改变"""
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+        return (path, mtime, int(width), int(height), round(float(dpr), 2), int(aspect_mode))
+
+    def get_pixmap(self, path, width, height, dpr=1.0, aspect_mode=Qt.KeepAspectRatio):
+        """获取缩放到 width x height（逻辑像素）的图片，失败时返回空 QPixmap"""
+        try:
+            key = self.make_key(path, width, height, dpr, aspect_mode)
+        except OSError:
+            return QPixmap()
+
+        pixmap = self._entries.get(key)
+        if pixmap is not None:
+            self._entries.move_to_end(key)
+            return pixmap
+
+        image = self._load_from_disk(key)
+        if image is None:
+            image = self._decode_and_scale(key)
+            if image is None:
+                return QPixmap()
+            self._save_to_disk(key, image)
+
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(key[4])
+        self._put(key, pixmap)
+        return pixmap
+
+    def clear(self):
+        """清空内存缓存（磁盘缓存保留）"""
+        self._entries.clear()
+        self._total_bytes = 0
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def _put(self, key, pixmap):
+        size = self._pixmap_bytes(pixmap)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = pixmap
+        self._total_bytes += size
+        while self._total_bytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self._total_bytes -= self._pixmap_bytes(old)
+
+    @staticmethod
+    def _pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def _decode_and_scale(self, key):
+        path, _, width, height, dpr, aspect_mode = key
+        return decode_and_scale(path, width, height, dpr, aspect_mode)
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, digest + ".raw")
+
+    def _load_from_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                data = f.read()
+            magic, width, height, bytes_per_line, fmt = _HEADER.unpack_from(data)
+            if magic != _MAGIC or len(data) < _HEADER.size + bytes_per_line * height:
+                return None
+            image = QImage(data[_HEADER.size:], width, height, bytes_per_line, QImage.Format(fmt))
+            # QImage 不持有 Python 缓冲区，复制一份
+            return image.copy()
+        except (OSError, struct.error):
+            return None
+
+    def _save_to_disk(self, key, image):
+        if not self.disk_dir:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            ptr = image.constBits()
+            ptr.setsize(image.bytesPerLine() * image.height())
+            header = _HEADER.pack(_MAGIC, image.width(), image.height(),
+                                  image.bytesPerLine(), int(image.format()))
+            target = self._disk_path(key)
+            tmp_path = target + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(header)
+                f.write(ptr.asstring())
+            os.replace(tmp_path, target)
+            self._prune_disk()
+        except OSError as e:
+            log.error(f"写入图片缓存时出错: {e}")
+
+    def _prune_disk(self):
+        """磁盘缓存超出预算时删除最旧的文件"""
+        files = []
+        total = 0
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".raw"):
+                continue
+            full = os.path.join(self.disk_dir, name)
+            st = os.stat(full)
+            files.append((st.st_mtime, st.st_size, full))
+            total += st.st_size
+        files.sort()
+        while total > self.max_disk_bytes and files:
+            _, size, full = files.pop(0)
+            try:
+                os.remove(full)
+            except OSError:
+                pass
+            total -= size
+
+
+def decode_and_scale(path, width, height, dpr=1.0, aspect_mode=Qt.KeepAspectRatio):
+    """解码图片文件并缩放到 width x height（逻辑像素）乘以设备像素比，失败时返回 None
+
+    返回预乘 ARGB32 格式的 QImage，可以不经转换直接绘制。
+    """
+    image = QImage(path)
+    if image.isNull():
+        return None
+    target_w = max(1, round(width * dpr))
+    target_h = max(1, round(height * dpr))
+    if image.width() != target_w or image.height() != target_h:
+        image = image.scaled(target_w, target_h, aspect_mode, Qt.SmoothTransformation)
+    return image.convertToFormat(PIXEL_FORMAT)
+
+
+_default_cache = None
+
+
+def get_image_cache():
+    """获取进程内共享的图片缓存"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ImageCache()
+    return _default_cache
+
+
+def clear_image_cache():
+    """清空共享图片缓存的内存部分（缓存尚未创建时什么也不做）"""
+    if _default_cache is not None:
+        _default_cache.clear()
+
+
+def device_pixel_ratio(widget=None):
+    """获取窗口（或主屏幕）的设备像素比"""
+    if widget is not None:
+        return widget.devicePixelRatioF()
+    from PyQt5.QtWidgets import QApplication
+    screen = QApplication.primaryScreen()
+    return screen.devicePixelRatio() if screen is not None else 1.0
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内存整理 - 读取进程常驻内存，并把已释放的内存归还给操作系统
+
+    rss_bytes()      当前进程的常驻内存（字节），无法获取时返回 None
+    release_memory() gc.collect() 后调用 malloc_trim（glibc）或收缩工作集（Windows）
+
+本模块不依赖 Qt；ctypes 在第一次整理时才导入。
+"""
+
+import gc
+import os
+import sys
+
+
+def rss_bytes():
+    """当前进程的常驻内存（字节），无法获取时返回 None"""
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            return None
+    if os.name == "nt":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+        except (OSError, AttributeError):
+            return None
+    return None
+
+
+def _trim_heap():
+    """把空闲的堆内存归还给操作系统，返回是否执行"""
+    try:
+        import ctypes
+        import ctypes.util
+    except ImportError:
+        return False
+    if os.name == "nt":
+        try:
+            kernel32 = ctypes.windll.kernel32
+            # 收缩工作集，空闲页面交还系统（需要时再换入）
+            return bool(kernel32.SetProcessWorkingSetSize(kernel32.GetCurrentProcess(),
+                                                          ctypes.c_size_t(-1), ctypes.c_size_t(-1)))
+        except (OSError, AttributeError):
+            return False
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+        malloc_trim = libc.malloc_trim
+    except (OSError, AttributeError):
+        return False  # 非 glibc（如 macOS、musl）
+    malloc_trim(0)
+    return True
+
+
+def release_memory():
+    """回收垃圾对象并整理堆，返回是否整理了堆"""
+    gc.collect()
+    return _trim_heap()
+
+
+def format_bytes(size):
+    if size is None:
+        return "未知"
+    return f"{size / (1024 * 1024):.1f} MB"
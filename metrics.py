@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行指标 - 以 Prometheus 文本格式提供调度器的计数、直方图和资源占用（默认关闭）
+
+    registry = MetricsRegistry()
+    registry.counter_func("eyecare_timer_wakeups_total", "定时器唤醒次数", lambda: engine.wakeups)
+    latency = registry.histogram("eyecare_reminder_latency_seconds", "提醒触发到窗口显示的延迟")
+    latency.observe(0.012, kind="eye")
+    exporter = MetricsExporter(registry, listen="127.0.0.1:9464", snapshot_file="metrics.prom")
+    exporter.start()
+
+指标在采集线程中读取：计数函数只读取普通的整数属性或加锁的数据，不调用 Qt，
+不需要界面线程参与。监听地址只接受回环地址或 Unix 套接字，供本机的采集程序读取:
+
+    curl http://127.0.0.1:9464/metrics
+    curl --unix-socket /tmp/eyecare-metrics.sock http://localhost/metrics
+"""
+
+import os
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 延迟直方图的默认分桶（秒）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    items = ",".join('{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+                     for key, value in sorted(labels.items()))
+    return "{" + items + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """按标签分组的直方图，observe 可在任意线程调用"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # 标签元组 -> [各分桶计数..., 总和, 总数]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self, name):
+        """返回 (指标名, 标签字典, 值) 列表"""
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        samples = []
+        for key, values in sorted(series.items()):
+            labels = dict(key)
+            for bound, count in zip(self.buckets, values):
+                samples.append((name + "_bucket", dict(labels, le=_format_value(float(bound))), count))
+            samples.append((name + "_bucket", dict(labels, le="+Inf"), values[-1]))
+            samples.append((name + "_sum", labels, values[-2]))
+            samples.append((name + "_count", labels, values[-1]))
+        return samples
+
+
+class MetricsRegistry:
+    """指标注册表：每个指标是一个在采集时调用的函数"""
+
+    def __init__(self):
+        self._metrics = []  # (名称, 类型, 说明, 采集函数)
+        self._lock = threading.Lock()
+
+    def counter_func(self, name, help_text, func):
+        """注册计数器；func 返回数值，或 [(标签字典, 数值), ...]"""
+        self._register(name, "counter", help_text, func)
+
+    def gauge_func(self, name, help_text, func):
+        """注册瞬时值；func 返回数值，或 [(标签字典, 数值), ...]"""
+        self._register(name, "gauge", help_text, func)
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        histogram = Histogram(buckets)
+        with self._lock:
+            self._metrics.append((name, "histogram", help_text, histogram))
+        return histogram
+
+    def _register(self, name, kind, help_text, func):
+        with self._lock:
+            self._metrics.append((name, kind, help_text, func))
+
+    def render(self):
+        """生成 Prometheus 文本格式"""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for name, kind, help_text, source in metrics:
+            try:
+                if kind == "histogram":
+                    samples = source.samples(name)
+                else:
+                    value = source()
+                    if value is None:
+                        continue
+                    if isinstance(value, (int, float)):
+                        samples = [(name, {}, value)]
+                    else:
+                        samples = [(name, labels, v) for labels, v in value]
+            except Exception as e:
+                lines.append(f"# {name} 采集出错: {e}")
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def parse_address(address):
+    """把 "127.0.0.1:9464"、":9464" 或 "unix:/path" 解析为 (地址族, 地址)"""
+    import socket
+
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    host = host or "127.0.0.1"
+    if host not in ("127.0.0.1", "localhost", "::1"):
+        raise ValueError(f"指标只能监听回环地址: {address}")
+    family = socket.AF_INET6 if host == "::1" else socket.AF_INET
+    return family, (host, int(port))
+
+
+class MetricsExporter:
+    """在后台线程中提供指标：HTTP 文本端点和/或定期写入的快照文件"""
+
+    def __init__(self, registry, listen=None, snapshot_file=None, snapshot_interval=60.0):
+        """
+        listen: 监听地址（见 parse_address），None 表示不监听
+        snapshot_file: 快照文件路径，None 表示不写
+        snapshot_interval: 写快照的间隔（秒）
+        """
+        self.registry = registry
+        self.listen = listen
+        self.snapshot_file = snapshot_file
+        self.snapshot_interval = snapshot_interval
+        self.address = None  # 实际监听的地址（端口为 0 时由系统分配）
+        self._server = None
+        self._unix_path = None
+        self._stopped = threading.Event()
+        self._threads = []
+
+    def start(self):
+        import socket
+
+        if self.listen:
+            family, address = parse_address(self.listen)
+            if family == socket.AF_UNIX:
+                try:
+                    os.unlink(address)
+                except FileNotFoundError:
+                    pass
+                self._unix_path = address
+            self._server = socket.socket(family, socket.SOCK_STREAM)
+            if family != socket.AF_UNIX:
+                self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._server.bind(address)
+            if family == socket.AF_UNIX:
+                os.chmod(address, 0o600)
+            self._server.listen(8)
+            self.address = self._server.getsockname()
+            self._spawn(self._serve_loop, "metrics-server")
+        if self.snapshot_file:
+            self._spawn(self._snapshot_loop, "metrics-snapshot")
+
+    def _spawn(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _serve_loop(self):
+        server = self._server
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return  # 服务已关闭
+            with conn:
+                conn.settimeout(2.0)
+                try:
+                    request = b""
+                    while b"\r\n\r\n" not in request and b"\n\n" not in request and len(request) < 8192:
+                        chunk = conn.recv(1024)
+                        if not chunk:
+                            break
+                        request += chunk
+                    path = request.split(b" ", 2)[1] if request.count(b" ") >= 2 else b"/"
+                    if path.split(b"?")[0] in (b"/", b"/metrics"):
+                        status, body, content_type = "200 OK", self.registry.render(), CONTENT_TYPE
+                    else:
+                        status, body, content_type = "404 Not Found", "not found\n", "text/plain"
+                    payload = body.encode("utf-8")
+                    header = (f"HTTP/1.0 {status}\r\nContent-Type: {content_type}\r\n"
+                              f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n")
+                    conn.sendall(header.encode("ascii") + payload)
+                except OSError:
+                    pass
+
+    def write_snapshot(self):
+        """立即写一次快照文件（先写临时文件再替换）"""
+        temp_path = self.snapshot_file + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(f"# 快照时间 {time.strftime('%Y-%m-%dT%H:%M:%S')}\n")
+            f.write(self.registry.render())
+        os.replace(temp_path, self.snapshot_file)
+
+    def _snapshot_loop(self):
+        while True:
+            try:
+                self.write_snapshot()
+            except OSError:
+                pass
+            if self._stopped.wait(self.snapshot_interval):
+                return
+
+    def close(self):
+        """停止监听和写快照，退出前再写一次快照"""
+        import socket
+
+        self._stopped.set()
+        if self._server is not None:
+            try:
+                # 唤醒阻塞在 accept 中的线程
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._server.close()
+            self._server = None
+        if self._unix_path is not None:
+            try:
+                os.unlink(self._unix_path)
+            except OSError:
+                pass
+            self._unix_path = None
+        for thread in self._threads:
+            thread.join(1.0)
+        self._threads = []
+        if self.snapshot_file:
+            try:
+                self.write_snapshot()
+            except OSError:
+                pass
+
+
+def process_metrics(registry):
+    """注册进程的常驻内存和 CPU 时间"""
+    from memory_trim import rss_bytes
+
+    started = time.monotonic()
+    registry.gauge_func("process_resident_memory_bytes", "常驻内存（字节）", rss_bytes)
+    registry.counter_func("process_cpu_seconds_total", "进程占用的 CPU 时间（秒）", time.process_time)
+    registry.gauge_func("eyecare_uptime_seconds", "运行时间（秒）", lambda: time.monotonic() - started)
+    return started
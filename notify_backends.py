@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提醒通知后端 - 调度核心到期后通过后端把提醒送达用户
+
+    QtWindowBackend    在本进程中显示提醒窗口（需要 PyQt5 和 Qt 事件循环）
+    StdoutBackend      输出到终端
+    UnixSocketBackend  通过 Unix 套接字把提醒广播给已连接的客户端（每条一行 JSON）
+
+后端只需实现 notify(kinds)，返回是否送达。
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+
+from reminder_types import get_reminder_type
+
+
+class NotificationBackend:
+    """通知后端基类"""
+
+    def notify(self, kinds):
+        """送达一次提醒；kinds 为同时到期的提醒类型列表"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class QtWindowBackend(NotificationBackend):
+    """显示进程内提醒窗口，多个提醒合并为一个窗口"""
+
+    def __init__(self, window_manager=None):
+        if window_manager is None:
+            from reminder_windows import ReminderWindowManager
+            window_manager = ReminderWindowManager()
+        self.window_manager = window_manager
+
+    def notify(self, kinds):
+        if len(kinds) == 1:
+            return self.window_manager.show_reminder(kinds[0])
+        return self.window_manager.show_combined(kinds)
+
+    def close(self):
+        self.window_manager.close()
+
+
+class StdoutBackend(NotificationBackend):
+    """把提醒输出到终端"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def notify(self, kinds):
+        texts = " / ".join(get_reminder_type(kind).text.replace("\n", " ") for kind in kinds)
+        names = "、".join(get_reminder_type(kind).name for kind in kinds)
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] {names}: {texts}", file=self.stream, flush=True)
+        return True
+
+
+class UnixSocketBackend(NotificationBackend):
+    """在 Unix 套接字上监听，把每次提醒作为一行 JSON 发给全部已连接的客户端
+
+    需要在 asyncio 事件循环中先 await start()。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._server = None
+        self._writers = set()
+
+    async def start(self):
+        import asyncio
+        import os
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._server = await asyncio.start_unix_server(self._on_client, path=self.path)
+
+    async def _on_client(self, reader, writer):
+        import asyncio
+        self._writers.add(writer)
+        try:
+            # 客户端不需要发送内容，读到 EOF 即断开
+            while await reader.read(1024):
+                pass
+        except (ConnectionError, asyncio.CancelledError):
+            # 服务关闭时取消的连接直接结束
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    @staticmethod
+    def encode(kinds):
+        message = {
+            "event": "reminder",
+            "ts": time.time(),
+            "kinds": list(kinds),
+            "texts": [get_reminder_type(kind).text for kind in kinds],
+        }
+        return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def notify(self, kinds):
+        if not self._writers:
+            return False
+        data = self.encode(kinds)
+        for writer in list(self._writers):
+            if writer.is_closing():
+                self._writers.discard(writer)
+                continue
+            writer.write(data)
+        return True
+
+    def close(self):
+        import os
+        for writer in list(self._writers):
+            writer.close()
+        self._writers.clear()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+会话客户端 - 连接多用户守护进程（reminder_daemon.py），收到提醒时才显示窗口
+
+客户端本身不加载 Qt，空闲时只占用一个套接字；每次提醒在子进程中显示提醒窗口。
+
+用法:
+    python reminder_client.py                    常驻，接收并显示提醒（断线后自动重连）
+    python reminder_client.py --stdout           提醒只输出到终端
+    python reminder_client.py status             查询各类提醒的剩余时间
+    python reminder_client.py trigger eye        立即显示一次提醒
+    python reminder_client.py set eye_interval=20 修改设置（保存到守护进程的用户设置中）
+"""
+
+import argparse
+import getpass
+import json
+import socket
+import sys
+import time
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+def connect(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+    return sock
+
+
+def send(sock, message):
+    # 不支持对端凭据的平台上，守护进程用 user 字段确定用户
+    message.setdefault("user", getpass.getuser())
+    sock.sendall((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+_window_manager = None
+
+
+def show_reminder(kinds, use_stdout):
+    """显示提醒：默认每类提醒启动一个窗口子进程（进程由窗口管理器监管和回收）"""
+    global _window_manager
+    if use_stdout:
+        from notify_backends import StdoutBackend
+        StdoutBackend().notify(kinds)
+        return
+    if _window_manager is None:
+        from reminder_windows import ReminderWindowManager, MODE_SUBPROCESS
+        _window_manager = ReminderWindowManager(mode=MODE_SUBPROCESS)
+    _window_manager.show_combined(kinds)
+
+
+def listen(path, use_stdout, retry_delay=5.0):
+    """常驻接收提醒，连接断开后按 retry_delay 重连"""
+    while True:
+        try:
+            sock = connect(path)
+        except OSError as e:
+            print(f"无法连接守护进程 {path}: {e}，{retry_delay:.0f} 秒后重试")
+            time.sleep(retry_delay)
+            continue
+        print(f"已连接守护进程 {path}")
+        with sock:
+            send(sock, {"cmd": "hello"})
+            for line in sock.makefile("r", encoding="utf-8"):
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if message.get("event") == "reminder":
+                    show_reminder(message["kinds"], use_stdout)
+                elif message.get("event") == "error":
+                    print(f"守护进程返回错误: {message.get('message')}")
+        print("与守护进程的连接已断开")
+        time.sleep(retry_delay)
+
+
+def request(path, message):
+    """发送一条命令并返回第一条回复"""
+    with connect(path) as sock:
+        send(sock, message)
+        line = sock.makefile("r", encoding="utf-8").readline()
+    return json.loads(line) if line else None
+
+
+def parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="健康提醒会话客户端")
+    parser.add_argument("command", nargs="*", help="status | trigger <类型> | set 键=值 ...")
+    parser.add_argument("--socket", default=getattr(config, "DAEMON_SOCKET", "/tmp/eyecare-daemon/daemon.sock"),
+                        help="守护进程的 Unix 套接字路径")
+    parser.add_argument("--stdout", action="store_true", help="提醒只输出到终端，不显示窗口")
+    args = parser.parse_args()
+
+    if not args.command:
+        try:
+            listen(args.socket, args.stdout)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    cmd, rest = args.command[0], args.command[1:]
+    if cmd == "status":
+        reply = request(args.socket, {"cmd": "status"})
+        remaining = (reply or {}).get("remaining") or {}
+        if not remaining:
+            print("当前没有在线的会话")
+        for kind, seconds in remaining.items():
+            print(f"{kind}: {int(seconds // 60)}分{int(seconds % 60)}秒后提醒")
+    elif cmd == "trigger" and rest:
+        reply = request(args.socket, {"cmd": "trigger", "kind": rest[0]})
+        if reply and reply.get("event") == "reminder":
+            show_reminder(reply["kinds"], args.stdout)
+        else:
+            print(reply)
+    elif cmd == "set" and rest:
+        changes = dict(item.split("=", 1) for item in rest)
+        reply = request(args.socket, {"cmd": "settings",
+                                      "settings": {k: parse_value(v) for k, v in changes.items()}})
+        print(reply)
+    else:
+        parser.print_usage()
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多用户提醒守护进程 - 一个进程为同一台主机上的全部用户调度提醒
+
+各用户的设置保存在 profiles/<用户名>.json（格式与 user_settings.json 相同）。
+每个会话运行一个轻量客户端（reminder_client.py），通过 Unix 套接字连接守护进程，
+只在收到提醒时才显示窗口。全部用户的提醒共用一个调度核心和一个定时器，
+没有客户端在线的用户不占用调度资源。
+
+用法: python reminder_daemon.py [--socket /tmp/eyecare-daemon/daemon.sock] [--profiles 目录] [--timing-wheel]
+
+协议：双方每行一个 JSON 对象。
+    客户端 -> 守护进程
+        {"cmd": "hello"}                                   登记会话，开始接收提醒
+        {"cmd": "status"}                                  查询各类提醒的剩余时间
+        {"cmd": "settings", "settings": {"eye_interval": 20}}  修改提醒间隔并保存（其他设置项会被拒绝）
+        {"cmd": "trigger", "kind": "eye"}                  立即提醒一次
+    守护进程 -> 客户端
+        {"event": "reminder", "kinds": [...], "texts": [...], "ts": ...}
+        {"event": "status", "user": ..., "remaining": {"eye": 秒数, ...}}
+        {"event": "error", "message": ...}
+
+用户身份取自套接字的对端凭据（SO_PEERCRED，Linux），客户端无法冒充其他用户。
+拿不到对端凭据时拒绝连接，除非在 config.DAEMON_TRUST_CLIENT_USER 中明确开启、改用 hello 消息中的 "user" 字段。
+套接字放在只有守护进程的用户可写的目录中，只有 config.DAEMON_SOCKET_GROUP 组内的用户能连接。
+客户端不读取消息、积压超过 config.DAEMON_CLIENT_BUFFER_LIMIT 字节时断开该连接。
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import stat
+import struct
+
+from reminder_types import REMINDER_TYPES, reminder_type_ids
+from scheduler_core import (SchedulerCore, WheelSchedulerCore, intervals_from_settings, apply_intervals,
+                            valid_interval)
+from notify_backends import UnixSocketBackend
+import app_log
+from app_paths import data_path
+
+try:
+    import config
+except ImportError:
+    config = None
+
+log = app_log.get_logger("reminder_daemon")
+
+
+class UserSchedule:
+    """单个用户的常驻状态：设置文件时间戳、提醒间隔和在线的会话连接"""
+
+    __slots__ = ("user", "intervals", "stamp", "writers")
+
+    def __init__(self, user):
+        self.user = user
+        self.intervals = {}
+        self.stamp = None
+        self.writers = []
+
+
+class _UserView:
+    """把调度核心的类型键映射为 (用户, 类型)，供 apply_intervals 使用"""
+
+    __slots__ = ("core", "user")
+
+    def __init__(self, core, user):
+        self.core = core
+        self.user = user
+
+    def reschedule(self, kind, interval_ms, keep_elapsed=False):
+        self.core.reschedule((self.user, kind), interval_ms, keep_elapsed)
+
+
+def peer_user(writer):
+    """通过 SO_PEERCRED 获取对端用户名，不支持时返回 None"""
+    sock = writer.get_extra_info("socket")
+    if sock is None or not hasattr(socket, "SO_PEERCRED"):
+        return None
+    try:
+        import pwd
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        _, uid, _ = struct.unpack("3i", creds)
+        return pwd.getpwuid(uid).pw_name
+    except (OSError, KeyError, ImportError):
+        return None
+
+
+def settings_errors(changes):
+    """检查客户端提交的设置：只接受各类提醒的间隔，且必须在设置窗口允许的范围内
+
+    返回错误说明列表，没有错误时为空列表。
+    """
+    if not isinstance(changes, dict):
+        return ["设置必须是 JSON 对象"]
+    by_key = {reminder_type.setting_key: reminder_type for reminder_type in REMINDER_TYPES}
+    errors = []
+    for key, value in changes.items():
+        reminder_type = by_key.get(key)
+        if reminder_type is None:
+            errors.append(f"未知的设置项: {key}")
+        elif not valid_interval(value) or value > reminder_type.max_interval:
+            errors.append(f"{reminder_type.name}间隔必须是 1 到 {reminder_type.max_interval} 的整数（分钟）: {value!r}")
+    return errors
+
+
+class ReminderDaemon:
+    """为多个用户调度提醒的守护进程"""
+
+    def __init__(self, socket_path=None, profile_dir=None, reload_interval=5.0, timing_wheel=False,
+                 socket_group=None, trust_client_user=None, buffer_limit=None):
+        """
+        timing_wheel: 用分层时间轮调度（用户很多时使用；不合并相近的提醒，只合并同一秒到期的）
+        socket_group: 可以连接的用户组，默认取 config.DAEMON_SOCKET_GROUP
+        trust_client_user: 拿不到对端凭据时是否相信客户端声明的用户，默认取 config.DAEMON_TRUST_CLIENT_USER
+        buffer_limit: 每个连接积压未读出的字节数上限，超过时断开，默认取 config.DAEMON_CLIENT_BUFFER_LIMIT
+        """
+        if socket_path is None:
+            socket_path = getattr(config, "DAEMON_SOCKET", "/tmp/eyecare-daemon/daemon.sock")
+        if profile_dir is None:
+            profile_dir = getattr(config, "DAEMON_PROFILE_DIR", "profiles")
+        if socket_group is None:
+            socket_group = getattr(config, "DAEMON_SOCKET_GROUP", "")
+        if trust_client_user is None:
+            trust_client_user = getattr(config, "DAEMON_TRUST_CLIENT_USER", False)
+        if buffer_limit is None:
+            buffer_limit = getattr(config, "DAEMON_CLIENT_BUFFER_LIMIT", 64 * 1024)
+        self.socket_path = socket_path
+        self.socket_group = socket_group
+        self.trust_client_user = trust_client_user
+        self.buffer_limit = buffer_limit
+        self.profile_dir = data_path(profile_dir)
+        self.reload_interval = reload_interval
+        self.users = {}  # 用户名 -> UserSchedule（只保存有会话在线的用户）
+        if timing_wheel:
+            self.core = WheelSchedulerCore(self.on_reminders_due)
+        else:
+            self.core = SchedulerCore(self.on_reminders_due)
+        self._server = None
+        self._reload_task = None
+
+    # ---- 用户设置 ----
+
+    def profile_path(self, user):
+        return os.path.join(self.profile_dir, f"{user}.json")
+
+    def _profile_stamp(self, user):
+        try:
+            st = os.stat(self.profile_path(user))
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def load_profile(self, user):
+        """读取用户设置，文件不存在或无法解析时返回空字典（使用默认间隔）"""
+        try:
+            with open(self.profile_path(user), "r", encoding="utf-8") as f:
+                settings = json.load(f)
+            return settings if isinstance(settings, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log.error(f"读取用户 {user} 的设置时出错: {e}", user=user)
+            return {}
+
+    def save_profile(self, user, settings):
+        """写入临时文件后原子替换"""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = self.profile_path(user)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(settings, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    # ---- 会话 ----
+
+    def attach(self, user, writer):
+        """登记会话；用户的第一个会话上线时才开始调度该用户的提醒"""
+        schedule = self.users.get(user)
+        if schedule is None:
+            schedule = UserSchedule(user)
+            schedule.stamp = self._profile_stamp(user)
+            schedule.intervals = intervals_from_settings(self.load_profile(user), REMINDER_TYPES)
+            for kind, minutes in schedule.intervals.items():
+                self.core.add((user, kind), minutes * 60 * 1000)
+            self.users[user] = schedule
+            log.info(f"用户 {user} 上线", user=user)
+        schedule.writers.append(writer)
+        return schedule
+
+    def detach(self, user, writer):
+        """最后一个会话断开后停止调度并释放该用户的状态"""
+        schedule = self.users.get(user)
+        if schedule is None:
+            return
+        if writer in schedule.writers:
+            schedule.writers.remove(writer)
+        if not schedule.writers:
+            for kind in schedule.intervals:
+                self.core.remove((user, kind))
+            del self.users[user]
+            log.info(f"用户 {user} 离线", user=user)
+
+    def apply_profile(self, schedule, settings):
+        """按新设置只重新排期间隔有变化的提醒"""
+        return apply_intervals(_UserView(self.core, schedule.user), schedule.intervals,
+                               settings, REMINDER_TYPES)
+
+    # ---- 提醒 ----
+
+    def on_reminders_due(self, keys):
+        by_user = {}
+        for user, kind in keys:
+            by_user.setdefault(user, []).append(kind)
+        for user, kinds in by_user.items():
+            self.send_reminder(user, kinds)
+
+    def send_reminder(self, user, kinds):
+        schedule = self.users.get(user)
+        if schedule is None:
+            return
+        data = UnixSocketBackend.encode(kinds)
+        for writer in list(schedule.writers):
+            self._write(writer, data, user)
+
+    def status(self, user):
+        schedule = self.users.get(user)
+        if schedule is None:
+            return {}
+        return {kind: self.core.remaining_ms((user, kind)) / 1000.0 for kind in schedule.intervals}
+
+    # ---- 服务 ----
+
+    def _group_id(self):
+        """可以连接的用户组的 gid，未配置或组不存在时返回 None"""
+        if not self.socket_group:
+            return None
+        import grp
+        try:
+            return grp.getgrnam(self.socket_group).gr_gid
+        except KeyError:
+            log.warning(f"用户组 {self.socket_group} 不存在，只有守护进程的用户能连接")
+            return None
+
+    def _prepare_socket_dir(self, gid):
+        """创建套接字目录并检查权限：必须是本用户所有、其他人不可写的真实目录"""
+        directory = os.path.dirname(os.path.abspath(self.socket_path))
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+        st = os.lstat(directory)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+            raise RuntimeError(f"套接字目录 {directory} 不是本用户所有，或其他用户可写，拒绝使用")
+        if gid is None:
+            os.chmod(directory, 0o700)
+        else:
+            # 组内用户只需进入目录连接套接字，不能列出或修改目录
+            os.chown(directory, -1, gid)
+            os.chmod(directory, 0o710)
+
+    async def start(self):
+        gid = self._group_id()
+        self._prepare_socket_dir(gid)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._on_client, path=self.socket_path)
+        # 只有本用户和指定组内的用户能连接，身份由对端凭据确定
+        if gid is None:
+            os.chmod(self.socket_path, 0o600)
+        else:
+            os.chown(self.socket_path, -1, gid)
+            os.chmod(self.socket_path, 0o660)
+        if not hasattr(socket, "SO_PEERCRED") and not self.trust_client_user:
+            log.warning("此平台不支持对端凭据（SO_PEERCRED），将拒绝全部连接；"
+                        "可信环境中可开启 DAEMON_TRUST_CLIENT_USER")
+        self.core.start()
+        self._reload_task = asyncio.get_running_loop().create_task(self._watch_profiles())
+        log.info(f"守护进程已启动: {self.socket_path}", socket=self.socket_path)
+
+    def stop(self):
+        self.core.stop()
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+        for schedule in self.users.values():
+            for writer in schedule.writers:
+                writer.close()
+        self.users.clear()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    async def _watch_profiles(self):
+        """定期检查在线用户的设置文件，被外部修改后重新排期"""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            for schedule in list(self.users.values()):
+                stamp = self._profile_stamp(schedule.user)
+                if stamp != schedule.stamp:
+                    schedule.stamp = stamp
+                    changed = self.apply_profile(schedule, self.load_profile(schedule.user))
+                    if changed:
+                        log.info(f"用户 {schedule.user} 的设置已变化，重新排期: {', '.join(changed)}",
+                                 user=schedule.user, changed=changed)
+
+    def _write(self, writer, data, user=None):
+        """写入一条消息；客户端积压的未读数据超过 buffer_limit 时断开连接，返回是否已写入"""
+        if writer.is_closing():
+            return False
+        pending = writer.transport.get_write_buffer_size()
+        if pending + len(data) > self.buffer_limit:
+            log.warning("客户端长时间不读取消息，断开连接", user=user, pending=pending)
+            # close() 会等积压的数据写完才断开，这里直接丢弃
+            writer.transport.abort()
+            return False
+        writer.write(data)
+        return True
+
+    def _send(self, writer, message):
+        self._write(writer, (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+
+    async def _on_client(self, reader, writer):
+        user = peer_user(writer)
+        attached = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    cmd = message["cmd"]
+                except (ValueError, KeyError, TypeError):
+                    self._send(writer, {"event": "error", "message": "无效的消息"})
+                    continue
+                if user is None:
+                    if not self.trust_client_user:
+                        self._send(writer, {"event": "error", "message": "无法验证对端身份，拒绝连接"})
+                        break
+                    user = message.get("user")
+                if not isinstance(user, str) or not user or os.sep in user or user.startswith("."):
+                    self._send(writer, {"event": "error", "message": "无法确定用户"})
+                    break
+                if cmd == "hello":
+                    if attached is None:
+                        attached = self.attach(user, writer)
+                elif cmd == "status":
+                    self._send(writer, {"event": "status", "user": user, "remaining": self.status(user)})
+                elif cmd == "settings":
+                    self._update_settings(user, message.get("settings"), writer)
+                elif cmd == "trigger" and message.get("kind") in reminder_type_ids():
+                    self._write(writer, UnixSocketBackend.encode([message["kind"]]), user)
+                else:
+                    self._send(writer, {"event": "error", "message": f"未知的命令: {cmd}"})
+                if writer.is_closing():
+                    break
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            if attached is not None:
+                self.detach(user, writer)
+            writer.close()
+
+    def _update_settings(self, user, changes, writer):
+        if changes is None:
+            changes = {}
+        errors = settings_errors(changes)
+        if errors:
+            self._send(writer, {"event": "error", "message": "；".join(errors)})
+            return
+        settings = self.load_profile(user)
+        settings.update(changes)
+        try:
+            self.save_profile(user, settings)
+        except OSError as e:
+            self._send(writer, {"event": "error", "message": f"保存设置失败: {e}"})
+            return
+        changed = []
+        schedule = self.users.get(user)
+        if schedule is not None:
+            schedule.stamp = self._profile_stamp(user)
+            changed = self.apply_profile(schedule, settings)
+        self._send(writer, {"event": "settings", "user": user, "rescheduled": changed})
+
+
+async def main_async(args):
+    daemon = ReminderDaemon(args.socket, args.profiles, timing_wheel=args.timing_wheel)
+    await daemon.start()
+    loop = asyncio.get_running_loop()
+    stop_event = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, AttributeError):
+            pass
+    try:
+        await stop_event.wait()
+    finally:
+        daemon.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多用户健康提醒守护进程")
+    parser.add_argument("--socket", help="监听的 Unix 套接字路径")
+    parser.add_argument("--profiles", help="用户设置目录")
+    parser.add_argument("--timing-wheel", action="store_true", help="用分层时间轮调度（用户很多时使用）")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提醒调度引擎 - 在 Qt 事件循环上运行调度核心
+
+调度逻辑在 scheduler_core.SchedulerCore 中，本模块只提供基于 QTimer 的定时器。
+"""
+
+from PyQt5.QtCore import QTimer, Qt
+
+from scheduler_core import SchedulerCore
+
+
+class QtTimer:
+    """Qt 事件循环上的单次定时器"""
+
+    def __init__(self, callback):
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        # 默认的粗略定时器允许 5% 的误差（40 分钟的间隔可能晚 2 分钟），提醒需要精确到毫秒
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(callback)
+
+    def start(self, delay):
+        self._timer.start(int(delay * 1000))
+
+    def stop(self):
+        self._timer.stop()
+
+
+class ReminderEngine(SchedulerCore):
+    """单定时器 + 优先队列的提醒调度引擎（QTimer 驱动）"""
+
+    def __init__(self, callback, coalesce_window=None, listener=None, resume_policy=None, on_resume=None):
+        super().__init__(callback, QtTimer, coalesce_window, listener,
+                         resume_policy=resume_policy, on_resume=on_resume)
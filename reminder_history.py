@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提醒事件历史 - 记录提醒的触发、显示、关闭和跳过
+
+事件保存在 SQLite 中，每个事件一行（同一毫秒内相同的事件也分别记录），
+(类型, 时间, 事件) 上的覆盖索引使按类型和时间范围查询只需一次索引范围扫描。写入由后台线程批量完成，
+调度器只是把事件放进队列，不会阻塞事件循环。文件超过大小上限时轮转。
+"""
+
+import os
+import queue
+import threading
+import time
+
+import app_log
+from app_paths import data_path
+
+DEFAULT_HISTORY_FILE = data_path("reminder_history.db")
+
+log = app_log.get_logger("reminder_history")
+
+# 事件类型
+EVENT_FIRED = 1      # 提醒到期
+EVENT_SHOWN = 2      # 提醒窗口已显示
+EVENT_DISMISSED = 3  # 提醒窗口被关闭
+EVENT_SKIPPED = 4    # 提醒被跳过（如程序停止期间错过）
+
+EVENT_NAMES = {
+    EVENT_FIRED: "fired",
+    EVENT_SHOWN: "shown",
+    EVENT_DISMISSED: "dismissed",
+    EVENT_SKIPPED: "skipped",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kinds (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    kind INTEGER NOT NULL,
+    ts INTEGER NOT NULL,      -- Unix 时间戳（毫秒）
+    event INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_kind_ts ON events (kind, ts, event);
+"""
+
+# 旧版本的事件表以 (kind, ts, event) 为主键，同一毫秒内相同的事件只保留一条，打开时迁移
+_MIGRATE_V1 = """
+ALTER TABLE events RENAME TO events_v1;
+""" + _SCHEMA + """
+INSERT INTO events (kind, ts, event) SELECT kind, ts, event FROM events_v1;
+DROP TABLE events_v1;
+"""
+
+
+class ReminderHistory:
+    """提醒事件历史存储"""
+
+    def __init__(self, path=DEFAULT_HISTORY_FILE, max_bytes=8 * 1024 * 1024,
+                 backup_count=5, queue_size=10000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._read_lock = threading.Lock()
+        self._readers = {}  # 文件路径 -> 只读连接（查询线程使用）
+        self._writer = threading.Thread(target=self._writer_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, kind, event, ts=None):
+        """记录一个事件（不阻塞，队列满时丢弃并计数）"""
+        if ts is None:
+            ts = time.time()
+        try:
+            self._queue.put_nowait((kind, int(ts * 1000), event))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=2.0):
+        """写完队列中剩余的事件后停止后台线程（最多等待 timeout 秒）"""
+        if self._writer.is_alive():
+            try:
+                # 后台线程已退出或卡住时队列不会再被取空，不能无限等待
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                log.warning(f"提醒历史队列已满，放弃写入剩余的 {self._queue.qsize()} 个事件")
+            else:
+                self._writer.join(timeout)
+        with self._read_lock:
+            for conn in self._readers.values():
+                conn.close()
+            self._readers.clear()
+
+    # ---- 写入（后台线程） ----
+
+    @staticmethod
+    def _connect(path):
+        # sqlite3 在后台线程中首次使用时才导入，不占用调度器启动时间
+        import sqlite3
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(events)")]
+        if columns and "id" not in columns:
+            conn.executescript("BEGIN;" + _MIGRATE_V1 + "COMMIT;")
+        else:
+            conn.executescript(_SCHEMA)
+        return conn
+
+    def _writer_loop(self):
+        try:
+            conn = self._connect(self.path)
+        except Exception as e:
+            log.error(f"无法打开提醒历史，不再记录事件: {e}", path=self.path)
+            return
+        kind_ids = {}
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # 一次取出队列中积攒的全部事件，在一个事务中写入
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            rows = []
+            for entry in batch:
+                if entry is None:
+                    continue
+                kind, ts, event = entry
+                if kind not in kind_ids:
+                    kind_ids[kind] = self._kind_id(conn, kind)
+                rows.append((kind_ids[kind], ts, event))
+            try:
+                with conn:
+                    conn.executemany("INSERT INTO events (kind, ts, event) VALUES (?, ?, ?)", rows)
+                if os.path.getsize(self.path) > self.max_bytes:
+                    conn.close()
+                    self._rotate()
+                    conn = self._connect(self.path)
+                    kind_ids = {}
+            except Exception as e:
+                log.error(f"写入提醒历史时出错: {e}")
+            if stop:
+                conn.close()
+                return
+
+    @staticmethod
+    def _kind_id(conn, kind):
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO kinds (name) VALUES (?)", (kind,))
+        return conn.execute("SELECT id FROM kinds WHERE name = ?", (kind,)).fetchone()[0]
+
+    def _rotated_path(self, index):
+        root, ext = os.path.splitext(self.path)
+        return f"{root}.{index}{ext}"
+
+    def _rotate(self):
+        """当前文件改名为 .1，已有的备份依次后移，超出数量的删除"""
+        with self._read_lock:
+            for conn in self._readers.values():
+                conn.close()
+            self._readers.clear()
+            for index in range(self.backup_count, 0, -1):
+                source = self.path if index == 1 else self._rotated_path(index - 1)
+                target = self._rotated_path(index)
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(target + suffix):
+                        os.remove(target + suffix)
+                    if os.path.exists(source + suffix):
+                        os.replace(source + suffix, target + suffix)
+
+    # ---- 查询 ----
+
+    def _files(self):
+        """当前文件和全部轮转文件（从新到旧）"""
+        files = [self.path]
+        files += [self._rotated_path(i) for i in range(1, self.backup_count + 1)]
+        return [path for path in files if os.path.exists(path)]
+
+    def _reader(self, path):
+        import sqlite3
+        conn = self._readers.get(path)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+            self._readers[path] = conn
+        return conn
+
+    def query(self, kind, start, end, event=None):
+        """查询某类提醒在 [start, end) 时间范围内的事件，返回 [(时间戳, 事件类型), ...]"""
+        sql = ("SELECT e.ts, e.event FROM events e JOIN kinds k ON e.kind = k.id "
+               "WHERE k.name = ? AND e.ts >= ? AND e.ts < ?")
+        params = [kind, int(start * 1000), int(end * 1000)]
+        if event is not None:
+            sql += " AND e.event = ?"
+            params.append(event)
+        import sqlite3
+        results = []
+        with self._read_lock:
+            for path in self._files():
+                try:
+                    rows = self._reader(path).execute(sql, params).fetchall()
+                except sqlite3.Error:
+                    continue
+                results.extend((ts / 1000.0, ev) for ts, ev in rows)
+        results.sort()
+        return results
+
+    def count(self, kind, start, end, event=None):
+        """统计某类提醒在 [start, end) 时间范围内的事件数"""
+        sql = ("SELECT COUNT(*) FROM events e JOIN kinds k ON e.kind = k.id "
+               "WHERE k.name = ? AND e.ts >= ? AND e.ts < ?")
+        params = [kind, int(start * 1000), int(end * 1000)]
+        if event is not None:
+            sql += " AND e.event = ?"
+            params.append(event)
+        import sqlite3
+        total = 0
+        with self._read_lock:
+            for path in self._files():
+                try:
+                    total += self._reader(path).execute(sql, params).fetchone()[0]
+                except sqlite3.Error:
+                    continue
+        return total
+
+
+if __name__ == '__main__':
+    import sys
+
+    # 用法: python reminder_history.py <类型> [最近几小时，默认24]
+    if len(sys.argv) < 2:
+        print("用法: python reminder_history.py <类型标识> [小时数]")
+        sys.exit(1)
+    hours = float(sys.argv[2]) if len(sys.argv) > 2 else 24
+    history = ReminderHistory()
+    now = time.time()
+    for ts, event in history.query(sys.argv[1], now - hours * 3600, now):
+        print(time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts)), EVENT_NAMES.get(event, event))
+    history.close()
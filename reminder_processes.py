@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提醒进程监管 - 跟踪子进程模式下启动的提醒窗口进程
+
+    - 后台线程定期回收已退出的进程（不留僵尸进程）
+    - 同一类提醒的进程还在时不再启动第二个
+    - 同时存在的提醒进程数有上限
+    - 超过存活时间上限的进程先请求结束，仍不退出则强制结束
+
+回收线程只在有子进程时运行，没有子进程时自动退出。
+"""
+
+import subprocess
+import threading
+import time
+
+import app_log
+
+try:
+    import config
+except ImportError:
+    config = None
+
+log = app_log.get_logger("reminder_processes")
+
+
+class _Child:
+    __slots__ = ("kind", "process", "started", "terminated")
+
+    def __init__(self, kind, process):
+        self.kind = kind
+        self.process = process
+        self.started = time.monotonic()
+        self.terminated = None  # 请求结束的时间
+
+
+class ReminderProcessSupervisor:
+    """启动并监管提醒窗口子进程"""
+
+    def __init__(self, max_processes=None, lifetime=None, poll_interval=1.0, kill_grace=5.0):
+        """
+        max_processes: 同时存在的提醒进程上限，默认取 config.REMINDER_MAX_PROCESSES
+        lifetime: 提醒进程的存活时间上限（秒），默认取 config.REMINDER_PROCESS_LIFETIME，0 表示不限
+        kill_grace: 请求结束后等待多久再强制结束（秒）
+        """
+        if max_processes is None:
+            max_processes = getattr(config, "REMINDER_MAX_PROCESSES", 3)
+        if lifetime is None:
+            lifetime = getattr(config, "REMINDER_PROCESS_LIFETIME", 600)
+        self.max_processes = max_processes
+        self.lifetime = lifetime
+        self.poll_interval = poll_interval
+        self.kill_grace = kill_grace
+        self._children = {}  # 提醒类型 -> _Child
+        self._lock = threading.Lock()
+        self._reaper = None
+        self._stopped = threading.Event()
+
+    def live(self, kind=None):
+        """存活的提醒进程数（指定类型时只统计该类型）"""
+        self.reap()
+        with self._lock:
+            if kind is not None:
+                return 1 if kind in self._children else 0
+            return len(self._children)
+
+    def count(self):
+        """当前跟踪的提醒进程数（不回收，可在任意线程调用）"""
+        return len(self._children)
+
+    def launch(self, kind, args, cwd=None):
+        """启动某类提醒的进程，重复或超出上限时不启动，返回是否启动"""
+        self.reap()
+        with self._lock:
+            if kind in self._children:
+                log.info(f"{kind}提醒进程仍在运行，不再重复启动", kind=kind)
+                return False
+            if self.max_processes and len(self._children) >= self.max_processes:
+                log.warning(f"提醒进程已达上限（{self.max_processes}个），不启动{kind}提醒", kind=kind)
+                return False
+            try:
+                process = subprocess.Popen(args, cwd=cwd)
+            except Exception as e:
+                log.error(f"启动{kind}提醒进程时出错: {e}", kind=kind)
+                return False
+            self._children[kind] = _Child(kind, process)
+            self._ensure_reaper()
+        return True
+
+    def reap(self):
+        """回收已退出的进程，结束超过存活时间上限的进程"""
+        now = time.monotonic()
+        with self._lock:
+            for kind, child in list(self._children.items()):
+                if child.process.poll() is not None:
+                    del self._children[kind]
+                    continue
+                if child.terminated is None:
+                    if self.lifetime and now - child.started > self.lifetime:
+                        log.warning(f"{kind}提醒进程超过 {self.lifetime} 秒，结束该进程", kind=kind)
+                        child.terminated = now
+                        self._signal(child.process.terminate)
+                elif now - child.terminated > self.kill_grace:
+                    self._signal(child.process.kill)
+            return len(self._children)
+
+    def terminate_all(self, timeout=2.0):
+        """结束全部提醒进程并停止回收线程"""
+        self._stopped.set()
+        with self._lock:
+            children = list(self._children.values())
+            self._children.clear()
+            # 回收线程退出时会把 _reaper 置为 None，先取出引用再等待
+            reaper = self._reaper
+        for child in children:
+            self._signal(child.process.terminate)
+        deadline = time.monotonic() + timeout
+        for child in children:
+            try:
+                child.process.wait(max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                self._signal(child.process.kill)
+                child.process.wait()
+        if reaper is not None:
+            reaper.join(timeout)
+
+    @staticmethod
+    def _signal(func):
+        try:
+            func()
+        except OSError:
+            pass  # 进程已经退出
+
+    def _ensure_reaper(self):
+        """调用方需持有 _lock"""
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._stopped.clear()
+        self._reaper = threading.Thread(target=self._reap_loop, name="reminder-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self):
+        while not self._stopped.wait(self.poll_interval):
+            with self._lock:
+                if not self._children:
+                    # 没有子进程时退出，下次启动进程时再创建
+                    self._reaper = None
+                    return
+            self.reap()
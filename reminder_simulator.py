@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提醒调度模拟器 - 用虚拟时钟快速重放几周到几个月的提醒计划
+
+调度核心（scheduler_core）运行在虚拟时钟上，不需要等待真实时间，
+可以模拟休眠、程序重启和设置修改，输出期间会触发的全部提醒。
+
+用法:
+    python reminder_simulator.py [场景.json] [--days 7] [--start 2026-01-05T09:00]
+                                 [--nightly-suspend 23:00-07:00]
+                                 [--policy fire_once|skip] [--resume-policy fire_once|skip|spread]
+                                 [--coalesce 60] [--json]
+
+场景文件示例:
+    {
+        "start": "2026-01-05T09:00",
+        "duration": "7d",
+        "settings": {"eye_interval": 40, "water_interval": 30},
+        "nightly_suspend": "23:00-07:00",
+        "events": [
+            {"at": "3h", "type": "suspend", "duration": "1h30m"},
+            {"at": "1d2h", "type": "settings", "settings": {"eye_interval": 20}},
+            {"at": "2d4h", "type": "restart", "downtime": "10m"}
+        ]
+    }
+
+"at" 是相对开始时间的偏移；时长可写成 "1d2h30m"、"90s" 或秒数。
+休眠期间墙上时间前进而单调时钟停止，与 Linux 一致；调度核心在下次定时器醒来时发现休眠，
+按 --resume-policy 处理期间到期的提醒。
+"""
+
+import argparse
+import heapq
+import json
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+import app_log
+from reminder_types import REMINDER_TYPES
+from scheduler_core import SchedulerCore, intervals_from_settings, start_schedule, apply_intervals
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)([dhms])")
+_UNITS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+
+
+def parse_duration(value):
+    """把 "1d2h30m"、"90s" 或数字解析为秒数"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = value.replace(" ", "")
+    total = 0.0
+    pos = 0
+    for match in _DURATION_RE.finditer(text):
+        if match.start() != pos:
+            break
+        total += float(match.group(1)) * _UNITS[match.group(2)]
+        pos = match.end()
+    if pos != len(text) or not text:
+        raise ValueError(f"无法解析的时长: {value!r}")
+    return total
+
+
+class VirtualClock:
+    """虚拟时钟：同时提供墙上时间和单调时钟，并管理挂在它上面的定时器"""
+
+    def __init__(self, wall_start):
+        self.wall = float(wall_start)
+        self.mono = 0.0
+        self._timers = []  # (单调时钟到期时间, 序号, 定时器)
+        self._seq = 0
+
+    def time(self):
+        return self.wall
+
+    def monotonic(self):
+        return self.mono
+
+    def timer_factory(self, callback):
+        return VirtualTimer(self, callback)
+
+    def _push(self, timer, deadline):
+        self._seq += 1
+        heapq.heappush(self._timers, (deadline, self._seq, timer))
+        return self._seq
+
+    def run_until(self, wall_target):
+        """运行到指定墙上时间，途中依次触发到期的定时器"""
+        while self._timers:
+            deadline, seq, timer = self._timers[0]
+            if timer.seq != seq:
+                heapq.heappop(self._timers)
+                continue
+            step = deadline - self.mono
+            if self.wall + step > wall_target:
+                break
+            heapq.heappop(self._timers)
+            self.wall += step
+            self.mono = deadline
+            timer.seq = None
+            timer.callback()
+        if wall_target > self.wall:
+            self.mono += wall_target - self.wall
+            self.wall = wall_target
+
+    def suspend(self, duration):
+        """系统休眠：墙上时间前进，单调时钟不动"""
+        self.wall += duration
+
+    def clear(self):
+        self._timers.clear()
+
+
+class VirtualTimer:
+    """虚拟时钟上的单次定时器，接口与 AsyncioTimer/QtTimer 相同"""
+
+    __slots__ = ("clock", "callback", "seq")
+
+    def __init__(self, clock, callback):
+        self.clock = clock
+        self.callback = callback
+        self.seq = None
+
+    def start(self, delay):
+        self.seq = self.clock._push(self, self.clock.mono + delay)
+
+    def stop(self):
+        self.seq = None
+
+
+class ReminderSimulator:
+    """在虚拟时钟上运行调度核心，记录提醒和场景事件"""
+
+    def __init__(self, start, settings=None, policy=None, coalesce_window=None, catch_up_delay=None,
+                 resume_policy=None):
+        self.clock = VirtualClock(start)
+        self.start_time = float(start)
+        self.settings = dict(settings or {})
+        self.policy = policy
+        self.coalesce_window = coalesce_window
+        self.catch_up_delay = catch_up_delay
+        self.resume_policy = resume_policy
+        self.timeline = []  # (墙上时间, 类型, 详情)
+        self.fired = []     # (墙上时间, [提醒类型...])
+        self._states = {}   # 与 ScheduleStateStore.load() 相同的格式
+        self.core = None
+        self.intervals = None
+        self._boot()
+
+    def _boot(self):
+        self.clock.clear()
+        self.core = SchedulerCore(self._on_due, self.clock.timer_factory,
+                                  self.coalesce_window, self._record_schedule,
+                                  clock=self.clock.monotonic, wall_clock=self.clock.time,
+                                  resume_policy=self.resume_policy, on_resume=self._on_resume)
+        self.intervals = intervals_from_settings(self.settings, REMINDER_TYPES)
+        skipped = start_schedule(self.core, self.intervals, self._states, self.policy,
+                                 self.catch_up_delay, now=self.clock.time())
+        for kind in skipped:
+            self._log("skipped", kind)
+
+    def _log(self, event, detail):
+        self.timeline.append((self.clock.time(), event, detail))
+
+    def _record_schedule(self, kind, remaining, fired):
+        now = self.clock.time()
+        last_fired = now if fired else self._states.get(kind, (0.0, 0.0))[0]
+        self._states[kind] = (last_fired, now + remaining)
+
+    def _on_resume(self, gap, overdue, skipped):
+        self._log("resumed", {"gap": gap, "overdue": overdue, "skipped": skipped})
+        for kind in skipped:
+            self._log("skipped", kind)
+
+    def _on_due(self, kinds):
+        self.fired.append((self.clock.time(), list(kinds)))
+        self._log("reminder", list(kinds))
+
+    # ---- 场景操作 ----
+
+    def run_until(self, wall_time):
+        self.clock.run_until(wall_time)
+
+    def suspend(self, duration):
+        self._log("suspend", duration)
+        self.clock.suspend(duration)
+        self._log("resume", duration)
+
+    def restart(self, downtime=0.0):
+        """停止程序，经过 downtime 秒后按保存的计划状态重新启动"""
+        self._log("stop", downtime)
+        self.core.stop()
+        self.clock.clear()
+        self.clock.run_until(self.clock.time() + downtime)
+        self._boot()
+        self._log("start", downtime)
+
+    def update_settings(self, changes):
+        """与 SimpleScheduler.update_settings 相同：只重新排期间隔有变化的提醒"""
+        self.settings.update(changes)
+        changed = apply_intervals(self.core, self.intervals, self.settings, REMINDER_TYPES)
+        self._log("settings", {"changes": dict(changes), "rescheduled": changed})
+
+    def run_scenario(self, duration, events=()):
+        """按时间顺序执行场景事件，直到 duration 秒后结束"""
+        end = self.start_time + duration
+        for event in sorted(events, key=lambda e: e["at"]):
+            at = self.start_time + event["at"]
+            if at > end:
+                break
+            self.run_until(at)
+            kind = event["type"]
+            if kind == "suspend":
+                self.suspend(event["duration"])
+            elif kind == "restart":
+                self.restart(event.get("downtime", 0.0))
+            elif kind == "settings":
+                self.update_settings(event["settings"])
+            else:
+                raise ValueError(f"未知的场景事件: {kind}")
+        self.run_until(max(end, self.clock.time()))
+        self.core.stop()
+
+
+def nightly_suspend_events(start, duration, spec):
+    """根据 "23:00-07:00" 生成每晚的休眠事件"""
+    begin, finish = [datetime.strptime(part, "%H:%M").time() for part in spec.split("-")]
+    start_dt = datetime.fromtimestamp(start)
+    events = []
+    day = start_dt.date()
+    while True:
+        sleep_at = datetime.combine(day, begin)
+        wake_at = datetime.combine(day, finish)
+        if wake_at <= sleep_at:
+            wake_at += timedelta(days=1)
+        offset = sleep_at.timestamp() - start
+        if offset > duration:
+            break
+        if offset >= 0:
+            events.append({"at": offset, "type": "suspend",
+                           "duration": wake_at.timestamp() - sleep_at.timestamp()})
+        day += timedelta(days=1)
+    return events
+
+
+def load_scenario(args):
+    """合并场景文件和命令行参数"""
+    scenario = {}
+    if args.scenario:
+        with open(args.scenario, "r", encoding="utf-8") as f:
+            scenario = json.load(f)
+    if args.start:
+        scenario["start"] = args.start
+    if args.days is not None:
+        scenario["duration"] = args.days * 86400
+    if args.nightly_suspend:
+        scenario["nightly_suspend"] = args.nightly_suspend
+
+    if "start" in scenario:
+        start = datetime.fromisoformat(scenario["start"]).timestamp()
+    else:
+        start = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0).timestamp()
+    duration = parse_duration(scenario.get("duration", 7 * 86400))
+    events = []
+    for event in scenario.get("events", []):
+        event = dict(event)
+        event["at"] = parse_duration(event["at"])
+        for key in ("duration", "downtime"):
+            if key in event:
+                event[key] = parse_duration(event[key])
+        events.append(event)
+    if scenario.get("nightly_suspend"):
+        events += nightly_suspend_events(start, duration, scenario["nightly_suspend"])
+    return start, duration, scenario.get("settings", {}), events
+
+
+def format_time(ts):
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def format_timeline(simulator):
+    names = {t.id: t.name for t in REMINDER_TYPES}
+    lines = []
+    for ts, event, detail in simulator.timeline:
+        if event == "reminder":
+            text = "、".join(names.get(kind, kind) for kind in detail)
+        elif event in ("suspend", "resume", "stop", "start"):
+            text = f"-- {event} ({timedelta(seconds=int(detail))})"
+        elif event == "resumed":
+            text = (f"-- 发现休眠唤醒 ({timedelta(seconds=int(detail['gap']))})"
+                    f" 到期: {', '.join(detail['overdue']) or '无'}")
+        elif event == "settings":
+            text = f"-- settings {detail['changes']} 重新排期: {', '.join(detail['rescheduled']) or '无'}"
+        else:
+            text = f"-- {event} {detail}"
+        lines.append(f"{format_time(ts)}  {text}")
+    counts = {}
+    for _, kinds in simulator.fired:
+        for kind in kinds:
+            counts[kind] = counts.get(kind, 0) + 1
+    lines.append("共 {} 次提醒: {}".format(
+        len(simulator.fired), ", ".join(f"{names.get(k, k)} {n}次" for k, n in counts.items())))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="提醒调度模拟器")
+    parser.add_argument("scenario", nargs="?", help="场景 JSON 文件")
+    parser.add_argument("--start", help="开始时间（ISO 格式，如 2026-01-05T09:00）")
+    parser.add_argument("--days", type=float, help="模拟天数（默认 7）")
+    parser.add_argument("--nightly-suspend", help="每晚休眠时段，如 23:00-07:00")
+    parser.add_argument("--policy", choices=["fire_once", "skip"], help="错过提醒的处理策略")
+    parser.add_argument("--resume-policy", choices=["fire_once", "skip", "spread"],
+                        help="休眠唤醒后到期提醒的处理策略")
+    parser.add_argument("--coalesce", type=float, help="合并窗口（秒）")
+    parser.add_argument("--catch-up-delay", type=float, help="补提醒前的等待秒数")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出")
+    args = parser.parse_args()
+
+    # 模拟过程已经记录在时间线中，调度核心的日志（真实时间戳）不再输出，也不写入程序的日志文件
+    app_log.configure(app_log.LogPipeline(console=False))
+    start, duration, settings, events = load_scenario(args)
+    begin = time.perf_counter()
+    simulator = ReminderSimulator(start, settings, args.policy, args.coalesce, args.catch_up_delay,
+                                  args.resume_policy)
+    simulator.run_scenario(duration, events)
+    elapsed = time.perf_counter() - begin
+
+    if args.json:
+        print(json.dumps({
+            "start": format_time(start),
+            "duration_s": duration,
+            "reminders": [{"time": format_time(ts), "ts": ts, "kinds": kinds}
+                          for ts, kinds in simulator.fired],
+            "timeline": [{"time": format_time(ts), "event": event, "detail": detail}
+                         for ts, event, detail in simulator.timeline],
+        }, ensure_ascii=False, indent=2))
+    else:
+        print(format_timeline(simulator))
+    print(f"模拟 {timedelta(seconds=int(duration))} 用时 {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提醒类型注册表 - 每种提醒都是一条声明式条目
+
+托盘菜单、调度、设置窗口和 user_settings.json 的默认值都由这里生成。
+本模块不依赖 PyQt5，窗口和图片只在某类提醒第一次触发时才创建。
+"""
+
+from schedule_state import encode_kind
+
+# 提醒文字的默认样式：白色文字、粉色背景、圆角
+DEFAULT_TEXT_STYLE = """
+    QLabel {
+        color: #FFFFFF;          /* 文字颜色为白色 */
+        background-color: #FFB6C1; /* 背景颜色为粉色 */
+        border-radius: 10px;     /* 圆角边框 */
+        padding: 5px;            /* 内边距 */
+    }
+"""
+
+# 提醒文字的默认字体：(字体名, 字号, 是否加粗)
+DEFAULT_TEXT_FONT = ("幼圆", 14, True)
+
+# 提醒窗口的默认窗口标志（Qt.WindowType 的名称，创建窗口时再转换）：无边框 + 置顶
+DEFAULT_WINDOW_FLAGS = ("FramelessWindowHint", "WindowStaysOnTopHint")
+
+
+class ReminderType:
+    """一种提醒的声明式描述"""
+
+    def __init__(self, id, name, menu_text, title, default_interval, image, text,
+                 window_size, image_rect, text_rect, keep_aspect=False,
+                 max_interval=120, text_style=DEFAULT_TEXT_STYLE,
+                 text_font=DEFAULT_TEXT_FONT, icon=None, window_flags=DEFAULT_WINDOW_FLAGS):
+        encode_kind(id)  # 类型标识要能完整保存到计划状态文件，过长时注册即报错
+        self.id = id                            # 类型标识，也用于设置键名
+        self.name = name                        # 显示名称，如“眼睛休息”
+        self.menu_text = menu_text              # 托盘菜单中“立即提醒”的文字
+        self.title = title                      # 窗口标题
+        self.default_interval = default_interval  # 默认间隔（分钟）
+        self.max_interval = max_interval        # 设置窗口允许的最大间隔（分钟）
+        self.image = image                      # 图片路径（相对于项目目录）
+        self.text = text                        # 提醒文字
+        self.window_size = window_size          # 窗口大小 (宽, 高)
+        self.image_rect = image_rect            # 图片位置和大小 (x, y, 宽, 高)
+        self.keep_aspect = keep_aspect          # 缩放图片时是否保持宽高比
+        self.text_rect = text_rect              # 文字位置和大小 (x, y, 宽, 高)
+        self.text_style = text_style            # 文字 QSS 样式
+        self.text_font = text_font              # 文字字体
+        self.icon = icon or image               # 单独运行时的程序图标
+        self.window_flags = tuple(window_flags)  # 窗口标志，Qt.WindowType 的名称
+
+    @property
+    def setting_key(self):
+        """该类型的间隔在 user_settings.json 中的键名"""
+        return f"{self.id}_interval"
+
+
+# 根据原图比例设置体态提醒窗口大小 (878x1159 -> 约0.76的宽高比)
+_POSTURE_WIDTH = 600
+_POSTURE_HEIGHT = int(_POSTURE_WIDTH / 0.76)  # 约789
+
+REMINDER_TYPES = [
+    ReminderType(
+        id="eye",
+        name="眼睛休息",
+        menu_text="立即休息眼睛",
+        title="眼睛休息提醒",
+        default_interval=40,
+        image="eye/eye.jpg",
+        text="眼睛酸了就眨眨眼\n眼睛累了就歇一会",
+        window_size=(474, 600),
+        # 图片在上，文字标签在图片下方，刚好与图片底部对齐
+        image_rect=(0, 0, 474, 500),
+        keep_aspect=True,
+        text_rect=(0, 500, 474, 100),
+    ),
+    ReminderType(
+        id="water",
+        name="喝水提醒",
+        menu_text="立即喝水提醒",
+        title="喝水提醒",
+        default_interval=30,
+        image="drink_water.jpg",
+        text="喝点水吧，对身体好哦！😘",
+        window_size=(600, 550),
+        # 图片铺满窗口，文字标签距离底部10像素
+        image_rect=(0, 0, 600, 550),
+        text_rect=(0, 550 - 50 - 10, 600, 50),
+        icon="drink.png",
+        # 无边框，不置顶
+        window_flags=("FramelessWindowHint",),
+    ),
+    ReminderType(
+        id="posture",
+        name="体态提醒",
+        menu_text="立即体态提醒",
+        title="体态提醒",
+        default_interval=60,
+        max_interval=180,
+        image="posture.jpg",
+        text="注意体态！不然会背酸颈痛😭",
+        window_size=(_POSTURE_WIDTH, _POSTURE_HEIGHT),
+        image_rect=(0, 0, _POSTURE_WIDTH, _POSTURE_HEIGHT),
+        text_rect=(0, _POSTURE_HEIGHT - 50 - 10, _POSTURE_WIDTH, 50),
+        # 无边框，不置顶
+        window_flags=("FramelessWindowHint",),
+    ),
+]
+
+_REGISTRY = {reminder_type.id: reminder_type for reminder_type in REMINDER_TYPES}
+
+
+def get_reminder_type(type_id):
+    """按标识获取提醒类型"""
+    return _REGISTRY[type_id]
+
+
+def reminder_type_ids():
+    """全部提醒类型标识（按注册顺序）"""
+    return [reminder_type.id for reminder_type in REMINDER_TYPES]
+
+
+def default_intervals():
+    """各类提醒的默认间隔设置，如 {"eye_interval": 40, ...}"""
+    return {reminder_type.setting_key: reminder_type.default_interval
+            for reminder_type in REMINDER_TYPES}
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+通用提醒窗口 - 根据提醒类型注册表中的条目创建窗口
+
+单独运行: python reminder_window.py <类型标识> [显示秒数]，如 python reminder_window.py eye 5
+
+显示时间到后窗口淡出并隐藏，隐藏时释放窗口持有的图片，下次显示时再从资源包（没有资源包时从图片缓存）取回。
+"""
+
+import os
+import sys
+
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QPropertyAnimation
+from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel
+from PyQt5.QtGui import QFont
+
+from asset_bundle import get_pixmap, get_icon, image_aspect_mode
+from image_cache import device_pixel_ratio
+from reminder_types import get_reminder_type
+import app_log
+
+log = app_log.get_logger("reminder_window")
+
+# 自动关闭时淡出动画的时长（毫秒）
+FADE_DURATION = 400
+
+
+def window_flags(reminder_type):
+    """提醒类型声明的窗口标志"""
+    flags = Qt.WindowFlags()
+    for name in reminder_type.window_flags:
+        flags |= getattr(Qt, name)
+    return flags
+
+
+class ReminderWin(QMainWindow):
+    # 窗口被隐藏或关闭时发出
+    hidden = pyqtSignal()
+    # 窗口显示后第一次绘制完成时发出（用户真正看到提醒的时刻）
+    shown = pyqtSignal()
+
+    def __init__(self, reminder_type, display_time=0):
+        """display_time: 显示多少秒后自动淡出关闭，0 表示不自动关闭"""
+        super(ReminderWin, self).__init__()
+        self.reminder_type = reminder_type
+        self.display_time = display_time
+        self._image_loaded = False
+        self._awaiting_paint = False
+        self._fade = None
+        self._dismiss_timer = QTimer(self)
+        self._dismiss_timer.setSingleShot(True)
+        self._dismiss_timer.timeout.connect(self.fade_out)
+        self.initUI()
+
+    def initUI(self):
+        reminder_type = self.reminder_type
+        self.resize(*reminder_type.window_size)  # 设置窗口大小
+        # 设置窗口标志（由提醒类型决定，默认无边框 + 置顶）
+        self.setWindowFlags(window_flags(reminder_type))
+        # 为窗口设置一个对象名，方便使用QSS设置样式
+        self.setObjectName("MainWindow")
+        # 添加窗口标题
+        self.setWindowTitle(reminder_type.title)
+
+        # 背景图片：从资源包（或图片缓存）获取已缩放好的图片，绘制时不再缩放
+        self.image_label = QLabel(self)
+        self.image_label.setGeometry(*reminder_type.image_rect)
+        self.load_image()
+
+        # 添加文字标签
+        self.text_label = QLabel(reminder_type.text, self)
+        family, size, bold = reminder_type.text_font
+        self.text_label.setFont(QFont(family, size, QFont.Bold if bold else QFont.Normal))
+        self.text_label.setStyleSheet(reminder_type.text_style)
+        self.text_label.setAlignment(Qt.AlignCenter)  # 文字居中对齐
+        self.text_label.setGeometry(*reminder_type.text_rect)
+
+    def load_image(self):
+        """加载缩放到图片区域大小的图片"""
+        reminder_type = self.reminder_type
+        _, _, width, height = reminder_type.image_rect
+        pixmap = get_pixmap(reminder_type.image, width, height, device_pixel_ratio(),
+                            image_aspect_mode(reminder_type))
+        if pixmap.isNull():
+            log.warning(f"无法加载图片 {reminder_type.image}", kind=reminder_type.id)
+        self.image_label.setPixmap(pixmap)
+        self._image_loaded = True
+
+    def release_image(self):
+        """释放窗口持有的图片（资源包映射在内存中，图片缓存中的副本按缓存上限管理）"""
+        self.image_label.clear()
+        self._image_loaded = False
+
+    def fade_out(self):
+        """淡出后隐藏窗口"""
+        if self._fade is None:
+            self._fade = QPropertyAnimation(self, b"windowOpacity", self)
+            self._fade.setDuration(FADE_DURATION)
+            self._fade.setEndValue(0.0)
+            self._fade.finished.connect(self.hide)
+        self._fade.stop()
+        self._fade.setStartValue(self.windowOpacity())
+        self._fade.start()
+
+    def present(self):
+        """显示提醒；窗口已经显示（或正在淡出）时重新开始计时，不会按上一次提醒的时间消失"""
+        if self.isVisible():
+            self._restart_display()
+            self.update()
+        else:
+            self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def _restart_display(self):
+        """停止淡出，恢复不透明，重新开始自动关闭计时"""
+        if self._fade is not None:
+            self._fade.stop()
+        self.setWindowOpacity(1.0)
+        if self.display_time > 0:
+            self._dismiss_timer.start(int(self.display_time * 1000))
+        else:
+            self._dismiss_timer.stop()
+        self._awaiting_paint = True
+
+    def showEvent(self, event):
+        if not self._image_loaded:
+            self.load_image()
+        self._restart_display()
+        super().showEvent(event)
+        self.activateWindow()  # 激活窗口
+        self.raise_()  # 将窗口提升到最前面
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._awaiting_paint:
+            self._awaiting_paint = False
+            self.shown.emit()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._dismiss_timer.stop()
+        if self._fade is not None:
+            self._fade.stop()
+        self.release_image()
+        self.hidden.emit()
+
+
+def run_reminder(type_id, display_time=0):
+    """以独立程序的方式显示一个提醒窗口，窗口关闭后退出"""
+    reminder_type = get_reminder_type(type_id)
+    app = QApplication(sys.argv)
+    app.setWindowIcon(get_icon(reminder_type.icon))
+    # 创建一个主窗口
+    mainWin = ReminderWin(reminder_type, display_time)
+    mainWin.hidden.connect(app.quit)
+    # 显示
+    mainWin.show()
+    if os.environ.get("EYECARE_STARTUP_PROBE"):
+        # 启动耗时测量（benchmarks/bundle_startup.py）：事件循环开始处理后报告并退出
+        QTimer.singleShot(0, lambda: (print("READY", flush=True), app.quit()))
+    # 主循环
+    return app.exec_()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("用法: python reminder_window.py <类型标识> [显示秒数]")
+        sys.exit(1)
+    sys.exit(run_reminder(sys.argv[1], float(sys.argv[2]) if len(sys.argv) > 2 else 0))
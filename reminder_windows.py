@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提醒窗口管理器 - 在调度器进程内复用提醒窗口
+
+某类提醒的窗口在它第一次触发时才创建。窗口显示 display_time 秒后自动淡出，
+隐藏时释放图片；按 REMINDER_DISMISS_MODE 留在窗口池中复用，或直接销毁。
+"""
+
+import os
+import sys
+
+from reminder_types import get_reminder_type
+import app_log
+
+try:
+    import config
+except ImportError:
+    config = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+log = app_log.get_logger("reminder_windows")
+
+# 子进程模式下运行的通用提醒窗口脚本
+REMINDER_SCRIPT = os.path.join(BASE_DIR, "reminder_window.py")
+
+# 提醒窗口模式：inprocess 为进程内常驻窗口，subprocess 为每次启动新进程
+MODE_INPROCESS = "inprocess"
+MODE_SUBPROCESS = "subprocess"
+
+# 提醒窗口隐藏后的处理：pool 保留窗口（已释放图片）下次复用，close 销毁窗口
+DISMISS_POOL = "pool"
+DISMISS_CLOSE = "close"
+
+
+def reminder_command(kind, display_time=0):
+    """显示单个提醒窗口的子进程命令行；打包后的程序通过 reminder 子命令显示"""
+    if getattr(sys, "frozen", False):
+        return [sys.executable, "reminder", kind, str(display_time)]
+    return [sys.executable, REMINDER_SCRIPT, kind, str(display_time)]
+
+
+class ReminderWindowManager:
+    """管理各类提醒窗口：首次触发时创建 ReminderWin 实例，之后按需显示和隐藏"""
+
+    def __init__(self, mode=None, on_hidden=None, display_time=None, dismiss_mode=None, on_shown=None):
+        """
+        on_hidden: 可选，提醒窗口被关闭时调用，参数为该窗口显示的提醒类型列表
+        on_shown: 可选，进程内提醒窗口显示后首次绘制完成时调用，参数同 on_hidden
+        display_time: 提醒窗口显示多少秒后自动关闭，0 表示不自动关闭；
+                      默认取 config.REMINDER_DISPLAY_TIME
+        dismiss_mode: 窗口隐藏后保留复用（pool）还是销毁（close），默认取 config.REMINDER_DISMISS_MODE
+        """
+        if mode is None:
+            mode = getattr(config, "REMINDER_WINDOW_MODE", MODE_INPROCESS)
+        if display_time is None:
+            display_time = getattr(config, "REMINDER_DISPLAY_TIME", 0)
+        if dismiss_mode is None:
+            dismiss_mode = getattr(config, "REMINDER_DISMISS_MODE", DISMISS_POOL)
+        self.mode = mode
+        self.display_time = display_time
+        self.dismiss_mode = dismiss_mode
+        self.on_hidden = on_hidden
+        self.on_shown = on_shown
+        self._processes = None  # 子进程监管器，首次启动子进程时创建
+        self.windows = {}
+        self._showing = {}  # 窗口所属类型 -> 当前显示的提醒类型列表（合并提醒时有多个）
+
+    def get_window(self, kind):
+        """获取（必要时创建）某类提醒的窗口"""
+        window = self.windows.get(kind)
+        if window is None:
+            # 窗口模块在第一次需要时才导入
+            from reminder_window import ReminderWin
+            window = ReminderWin(get_reminder_type(kind), self.display_time)
+            window.hidden.connect(lambda kind=kind: self._window_hidden(kind))
+            window.shown.connect(lambda kind=kind: self._window_shown(kind))
+            self.windows[kind] = window
+        return window
+
+    def show_reminder(self, kind):
+        """显示某类提醒，进程内窗口不可用时回退到子进程模式"""
+        if self.mode == MODE_INPROCESS:
+            try:
+                window = self.get_window(kind)
+                self._restore_single(window)
+                self._showing[kind] = [kind]
+                window.present()
+                return True
+            except Exception as e:
+                log.warning(f"进程内显示{kind}提醒失败，改用子进程: {e}", kind=kind)
+        return self.launch_subprocess(kind)
+
+    def show_combined(self, kinds):
+        """把同时到期的多个提醒合并为一个窗口：使用第一个提醒的窗口，文字合并显示"""
+        if self.mode == MODE_INPROCESS:
+            try:
+                texts = [get_reminder_type(kind).text for kind in kinds]
+                window = self.get_window(kinds[0])
+                label = window.text_label
+                # 合并后的文字更多，标签向上扩展，底边保持不变
+                x, y, width, single_height = window.reminder_type.text_rect
+                line_height = label.fontMetrics().lineSpacing()
+                lines = sum(text.count("\n") + 1 for text in texts)
+                height = max(single_height, line_height * lines + 20)
+                label.setGeometry(x, y + single_height - height, width, height)
+                label.setText("\n".join(texts))
+                self._showing[kinds[0]] = list(kinds)
+                window.present()
+                return True
+            except Exception as e:
+                log.warning(f"进程内显示合并提醒失败，改用子进程: {e}", kinds=kinds)
+        # 子进程模式无法合并，逐个启动
+        return all([self.launch_subprocess(kind) for kind in kinds])
+
+    @staticmethod
+    def _restore_single(window):
+        """恢复被合并提醒修改过的文字和标签位置"""
+        label = window.text_label
+        label.setGeometry(*window.reminder_type.text_rect)
+        label.setText(window.reminder_type.text)
+
+    def set_display_time(self, seconds):
+        """修改自动关闭时间，对已创建的窗口从下次显示起生效"""
+        self.display_time = seconds
+        for window in self.windows.values():
+            window.display_time = seconds
+
+    def _window_shown(self, kind):
+        kinds = self._showing.get(kind)
+        if kinds and self.on_shown is not None:
+            self.on_shown(kinds)
+
+    def _window_hidden(self, kind):
+        if self.dismiss_mode == DISMISS_CLOSE:
+            window = self.windows.pop(kind, None)
+            if window is not None:
+                window.deleteLater()
+        kinds = self._showing.pop(kind, None)
+        if kinds and self.on_hidden is not None:
+            self.on_hidden(kinds)
+
+    def hide_reminder(self, kind):
+        """隐藏某类提醒窗口（窗口保留以便下次复用）"""
+        window = self.windows.get(kind)
+        if window is not None:
+            window.hide()
+
+    def hide_all(self):
+        """隐藏全部提醒窗口"""
+        for window in list(self.windows.values()):
+            window.hide()
+
+    def drop_hidden(self):
+        """销毁当前未显示的提醒窗口（下次提醒时重新创建），返回销毁的数量"""
+        dropped = 0
+        for kind, window in list(self.windows.items()):
+            if not window.isVisible():
+                del self.windows[kind]
+                window.deleteLater()
+                dropped += 1
+        return dropped
+
+    def has_visible(self):
+        return any(window.isVisible() for window in self.windows.values())
+
+    def counts(self):
+        """(正在显示的窗口数, 已创建的窗口数, 提醒进程数)，只读取计数，可在任意线程调用"""
+        processes = self._processes.count() if self._processes is not None else 0
+        return len(self._showing), len(self.windows), processes
+
+    def launch_subprocess(self, kind):
+        """以子进程方式运行提醒窗口脚本（回退模式），进程由监管器跟踪和回收"""
+        if self._processes is None:
+            from reminder_processes import ReminderProcessSupervisor
+            self._processes = ReminderProcessSupervisor()
+        return self._processes.launch(kind, reminder_command(kind, self.display_time), cwd=BASE_DIR)
+
+    def close(self):
+        """隐藏全部窗口，结束仍在运行的提醒进程"""
+        self.hide_all()
+        if self._processes is not None:
+            self._processes.terminate_all()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提醒计划状态文件 - 跨重启保存每类提醒的上次触发时间和下次到期时间
+
+文件为固定大小的二进制槽位表，通过 mmap 原地更新单个槽位，
+每次提醒触发或重新排期只改写几十个字节，不需要整体重写文件。
+"""
+
+import os
+import mmap
+import struct
+import time
+
+from app_paths import data_path
+
+DEFAULT_STATE_FILE = data_path("schedule_state.bin")
+
+_MAGIC = b"EYESCHD1"
+# 类型标识的最大长度（UTF-8 字节数），更长的标识不能保存
+KIND_MAX_BYTES = 16
+# 槽位: 类型标识(16字节) + 上次触发时间 + 下次到期时间（均为 Unix 时间戳）
+_SLOT = struct.Struct(f"<{KIND_MAX_BYTES}sdd")
+MAX_SLOTS = 64
+_FILE_SIZE = len(_MAGIC) + _SLOT.size * MAX_SLOTS
+
+# 错过提醒的补偿策略
+POLICY_FIRE_ONCE = "fire_once"  # 启动后很快补一次提醒（错过多次也只补一次）
+POLICY_SKIP = "skip"            # 跳过错过的提醒，按原来的节奏等下一次
+POLICY_SPREAD = "spread"        # 休眠唤醒后把错过的提醒逐个错开显示（程序重启时同 fire_once）
+
+
+def encode_kind(kind):
+    """类型标识在槽位中的编码；超过 KIND_MAX_BYTES 字节时抛出 ValueError
+
+    截断后的标识重新读取时对不上原来的类型，还可能截断多字节字符，所以不截断。
+    """
+    encoded = kind.encode("utf-8")
+    if len(encoded) > KIND_MAX_BYTES:
+        raise ValueError(f"提醒类型标识 {kind!r} 超过 {KIND_MAX_BYTES} 字节（UTF-8），无法保存到计划状态文件")
+    return encoded
+
+
+class ScheduleStateStore:
+    """提醒计划状态的槽位表存储"""
+
+    def __init__(self, path=DEFAULT_STATE_FILE):
+        self.path = path
+        self._file = None
+        self._map = None
+        self._slots = {}  # 类型标识 -> 槽位序号
+        self._open()
+
+    def _open(self):
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) != _FILE_SIZE
+        self._file = open(self.path, "w+b" if new_file else "r+b")
+        if new_file:
+            self._file.write(_MAGIC + b"\0" * (_FILE_SIZE - len(_MAGIC)))
+            self._file.flush()
+        self._map = mmap.mmap(self._file.fileno(), _FILE_SIZE)
+        if self._map[:len(_MAGIC)] != _MAGIC:
+            # 文件损坏，清空重建
+            self._map[:] = _MAGIC + b"\0" * (_FILE_SIZE - len(_MAGIC))
+        for index in range(MAX_SLOTS):
+            name, _, _ = _SLOT.unpack_from(self._map, self._offset(index))
+            name = name.rstrip(b"\0").decode("utf-8", "replace")
+            if name:
+                self._slots[name] = index
+
+    @staticmethod
+    def _offset(index):
+        return len(_MAGIC) + index * _SLOT.size
+
+    def load(self):
+        """读取全部记录: {类型标识: (上次触发时间, 下次到期时间)}，时间为 0 表示未知"""
+        states = {}
+        for kind, index in self._slots.items():
+            _, last_fired, next_due = _SLOT.unpack_from(self._map, self._offset(index))
+            states[kind] = (last_fired, next_due)
+        return states
+
+    def update(self, kind, next_due, last_fired=None):
+        """原地更新一类提醒的记录；last_fired 为 None 时保留原值
+
+        类型标识超过 KIND_MAX_BYTES 字节时抛出 ValueError。
+        """
+        encoded = encode_kind(kind)
+        index = self._slots.get(kind)
+        if index is None:
+            used = set(self._slots.values())
+            free = [i for i in range(MAX_SLOTS) if i not in used]
+            if not free:
+                return
+            index = free[0]
+            self._slots[kind] = index
+            old_last_fired = 0.0
+        else:
+            _, old_last_fired, _ = _SLOT.unpack_from(self._map, self._offset(index))
+        if last_fired is None:
+            last_fired = old_last_fired
+        _SLOT.pack_into(self._map, self._offset(index),
+                        encoded, last_fired, next_due)
+
+    def flush(self):
+        """把修改写回磁盘"""
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self):
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def restore_delay(state, interval, policy=POLICY_FIRE_ONCE, catch_up_delay=60.0, now=None):
+    """根据保存的状态计算首次提醒前的等待秒数，没有可用状态时返回 None
+
+    state: (上次触发时间, 下次到期时间)；interval: 当前间隔（秒）
+    """
+    if now is None:
+        now = time.time()
+    if state is None:
+        return None
+    _, next_due = state
+    if next_due <= 0:
+        return None
+    if next_due > now:
+        # 间隔在程序停止期间被调小时，不超过新的间隔
+        return min(next_due - now, interval)
+    # 程序停止期间错过了提醒
+    if policy == POLICY_SKIP:
+        missed = int((now - next_due) // interval) + 1
+        return next_due + missed * interval - now
+    return min(catch_up_delay, interval)
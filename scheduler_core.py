@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+调度核心 - 不依赖 Qt 的提醒调度逻辑
+
+核心维护一个按到期时间排序的堆，只为最早到期的提醒设置一个定时器。
+到期时，把在合并窗口内同样即将到期的提醒一并取出，作为一次合并提醒发出。
+
+提醒数量很多时（如多用户守护进程）可以改用 WheelSchedulerCore，它用分层时间轮
+代替堆，插入、取消和重新排期都是 O(1)，同一刻度到期的提醒一次取出。
+
+定时器由事件循环适配器提供，只需实现 start(延迟秒数) 和 stop()：
+本模块提供 asyncio 适配器 AsyncioTimer，Qt 适配器见 reminder_engine.py。
+"""
+
+import asyncio
+import heapq
+import time
+
+from timing_wheel import TimingWheel, WheelEntry
+from schedule_state import POLICY_FIRE_ONCE, POLICY_SKIP, POLICY_SPREAD
+import app_log
+
+try:
+    import config
+except ImportError:
+    config = None
+
+log = app_log.get_logger("scheduler_core")
+
+
+class AsyncioTimer:
+    """asyncio 事件循环上的单次定时器"""
+
+    def __init__(self, callback, loop=None):
+        self.callback = callback
+        self.loop = loop
+        self._handle = None
+
+    def start(self, delay):
+        self.stop()
+        loop = self.loop or asyncio.get_event_loop()
+        self._handle = loop.call_later(delay, self.callback)
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+
+class _Entry:
+    """一类提醒的调度状态：间隔（秒）、到期时间（单调时钟）、最新堆元素的序号"""
+
+    __slots__ = ("interval", "deadline", "seq")
+
+    def __init__(self, interval, deadline, seq):
+        self.interval = interval
+        self.deadline = deadline
+        self.seq = seq
+
+
+class SchedulerCore:
+    """单定时器 + 优先队列的提醒调度核心
+
+    到期时间是单调时钟上的绝对时间，提醒触发后下次到期时间在上次到期时间上加一个间隔，
+    定时器的误差不会累积。每次定时器醒来时比较单调时钟和墙上时间：
+        - 墙上时间比单调时钟多走了很多：系统休眠过而单调时钟没有计入（Linux），
+          把这段时间计入各提醒的到期时间
+        - 定时器比预定时间晚了很多：系统休眠过而单调时钟照常计时（Windows），或进程被挂起
+    两种情况都视为休眠唤醒，对期间到期的提醒按 resume_policy 处理。
+    """
+
+    def __init__(self, callback, timer_factory=AsyncioTimer, coalesce_window=None,
+                 listener=None, clock=time.monotonic, wall_clock=time.time,
+                 resume_policy=None, on_resume=None):
+        """
+        callback: 提醒到期时调用，参数为本次到期的提醒类型列表
+        timer_factory: 以到期处理函数为参数创建定时器，定时器需实现 start(秒) 和 stop()
+        coalesce_window: 合并窗口（秒），在此时间内到期的提醒合并为一次
+        listener: 可选，某类提醒的下次到期时间变化时调用，
+                  参数为 (类型, 距离到期的秒数, 是否因触发而变化)
+        clock: 单调时钟函数，返回秒数
+        wall_clock: 墙上时间函数，只用于发现休眠唤醒和时钟跳变
+        resume_policy: 休眠唤醒后到期提醒的处理方式，默认取 config.RESUME_POLICY
+        on_resume: 可选，发现休眠唤醒时调用，参数为 (休眠秒数, 到期的提醒类型列表, 被跳过的提醒类型列表)
+        """
+        if coalesce_window is None:
+            coalesce_window = getattr(config, "REMINDER_COALESCE_WINDOW", 60)
+        if resume_policy is None:
+            resume_policy = getattr(config, "RESUME_POLICY", POLICY_FIRE_ONCE)
+        self.callback = callback
+        self.coalesce_window = coalesce_window
+        self.listener = listener
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.resume_policy = resume_policy
+        self.on_resume = on_resume
+        # 判定为休眠唤醒的时间差、唤醒后逐个显示的间隔、定时器最长等待时间（秒）
+        self.resume_threshold = getattr(config, "RESUME_DETECT_THRESHOLD", 30)
+        self.spread_interval = getattr(config, "RESUME_SPREAD_INTERVAL", 120)
+        self.max_sleep = getattr(config, "RESUME_CHECK_INTERVAL", 15 * 60)
+        # 上次观察到的 (单调时钟, 墙上时间)，以及定时器预定醒来的单调时钟时间
+        self._observed = None
+        self._expected = None
+        # 堆元素: (到期时间, 序号, 类型)；过期的堆元素通过序号识别并跳过
+        self._heap = []
+        self._entries = {}  # 类型 -> _Entry
+        self._seq = 0
+        self._running = False
+        self.wakeups = 0  # 定时器唤醒次数（供运行指标读取）
+
+        self._timer = timer_factory(self._on_timeout)
+
+    def add(self, kind, interval_ms, first_delay_ms=None):
+        """添加（或替换）一个按 interval_ms 周期提醒的类型
+
+        first_delay_ms: 首次提醒前的等待时间，默认为一个完整间隔
+        """
+        if first_delay_ms is None:
+            first_delay_ms = interval_ms
+        self._schedule(kind, interval_ms / 1000.0, self.clock() + first_delay_ms / 1000.0)
+
+    def reschedule(self, kind, interval_ms, keep_elapsed=False):
+        """修改提醒间隔；keep_elapsed 为 True 时保留已经过的时间"""
+        interval = interval_ms / 1000.0
+        now = self.clock()
+        entry = self._entries.get(kind)
+        if keep_elapsed and entry is not None:
+            elapsed = entry.interval - (entry.deadline - now)
+            deadline = now + max(0.0, interval - elapsed)
+        else:
+            deadline = now + interval
+        self._schedule(kind, interval, deadline)
+
+    def remove(self, kind):
+        """移除某类提醒"""
+        if self._entries.pop(kind, None) is not None:
+            self._arm()
+
+    def remaining_ms(self, kind):
+        """距离某类提醒下次到期的剩余毫秒数"""
+        entry = self._entries.get(kind)
+        if entry is None:
+            return -1
+        return max(0, int((entry.deadline - self.clock()) * 1000))
+
+    def kinds(self):
+        return list(self._entries)
+
+    def start(self):
+        self._running = True
+        self._observed = (self.clock(), self.wall_clock())
+        self._arm()
+
+    def stop(self):
+        self._running = False
+        self._expected = None
+        self._timer.stop()
+
+    def _schedule(self, kind, interval, deadline):
+        self._seq += 1
+        self._entries[kind] = _Entry(interval, deadline, self._seq)
+        heapq.heappush(self._heap, (deadline, self._seq, kind))
+        self._notify(kind, deadline, False)
+        self._arm()
+
+    def _notify(self, kind, deadline, fired):
+        if self.listener is not None:
+            try:
+                self.listener(kind, deadline - self.clock(), fired)
+            except Exception as e:
+                log.error(f"记录{kind}提醒计划时出错: {e}", kind=kind)
+
+    def _peek(self):
+        """返回最早的有效堆元素，顺便丢弃已失效的元素"""
+        while self._heap:
+            deadline, seq, kind = self._heap[0]
+            entry = self._entries.get(kind)
+            if entry is not None and entry.seq == seq:
+                return self._heap[0]
+            heapq.heappop(self._heap)
+        return None
+
+    def _arm(self):
+        """只为最早到期的提醒设置定时器（max_sleep 不为 0 时最长等待这么多秒，以便较早发现休眠唤醒）"""
+        if not self._running:
+            return
+        head = self._peek()
+        if head is None:
+            self._expected = None
+            self._timer.stop()
+            return
+        now = self.clock()
+        delay = max(0.0, head[0] - now)
+        if self.max_sleep:
+            delay = min(delay, self.max_sleep)
+        self._expected = now + delay
+        self._timer.start(delay)
+
+    def _check_resume(self, now):
+        """比较两个时钟，发现休眠唤醒时按策略处理期间到期的提醒"""
+        wall = self.wall_clock()
+        observed, self._observed = self._observed, (now, wall)
+        if observed is None:
+            return
+        # 墙上时间多走的部分：单调时钟没有计入的休眠，或墙上时间被向前调整
+        hidden = (wall - observed[1]) - (now - observed[0])
+        # 定时器迟到的部分：单调时钟计入了休眠，或进程长时间没能运行
+        late = now - self._expected if self._expected is not None else 0.0
+        if hidden < -self.resume_threshold:
+            log.info(f"墙上时间被向后调整了 {-hidden:.0f} 秒，按单调时钟继续计时")
+        gap = max(hidden, 0.0) + max(late, 0.0)
+        if gap < self.resume_threshold:
+            return
+        if hidden > 0:
+            # 休眠期间单调时钟停止：到期时间减去这段时间，与实际经过的时间一致
+            for entry in self._entries.values():
+                entry.deadline -= hidden
+        overdue = sorted((kind for kind, entry in self._entries.items() if entry.deadline <= now),
+                         key=lambda kind: self._entries[kind].deadline)
+        skipped = []
+        if self.resume_policy == POLICY_SKIP:
+            for kind in overdue:
+                entry = self._entries[kind]
+                missed = int((now - entry.deadline) // entry.interval) + 1
+                entry.deadline += missed * entry.interval
+            skipped = overdue
+        elif self.resume_policy == POLICY_SPREAD:
+            # 错开的间隔大于合并窗口，避免又被合并为一次
+            step = max(self.spread_interval, self.coalesce_window + 1)
+            for index, kind in enumerate(overdue):
+                self._entries[kind].deadline = now + index * step
+        # fire_once：到期的提醒在本次一起触发，合并为一次显示
+        self._rebuild_heap()
+        log.info(f"检测到休眠唤醒（约 {gap:.0f} 秒），到期的提醒: {', '.join(map(str, overdue)) or '无'}"
+                 f"，处理方式: {self.resume_policy}",
+                 gap=round(gap, 3), overdue=overdue, policy=self.resume_policy)
+        if self.on_resume is not None:
+            self.on_resume(gap, overdue, skipped)
+
+    def _rebuild_heap(self):
+        """到期时间被批量修改后重建堆"""
+        self._heap = []
+        for kind, entry in self._entries.items():
+            self._seq += 1
+            entry.seq = self._seq
+            self._heap.append((entry.deadline, self._seq, kind))
+            self._notify(kind, entry.deadline, False)
+        heapq.heapify(self._heap)
+
+    def _on_timeout(self):
+        self.wakeups += 1
+        now = self.clock()
+        self._check_resume(now)
+        horizon = now + self.coalesce_window
+        due = []
+        while True:
+            head = self._peek()
+            if head is None or head[0] > horizon:
+                break
+            # 最早的提醒还没到期时（定时器提前唤醒），不触发合并
+            if not due and head[0] > now:
+                break
+            heapq.heappop(self._heap)
+            due.append(head[2])
+        # 取完后再重新排期，避免短间隔的提醒在同一轮里被重复取出
+        for kind in due:
+            entry = self._entries[kind]
+            self._seq += 1
+            # 在上次到期时间上加一个间隔，定时器的误差不累积；错过不止一次时从现在重新计时
+            entry.deadline += entry.interval
+            if entry.deadline <= now:
+                entry.deadline = now + entry.interval
+            entry.seq = self._seq
+            heapq.heappush(self._heap, (entry.deadline, self._seq, kind))
+            self._notify(kind, entry.deadline, True)
+        self._arm()
+        if due:
+            self.callback(due)
+
+
+class _WheelEntry(WheelEntry):
+    """时间轮中的周期提醒，额外记录间隔（秒）"""
+
+    __slots__ = ("interval",)
+
+
+class WheelSchedulerCore:
+    """基于分层时间轮的调度核心，接口与 SchedulerCore 相同
+
+    到期时间按刻度（tick 秒）向上取整，同一刻度到期的提醒合并为一次回调，不另做合并窗口。
+    """
+
+    def __init__(self, callback, timer_factory=AsyncioTimer, tick=1.0, listener=None,
+                 clock=time.monotonic):
+        self.callback = callback
+        self.listener = listener
+        self.clock = clock
+        self._wheel = TimingWheel(tick, start=clock())
+        self._entries = {}  # 类型 -> _WheelEntry
+        self._running = False
+        self.wakeups = 0
+        self._timer = timer_factory(self._on_timeout)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, kind, interval_ms, first_delay_ms=None):
+        if first_delay_ms is None:
+            first_delay_ms = interval_ms
+        entry = self._entries.get(kind)
+        if entry is None:
+            entry = self._entries[kind] = _WheelEntry(kind)
+        entry.interval = interval_ms / 1000.0
+        self._schedule(entry, first_delay_ms / 1000.0, False)
+
+    def reschedule(self, kind, interval_ms, keep_elapsed=False):
+        entry = self._entries.get(kind)
+        if entry is None:
+            self.add(kind, interval_ms)
+            return
+        interval = interval_ms / 1000.0
+        delay = interval
+        if keep_elapsed:
+            elapsed = entry.interval - self._remaining(entry)
+            delay = max(0.0, interval - elapsed)
+        entry.interval = interval
+        self._schedule(entry, delay, False)
+
+    def remove(self, kind):
+        entry = self._entries.pop(kind, None)
+        if entry is not None:
+            self._wheel.cancel(entry)
+
+    def remaining_ms(self, kind):
+        entry = self._entries.get(kind)
+        if entry is None:
+            return -1
+        return max(0, int(self._remaining(entry) * 1000))
+
+    def kinds(self):
+        return list(self._entries)
+
+    def start(self):
+        self._running = True
+        self._arm()
+
+    def stop(self):
+        self._running = False
+        self._timer.stop()
+
+    def _remaining(self, entry):
+        return self._wheel.time_of(entry.deadline) - self.clock()
+
+    def _schedule(self, entry, delay, fired):
+        # 按绝对时间排期：时间轮只在定时器触发时推进，当前刻度可能落后于时钟
+        self._wheel.schedule_at(entry, self.clock() + delay)
+        if self.listener is not None:
+            try:
+                self.listener(entry.key, self._remaining(entry), fired)
+            except Exception as e:
+                log.error(f"记录{entry.key}提醒计划时出错: {e}", kind=entry.key)
+        if not fired:
+            self._arm()
+
+    def _arm(self):
+        if not self._running:
+            return
+        expiry = self._wheel.next_expiry()
+        if expiry is None:
+            self._timer.stop()
+            return
+        self._timer.start(max(0.0, expiry - self.clock()))
+
+    def _on_timeout(self):
+        self.wakeups += 1
+        due = [entry.key for entry in self._wheel.advance(self.clock())]
+        for kind in due:
+            entry = self._entries[kind]
+            self._schedule(entry, entry.interval, True)
+        self._arm()
+        if due:
+            self.callback(due)
+
+
+def intervals_from_settings(settings, reminder_types):
+    """从设置字典中读取各类提醒的间隔（分钟），无效值使用默认间隔"""
+    intervals = {}
+    for reminder_type in reminder_types:
+        interval = settings.get(reminder_type.setting_key, reminder_type.default_interval)
+        if not valid_interval(interval):
+            log.warning(f"忽略无效的{reminder_type.name}间隔: {interval!r}", kind=reminder_type.id)
+            interval = reminder_type.default_interval
+        intervals[reminder_type.id] = interval
+    return intervals
+
+
+def valid_interval(interval):
+    """间隔必须是不小于 1 的整数（分钟）"""
+    return isinstance(interval, int) and not isinstance(interval, bool) and interval >= 1
+
+
+def start_schedule(core, intervals, states=None, policy=None, catch_up_delay=None, now=None):
+    """按间隔（分钟）向调度核心添加全部提醒，并按保存的状态恢复到期时间
+
+    states: schedule_state.ScheduleStateStore.load() 的结果
+    now: 当前墙上时间，默认 time.time()
+    返回程序停止期间错过、且按策略被跳过的提醒类型列表
+    """
+    from schedule_state import restore_delay, POLICY_FIRE_ONCE, POLICY_SKIP
+
+    if policy is None:
+        policy = getattr(config, "MISSED_REMINDER_POLICY", POLICY_FIRE_ONCE)
+    if catch_up_delay is None:
+        catch_up_delay = getattr(config, "MISSED_REMINDER_DELAY", 60)
+    states = states or {}
+    if now is None:
+        now = time.time()
+    skipped = []
+    for kind, minutes in intervals.items():
+        interval_ms = minutes * 60 * 1000
+        state = states.get(kind)
+        delay = restore_delay(state, interval_ms / 1000, policy, catch_up_delay, now)
+        if policy == POLICY_SKIP and state is not None and 0 < state[1] < now:
+            skipped.append(kind)
+        core.add(kind, interval_ms, None if delay is None else int(delay * 1000))
+    core.start()
+    return skipped
+
+
+def apply_intervals(core, intervals, settings, reminder_types):
+    """应用新设置：只重新排期间隔有变化的提醒（保留已经过的时间）
+
+    intervals: 当前间隔字典（分钟），会被原地更新
+    返回间隔有变化的提醒类型列表
+    """
+    changed = []
+    for reminder_type in reminder_types:
+        interval = settings.get(reminder_type.setting_key, reminder_type.default_interval)
+        if not valid_interval(interval):
+            log.warning(f"忽略无效的{reminder_type.name}间隔: {interval!r}", kind=reminder_type.id)
+            continue
+        if interval != intervals.get(reminder_type.id):
+            intervals[reminder_type.id] = interval
+            core.reschedule(reminder_type.id, interval * 60 * 1000, keep_elapsed=True)
+            changed.append(reminder_type.id)
+    return changed
@@ -2,26 +2,80 @@
 # -*- coding: utf-8 -*-
 """
 设置管理器 - 用于保存和加载用户设置
+
+设置文件解析后缓存为只读快照，只有文件的修改时间或大小变化时才重新读取。
+保存采用延迟写入：短时间内的多次修改合并为一次，由后台线程写入临时文件后
+原子替换，避免写到一半时崩溃留下被截断的设置文件。
 """
 
+import atexit
 import json
 import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from types import MappingProxyType
+
+from reminder_types import default_intervals
+import app_log
+from app_paths import data_path
+
+log = app_log.get_logger("settings_manager")
+
+# 进程中的设置管理器（弱引用，不影响回收），退出时统一写入待保存的设置
+_managers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for manager in list(_managers):
+        manager.flush()
+
 
 class SettingsManager:
-    def __init__(self, config_file="user_settings.json"):
-        self.config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), config_file)
-        self.default_settings = {
-            "eye_interval": 40,
-            "water_interval": 30,
-            "posture_interval": 60,
+    def __init__(self, config_file="user_settings.json", check_interval=1.0, write_delay=0.5):
+        self.config_file = data_path(config_file)
+        # 两次检查设置文件是否变化的最小间隔（秒），期间的读取只查内存快照
+        self.check_interval = check_interval
+        # 延迟写入的合并窗口（秒），窗口内的多次保存只写一次文件
+        self.write_delay = write_delay
+        # 各类提醒的间隔默认值由提醒类型注册表生成
+        self.default_settings = default_intervals()
+        self.default_settings.update({
             "display_time": 5,
             "startup_message": True
-        }
+        })
+        self._snapshot = None
+        self._stamp = None
+        self._last_check = None
+        # 读取（解析）和写入设置文件的次数（供运行指标读取）
+        self.file_reads = 0
+        self.file_writes = 0
+        
+        # 延迟写入状态：待写入的设置、最后一次修改的时间，由 _lock 保护
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending = None
+        self._pending_since = 0.0
+        self._writer = None
+        # 进程正常退出时确保待写入的设置落盘
+        _managers.add(self)
     
-    def load_settings(self):
-        """加载用户设置"""
+    def _file_stamp(self):
+        """设置文件的 (修改时间, 大小)，文件不存在时返回 None"""
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    def _read_file(self):
+        """读取并解析设置文件，补全缺少的键"""
         try:
             if os.path.exists(self.config_file):
+                self.file_reads += 1
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     settings = json.load(f)
                     # 确保所有必要的键都存在
@@ -32,23 +86,115 @@ class SettingsManager:
             else:
                 return self.default_settings.copy()
         except Exception as e:
-            print(f"加载设置时出错: {e}")
+            log.error(f"加载设置时出错: {e}", file=self.config_file)
             return self.default_settings.copy()
     
+    def snapshot(self):
+        """返回当前设置的只读快照，设置文件变化后才重新解析"""
+        now = time.monotonic()
+        if (self._snapshot is not None and self._last_check is not None
+                and now - self._last_check < self.check_interval):
+            return self._snapshot
+        with self._lock:
+            self._last_check = now
+            # 还有未写入的修改时，内存中的快照比文件新
+            if self._pending is not None and self._snapshot is not None:
+                return self._snapshot
+            stamp = self._file_stamp()
+            if self._snapshot is None or stamp != self._stamp:
+                self._snapshot = MappingProxyType(self._read_file())
+                self._stamp = stamp
+            return self._snapshot
+    
+    def invalidate(self, force=False):
+        """下次读取时立即检查设置文件，文件状态变化时才重新解析
+
+        force: 为 True 时不论文件状态是否变化都重新解析（如用户要求重新加载）。
+        程序自己写入设置文件后已记录新的文件状态，不会因此重新解析。
+        """
+        with self._lock:
+            if force and self._pending is None:
+                self._snapshot = None
+            self._last_check = None
+    
+    def load_settings(self):
+        """加载用户设置（返回可修改的副本）"""
+        return dict(self.snapshot())
+    
     def save_settings(self, settings):
-        """保存用户设置"""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
-            print(f"设置已保存到: {self.config_file}")
+        """保存用户设置：立即更新内存快照，文件由后台线程延迟写入"""
+        merged = self.default_settings.copy()
+        merged.update(settings)
+        with self._lock:
+            self._snapshot = MappingProxyType(merged)
+            self._pending = dict(settings)
+            self._pending_since = time.monotonic()
+            self._ensure_writer()
+            self._wakeup.notify()
+        return True
+    
+    def flush(self):
+        """立即写入待保存的设置并等待落盘，返回是否成功"""
+        return self._write_pending()
+    
+    def _ensure_writer(self):
+        """按需启动后台写入线程（调用时持有 _lock）"""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._writer_loop, name="settings-writer", daemon=True)
+            self._writer.start()
+    
+    def _writer_loop(self):
+        """后台写入线程：等最后一次修改后安静 write_delay 秒再写入
+
+        没有待写入的设置时线程退出，不再引用设置管理器，不用的管理器可以被回收。
+        """
+        while True:
+            with self._lock:
+                if self._pending is None:
+                    self._writer = None
+                    return
+                delay = self._pending_since + self.write_delay - time.monotonic()
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                    continue
+            self._write_pending()
+    
+    def _write_pending(self):
+        """取出待写入的设置并写入文件
+
+        取出和写入都在 _write_lock 内完成，flush 返回时之前取出的设置一定已经落盘。
+        """
+        with self._write_lock:
+            with self._lock:
+                settings = self._pending
+                self._pending = None
+            if settings is None:
+                return True
+            tmp_file = self.config_file + ".tmp"
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(settings, f, ensure_ascii=False, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.config_file)
+                self.file_writes += 1
+                log.info(f"设置已保存到: {self.config_file}", file=self.config_file)
+            except Exception as e:
+                log.error(f"保存设置时出错: {e}", file=self.config_file)
+                # 写入失败时保留待写入的设置，稍后重试
+                with self._lock:
+                    if self._pending is None:
+                        self._pending = settings
+                        self._pending_since = time.monotonic()
+                return False
+            # 文件内容与快照一致，记录新的文件状态，避免下次读取时重新解析
+            with self._lock:
+                self._stamp = self._file_stamp()
             return True
-        except Exception as e:
-            print(f"保存设置时出错: {e}")
-            return False
     
     def get_setting(self, key, default=None):
         """获取单个设置值"""
-        settings = self.load_settings()
+        settings = self.snapshot()
         return settings.get(key, default if default is not None else self.default_settings.get(key))
     
     def set_setting(self, key, value):
@@ -57,6 +203,21 @@ class SettingsManager:
         settings[key] = value
         return self.save_settings(settings)
     
+    @contextmanager
+    def transaction(self):
+        """批量修改设置，退出时只写一次文件；发生异常时放弃全部修改
+
+        用法:
+            with manager.transaction() as settings:
+                settings["eye_interval"] = 45
+                settings["water_interval"] = 25
+        """
+        settings = self.load_settings()
+        original = dict(settings)
+        yield settings
+        if settings != original:
+            self.save_settings(settings)
+    
     def reset_to_default(self):
         """重置为默认设置"""
         return self.save_settings(self.default_settings.copy())
@@ -77,7 +238,7 @@ if __name__ == '__main__':
         "startup_message": False
     }
     
-    if manager.save_settings(test_settings):
+    if manager.save_settings(test_settings) and manager.flush():
         print("设置保存成功")
     
     # 测试加载
@@ -10,21 +10,20 @@ from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QSpinBox, QPushButton, QGroupBox, QFormLayout,
                              QMessageBox, QCheckBox)
-from PyQt5.QtGui import QFont, QIcon
+from PyQt5.QtGui import QFont
+
+from asset_bundle import get_icon
+from reminder_types import REMINDER_TYPES
 
 class SettingsWindow(QDialog):
-    # 定义信号，用于通知主程序设置已更改
-    settings_changed = pyqtSignal(int, int, int, bool, int)
+    # 定义信号，用于通知主程序设置已更改（参数为完整的设置字典）
+    settings_changed = pyqtSignal(dict)
     
-    def __init__(self, current_eye_interval=40, current_water_interval=30, 
-                 current_display_time=5, current_startup_msg=True, 
-                 current_posture_interval=60, parent=None):
+    def __init__(self, current_settings=None, parent=None):
         super().__init__(parent)
-        self.current_eye_interval = current_eye_interval
-        self.current_water_interval = current_water_interval
-        self.current_display_time = current_display_time
-        self.current_startup_msg = current_startup_msg
-        self.current_posture_interval = current_posture_interval
+        self.current_settings = dict(current_settings or {})
+        self.current_display_time = self.current_settings.get("display_time", 5)
+        self.current_startup_msg = self.current_settings.get("startup_message", True)
         
         self.init_ui()
         self.setWindowFlags(self.windowFlags() | Qt.Tool | Qt.FramelessWindowHint)
@@ -32,7 +31,7 @@ class SettingsWindow(QDialog):
     def init_ui(self):
         """初始化用户界面"""
         self.setWindowTitle("健康提醒设置")
-        self.setWindowIcon(QIcon("D:/Eyecare/drink.png"))
+        self.setWindowIcon(get_icon())
         self.resize(350, 280)
         
         # 设置窗口样式
@@ -96,26 +95,16 @@ class SettingsWindow(QDialog):
         time_group = QGroupBox("提醒时间设置")
         time_layout = QFormLayout()
         
-        # 眼睛休息间隔
-        self.eye_spinbox = QSpinBox()
-        self.eye_spinbox.setRange(1, 120)  # 1分钟到2小时
-        self.eye_spinbox.setValue(self.current_eye_interval)
-        self.eye_spinbox.setSuffix(" 分钟")
-        time_layout.addRow("眼睛休息间隔:", self.eye_spinbox)
-        
-        # 喝水提醒间隔
-        self.water_spinbox = QSpinBox()
-        self.water_spinbox.setRange(1, 120)  # 1分钟到2小时
-        self.water_spinbox.setValue(self.current_water_interval)
-        self.water_spinbox.setSuffix(" 分钟")
-        time_layout.addRow("喝水提醒间隔:", self.water_spinbox)
-        
-        # 体态提醒间隔
-        self.posture_spinbox = QSpinBox()
-        self.posture_spinbox.setRange(1, 180)  # 1分钟到3小时
-        self.posture_spinbox.setValue(self.current_posture_interval)
-        self.posture_spinbox.setSuffix(" 分钟")
-        time_layout.addRow("体态提醒间隔:", self.posture_spinbox)
+        # 各类提醒的间隔，按提醒类型注册表生成
+        self.interval_spinboxes = {}
+        for reminder_type in REMINDER_TYPES:
+            spinbox = QSpinBox()
+            spinbox.setRange(1, reminder_type.max_interval)
+            spinbox.setValue(self.current_settings.get(reminder_type.setting_key,
+                                                       reminder_type.default_interval))
+            spinbox.setSuffix(" 分钟")
+            time_layout.addRow(f"{reminder_type.name}间隔:", spinbox)
+            self.interval_spinboxes[reminder_type.id] = spinbox
         
         # 窗口显示时间
         self.display_spinbox = QSpinBox()
@@ -174,19 +163,20 @@ class SettingsWindow(QDialog):
     
     def apply_settings(self):
         """应用设置"""
-        eye_interval = self.eye_spinbox.value()
-        water_interval = self.water_spinbox.value()
-        posture_interval = self.posture_spinbox.value()
-        display_time = self.display_spinbox.value()
-        startup_msg = self.startup_checkbox.isChecked()
+        settings = dict(self.current_settings)
+        for reminder_type in REMINDER_TYPES:
+            settings[reminder_type.setting_key] = self.interval_spinboxes[reminder_type.id].value()
+        settings["display_time"] = self.display_spinbox.value()
+        settings["startup_message"] = self.startup_checkbox.isChecked()
         
         # 验证设置
-        if eye_interval < 1 or water_interval < 1 or posture_interval < 1:
+        if any(settings[reminder_type.setting_key] < 1 for reminder_type in REMINDER_TYPES):
             QMessageBox.warning(self, "设置错误", "提醒间隔不能少于1分钟！")
             return
         
         # 发送设置更改信号
-        self.settings_changed.emit(eye_interval, water_interval, display_time, startup_msg, posture_interval)
+        self.current_settings = settings
+        self.settings_changed.emit(settings)
         
         QMessageBox.information(self, "设置成功", "设置已应用！")
     
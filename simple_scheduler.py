@@ -2,16 +2,42 @@
 # -*- coding: utf-8 -*-
 """
 简单的健康提醒调度器
+
+命令行参数:
+    --fast-start       快速启动：先显示托盘图标，菜单、历史记录等在事件循环空闲时再创建
+    --profile-startup  输出启动各阶段耗时和模块导入耗时
+    --metrics=地址     在本机地址上提供运行指标，如 --metrics=127.0.0.1:9464 或 --metrics=unix:/tmp/eyecare-metrics.sock
+
+命令（发给正在运行的实例，见 single_instance.py）:
+    trigger <类型>  立即提醒    status  查看状态    reload  重新加载设置    trim  整理内存    quit  退出
+    diag cpu-start|cpu-stop|mem-start|mem-stop|dump|status  运行诊断，报告写入 diagnostics/ 下以时间命名的目录
 """
 
 import sys
+
+# 尽早安装导入计时，使 --profile-startup 能统计 PyQt5 等模块的导入耗时
+if "--profile-startup" in sys.argv:
+    import startup_profiler
+    startup_profiler.install()
+
+# 只允许运行一个实例：已有实例在运行时把命令转发给它后立即退出，不加载 Qt
+_instance_guard = None
+_startup_command = []
+if __name__ == '__main__':
+    import single_instance
+    _instance_guard, _startup_command = single_instance.acquire_or_forward(sys.argv[1:])
+
 import os
-import subprocess
+import threading
 import time
 from datetime import datetime
-from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtCore import (QTimer, Qt, QFileSystemWatcher, QObject, pyqtSignal,
+                          QCoreApplication, QEvent, QUrl)
 from PyQt5.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QAction, QMessageBox
-from PyQt5.QtGui import QIcon
+from PyQt5.QtGui import QPixmapCache, QDesktopServices
+
+from asset_bundle import get_icon
+from reminder_types import REMINDER_TYPES, get_reminder_type, default_intervals
 
 # 导入设置管理器
 try:
@@ -20,76 +46,224 @@ except ImportError:
     # 如果设置管理器不存在，使用默认值
     class SettingsManager:
         def load_settings(self):
-            return {"eye_interval": 40, "water_interval": 30}
+            return default_intervals()
         def save_settings(self, settings):
             pass
 
+from reminder_windows import ReminderWindowManager
+from reminder_engine import ReminderEngine
+from scheduler_core import intervals_from_settings, start_schedule, apply_intervals
+from schedule_state import ScheduleStateStore
+from notify_backends import QtWindowBackend
+from reminder_history import (ReminderHistory, EVENT_FIRED, EVENT_SHOWN,
+                              EVENT_DISMISSED, EVENT_SKIPPED)
+from memory_trim import rss_bytes, release_memory, format_bytes
+import app_log
+from app_paths import data_path
+
+try:
+    import config
+except ImportError:
+    config = None
+
+log = app_log.get_logger("simple_scheduler")
+
+
+class _CommandBridge(QObject):
+    """把命令通道线程收到的命令转到 GUI 线程执行"""
+    received = pyqtSignal(object)
+
+
 class SimpleScheduler:
-    def __init__(self):
-        self.app = QApplication(sys.argv)
-        self.app.setQuitOnLastWindowClosed(False)
+    def __init__(self, fast_start=None, profiler=None, instance_guard=None, startup_command=None,
+                 metrics_listen=None):
+        """
+        fast_start: 为 True 时先显示托盘图标，其余初始化推迟到事件循环启动后；
+                    默认取 config.FAST_START
+        profiler: 可选的 startup_profiler.StartupProfiler，记录各阶段耗时
+        instance_guard: 可选的 single_instance.InstanceGuard，用于接收其他进程转发的命令
+        startup_command: 启动完成后执行的命令，如 ["trigger", "eye"]
+        metrics_listen: 运行指标的监听地址，默认取 config.METRICS_LISTEN（空表示不监听）
+        """
+        if fast_start is None:
+            fast_start = getattr(config, "FAST_START", True)
+        if profiler is None:
+            from startup_profiler import NULL_PROFILER
+            profiler = NULL_PROFILER
+        self.profiler = profiler
+        self.history = None
+        self._early_events = []  # 提醒历史打开前产生的事件
+        self.instance_guard = instance_guard
+        self.startup_command = startup_command or []
+        self.metrics_listen = metrics_listen
+        self.metrics_exporter = None
+        self._latency = None  # 触发到显示的延迟直方图，启用运行指标时才创建
+        self._fired_at = {}   # 提醒类型 -> 触发时间（perf_counter）
+        self.diagnostics = None  # 运行诊断，第一次使用时创建
+        
+        with profiler.phase("创建 QApplication"):
+            self.app = QApplication(sys.argv)
+            self.app.setQuitOnLastWindowClosed(False)
         
         # 初始化设置管理器
-        self.settings_manager = SettingsManager()
-        user_settings = self.settings_manager.load_settings()
+        with profiler.phase("加载设置"):
+            self.settings_manager = SettingsManager()
+            self.settings = self.settings_manager.load_settings()
         
-        # 当前设置
-        self.eye_interval = user_settings.get("eye_interval", 40)  # 分钟
-        self.water_interval = user_settings.get("water_interval", 30)  # 分钟
-        self.posture_interval = user_settings.get("posture_interval", 60)  # 分钟
+        # 当前设置：各类提醒的间隔（分钟）
+        self.intervals = intervals_from_settings(self.settings, REMINDER_TYPES)
         
         # 设置系统托盘
-        self.tray_icon = QSystemTrayIcon()
-        self.tray_icon.setIcon(QIcon("drink.png"))
-        self.tray_icon.setToolTip("健康提醒助手")
+        with profiler.phase("显示托盘图标"):
+            self.tray_icon = QSystemTrayIcon()
+            self.tray_icon.setIcon(get_icon())
+            self.tray_icon.setToolTip("健康提醒助手")
+            
+            if not QSystemTrayIcon.isSystemTrayAvailable():
+                QMessageBox.critical(None, "系统托盘", "系统托盘不可用")
+                sys.exit(1)
+            
+            self.tray_icon.show()
         
-        if not QSystemTrayIcon.isSystemTrayAvailable():
-            QMessageBox.critical(None, "系统托盘", "系统托盘不可用")
-            sys.exit(1)
+        with profiler.phase("启动调度"):
+            # 提醒窗口管理器（窗口在首次提醒时创建，子进程模式作为回退）
+            self.reminder_windows = ReminderWindowManager(on_hidden=self.on_reminders_dismissed,
+                                                          display_time=self.display_time(self.settings),
+                                                          on_shown=self.on_reminders_shown)
+            # 通知后端：在本进程中显示提醒窗口
+            self.notifier = QtWindowBackend(self.reminder_windows)
+            
+            # 提醒计划状态文件：跨重启保存各类提醒的下次到期时间
+            try:
+                self.schedule_state = ScheduleStateStore()
+            except Exception as e:
+                log.error(f"打开提醒计划状态文件时出错: {e}")
+                self.schedule_state = None
+            
+            # 提醒调度引擎：全部提醒共用一个定时器，相近到期的提醒合并显示
+            self.engine = ReminderEngine(self.on_reminders_due, listener=self.record_schedule,
+                                         on_resume=self.on_resume)
+            
+            # 启动定时器
+            self.start_timers()
+        
+        # 其余初始化：快速启动时推迟到事件循环空闲时执行
+        if fast_start:
+            QTimer.singleShot(0, self.finish_startup)
+        else:
+            self.finish_startup()
+    
+    def finish_startup(self):
+        """完成启动：创建托盘菜单、打开提醒历史、监视设置文件、显示启动消息"""
+        profiler = self.profiler
+        profiler.mark("开始其余初始化")
         
         # 创建托盘菜单
-        self.create_tray_menu()
+        with profiler.phase("创建托盘菜单"):
+            self.create_tray_menu()
         
-        # 定时器设置
-        self.eye_timer = QTimer()
-        self.water_timer = QTimer()
-        self.posture_timer = QTimer()
+        # 提醒事件历史（后台线程写入）
+        with profiler.phase("打开提醒历史"):
+            try:
+                self.history = ReminderHistory()
+            except Exception as e:
+                log.error(f"打开提醒历史时出错: {e}")
+            else:
+                for kind, event in self._early_events:
+                    self.history.record(kind, event)
+            self._early_events = []
         
-        # 设置定时器间隔（毫秒）
-        self.eye_interval_ms = self.eye_interval * 60 * 1000
-        self.water_interval_ms = self.water_interval * 60 * 1000
-        self.posture_interval_ms = self.posture_interval * 60 * 1000
+        # 监视设置文件，文件被改写后自动重新加载
+        with profiler.phase("监视设置文件"):
+            self.watch_settings_file()
         
-        # 连接定时器信号
-        self.eye_timer.timeout.connect(self.show_eye_reminder)
-        self.water_timer.timeout.connect(self.show_water_reminder)
-        self.posture_timer.timeout.connect(self.show_posture_reminder)
+        # 空闲内存整理：空闲一段时间后释放缓存和未显示的窗口
+        self.trim_timer = QTimer()
+        self.trim_timer.setSingleShot(True)
+        self.trim_timer.timeout.connect(self.trim_memory)
+        self.note_activity()
+        # 提醒关闭后只释放图片缓存，保留窗口供下次提醒复用
+        self.release_timer = QTimer()
+        self.release_timer.setSingleShot(True)
+        self.release_timer.timeout.connect(lambda: self.trim_memory(drop_windows=False))
         
-        # 启动定时器
-        self.start_timers()
+        # 执行其他进程转发的命令（命令通道在加载 Qt 前已经打开，启动期间收到的命令从这里开始执行）
+        if self.instance_guard is not None:
+            with profiler.phase("打开命令通道"):
+                self.command_bridge = _CommandBridge()
+                self.command_bridge.received.connect(self._run_forwarded_command)
+                try:
+                    self.instance_guard.serve(self._forward_command)
+                except OSError as e:
+                    log.error(f"打开命令通道时出错: {e}")
         
-        # 显示托盘图标
-        self.tray_icon.show()
+        # 运行指标（默认关闭）
+        self.start_metrics()
         
         # 显示启动消息
-        self.show_startup_message()
+        if self.settings.get("startup_message", True):
+            self.show_startup_message()
+        
+        # 托盘程序可能没有控制台（pythonw），输出都写入日志
+        report = profiler.report()
+        if report:
+            log.info(report)
+        
+        if self.startup_command:
+            reply = self.handle_command(self.startup_command[0], self.startup_command[1:])
+            log.info(reply, command=self.startup_command[0], args=self.startup_command[1:])
+    
+    def start_metrics(self):
+        """按设置开启运行指标的监听端点和快照文件"""
+        listen = self.metrics_listen or getattr(config, "METRICS_LISTEN", "")
+        snapshot_file = getattr(config, "METRICS_SNAPSHOT_FILE", "")
+        if not listen and not snapshot_file:
+            return
+        from metrics import MetricsRegistry, MetricsExporter, process_metrics
+        
+        registry = MetricsRegistry()
+        started = process_metrics(registry)
+        engine = self.engine
+        registry.counter_func("eyecare_timer_wakeups_total", "调度定时器唤醒次数", lambda: engine.wakeups)
+        registry.gauge_func("eyecare_timer_wakeups_per_hour", "启动以来平均每小时的定时器唤醒次数",
+                            lambda: engine.wakeups * 3600 / max(time.monotonic() - started, 1.0))
+        self._latency = registry.histogram("eyecare_reminder_latency_seconds",
+                                           "提醒触发到窗口首次绘制的延迟（秒），仅进程内窗口")
+        windows = self.reminder_windows
+        registry.gauge_func("eyecare_reminder_windows", "提醒窗口数",
+                            lambda: [({"state": "visible"}, windows.counts()[0]),
+                                     ({"state": "created"}, windows.counts()[1])])
+        registry.gauge_func("eyecare_reminder_processes", "提醒窗口子进程数", lambda: windows.counts()[2])
+        settings_manager = self.settings_manager
+        registry.counter_func("eyecare_settings_file_reads_total", "设置文件读取次数",
+                              lambda: getattr(settings_manager, "file_reads", 0))
+        registry.counter_func("eyecare_settings_file_writes_total", "设置文件写入次数",
+                              lambda: getattr(settings_manager, "file_writes", 0))
+        registry.counter_func("eyecare_log_dropped_total", "日志队列满时丢弃的日志数",
+                              lambda: app_log.stats()["dropped"])
+        
+        if snapshot_file:
+            snapshot_file = data_path(snapshot_file)
+        self.metrics_exporter = MetricsExporter(
+            registry, listen=listen or None, snapshot_file=snapshot_file or None,
+            snapshot_interval=getattr(config, "METRICS_SNAPSHOT_INTERVAL", 60))
+        try:
+            self.metrics_exporter.start()
+        except (OSError, ValueError) as e:
+            log.error(f"开启运行指标时出错: {e}")
+            self.metrics_exporter = None
+            return
+        log.info(f"运行指标已开启: {self.metrics_exporter.address or snapshot_file}")
     
     def create_tray_menu(self):
         """创建系统托盘菜单"""
         menu = QMenu()
         
-        # 立即提醒选项
-        eye_action = QAction("立即休息眼睛", self.app)
-        eye_action.triggered.connect(self.show_eye_reminder)
-        menu.addAction(eye_action)
-        
-        water_action = QAction("立即喝水提醒", self.app)
-        water_action.triggered.connect(self.show_water_reminder)
-        menu.addAction(water_action)
-        
-        posture_action = QAction("立即体态提醒", self.app)
-        posture_action.triggered.connect(self.show_posture_reminder)
-        menu.addAction(posture_action)
+        # 立即提醒选项，按提醒类型注册表生成
+        for reminder_type in REMINDER_TYPES:
+            action = QAction(reminder_type.menu_text, self.app)
+            action.triggered.connect(lambda checked=False, kind=reminder_type.id: self.show_reminder(kind))
+            menu.addAction(action)
         
         menu.addSeparator()
         
@@ -103,6 +277,19 @@ class SimpleScheduler:
         settings_action.triggered.connect(self.show_settings)
         menu.addAction(settings_action)
         
+        # 诊断子菜单：菜单文字在展开时按当前状态更新
+        self.diagnostics_menu = menu.addMenu("诊断")
+        self.cpu_profile_action = self.diagnostics_menu.addAction("开始 CPU 分析")
+        self.cpu_profile_action.triggered.connect(
+            lambda: self.run_diagnostics("cpu-stop" if self._diagnostics_running("cpu") else "cpu-start"))
+        self.memory_profile_action = self.diagnostics_menu.addAction("开始内存分析")
+        self.memory_profile_action.triggered.connect(
+            lambda: self.run_diagnostics("mem-stop" if self._diagnostics_running("memory") else "mem-start"))
+        self.diagnostics_menu.addAction("导出对象统计").triggered.connect(lambda: self.run_diagnostics("dump"))
+        self.diagnostics_menu.addSeparator()
+        self.diagnostics_menu.addAction("打开报告目录").triggered.connect(self.open_diagnostics_dir)
+        self.diagnostics_menu.aboutToShow.connect(self.update_diagnostics_menu)
+        
         menu.addSeparator()
         
         # 退出选项
@@ -112,49 +299,170 @@ class SimpleScheduler:
         
         self.tray_icon.setContextMenu(menu)
     
+    def describe_intervals(self, separator):
+        """各类提醒间隔的文字描述，如“眼睛休息: 40分钟”"""
+        return separator.join(f"{reminder_type.name}: {self.intervals[reminder_type.id]}分钟"
+                              for reminder_type in REMINDER_TYPES)
+    
     def start_timers(self):
-        """启动定时器"""
-        self.eye_timer.start(self.eye_interval_ms)
-        self.water_timer.start(self.water_interval_ms)
-        self.posture_timer.start(self.posture_interval_ms)
-        print(f"定时器已启动 - 眼睛休息: {self.eye_interval}分钟, 喝水提醒: {self.water_interval}分钟, 体态提醒: {self.posture_interval}分钟")
-    
-    def show_eye_reminder(self):
-        """显示眼睛休息提醒 - 直接调用原始脚本"""
-        try:
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] 显示眼睛休息提醒")
-            # 直接调用原始的眼睛休息脚本
-            subprocess.Popen([sys.executable, "eye/eyecare.py"])
-        except Exception as e:
-            print(f"显示眼睛提醒时出错: {e}")
+        """启动定时器，按上次运行保存的计划恢复各类提醒的到期时间"""
+        states = self.schedule_state.load() if self.schedule_state is not None else {}
+        for kind in start_schedule(self.engine, self.intervals, states):
+            self.record_event(kind, EVENT_SKIPPED)
+        log.info(f"定时器已启动 - {self.describe_intervals(', ')}", intervals=self.intervals)
+    
+    def record_schedule(self, kind, remaining, fired):
+        """调度引擎回调：把某类提醒的下次到期时间写入状态文件"""
+        if self.schedule_state is None:
+            return
+        now = time.time()
+        self.schedule_state.update(kind, now + remaining, last_fired=now if fired else None)
+    
+    def record_event(self, kind, event):
+        """记录一条提醒事件到历史"""
+        if self.history is not None:
+            self.history.record(kind, event)
+        else:
+            self._early_events.append((kind, event))
     
-    def show_water_reminder(self):
-        """显示喝水提醒 - 直接调用原始脚本"""
+    def on_reminders_due(self, kinds):
+        """调度引擎回调：显示本次到期的提醒，多个提醒合并为一个窗口"""
+        fired_at = time.perf_counter()
+        for kind in kinds:
+            self.record_event(kind, EVENT_FIRED)
+        if len(kinds) == 1:
+            self.show_reminder(kinds[0], fired_at)
+            return
+        if self._latency is not None:
+            for kind in kinds:
+                self._fired_at[kind] = fired_at
         try:
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] 显示喝水提醒")
-            # 直接调用原始的喝水提醒脚本
-            subprocess.Popen([sys.executable, "drink_water.py"])
+            log.info(f"显示合并提醒: {', '.join(kinds)}", kinds=kinds)
+            if self.notifier.notify(kinds):
+                for kind in kinds:
+                    self.record_event(kind, EVENT_SHOWN)
         except Exception as e:
-            print(f"显示喝水提醒时出错: {e}")
+            log.error(f"显示合并提醒时出错: {e}", kinds=kinds)
+    
+    def on_resume(self, gap, overdue, skipped):
+        """调度引擎回调：系统从休眠中唤醒，被跳过的提醒记入历史"""
+        for kind in skipped:
+            self.record_event(kind, EVENT_SKIPPED)
+    
+    def on_reminders_shown(self, kinds):
+        """提醒窗口首次绘制完成：记录触发到显示的延迟"""
+        if self._latency is None:
+            return
+        now = time.perf_counter()
+        for kind in kinds:
+            fired_at = self._fired_at.pop(kind, None)
+            if fired_at is not None:
+                self._latency.observe(now - fired_at, kind=kind)
     
-    def show_posture_reminder(self):
-        """显示体态提醒 - 直接调用原始脚本"""
+    def on_reminders_dismissed(self, kinds):
+        """提醒窗口被关闭"""
+        for kind in kinds:
+            self.record_event(kind, EVENT_DISMISSED)
+        self.note_activity()
+        release_timer = getattr(self, "release_timer", None)
+        if release_timer is not None and getattr(config, "IDLE_TRIM_AFTER_REMINDER", True):
+            # 稍等片刻，连续关闭多个窗口时只整理一次
+            release_timer.start(3000)
+    
+    def note_activity(self):
+        """有操作发生：重新开始空闲计时"""
+        trim_timer = getattr(self, "trim_timer", None)
+        if trim_timer is None:
+            return
+        minutes = getattr(config, "IDLE_TRIM_MINUTES", 10)
+        if not minutes:
+            trim_timer.stop()
+            return
+        trim_timer.start(int(minutes * 60 * 1000))
+    
+    def trim_memory(self, drop_windows=True):
+        """释放缓存的图片，回收垃圾对象并把空闲内存还给系统，返回报告文字
+
+        drop_windows: 是否同时销毁未显示的提醒窗口。提醒关闭后的整理不销毁窗口，
+        保留的窗口已在隐藏时释放图片，下次提醒直接复用；空闲 IDLE_TRIM_MINUTES 后
+        或 trim 命令才销毁。已关闭的设置窗口和 close 模式下隐藏的提醒窗口在这里真正销毁。
+        """
+        if self.reminder_windows.has_visible():
+            # 提醒窗口还在显示，等它关闭后再整理
+            self.note_activity()
+            return "提醒窗口正在显示，稍后再整理内存"
+        before = rss_bytes()
+        dropped = self.reminder_windows.drop_hidden() if drop_windows else 0
+        from image_cache import clear_image_cache
+        clear_image_cache()
+        QPixmapCache.clear()
+        # 立即执行 deleteLater，使窗口在整理前真正销毁
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        trimmed = release_memory()
+        after = rss_bytes()
+        report = (f"内存整理: {format_bytes(before)} -> {format_bytes(after)}"
+                  f"（销毁窗口 {dropped} 个" + ("，已整理堆" if trimmed else "") + "）")
+        log.info(report, rss_before=before, rss_after=after, windows_dropped=dropped)
+        return report
+    
+    def show_reminder(self, kind, fired_at=None):
+        """显示某类提醒；fired_at 为提醒触发的时间（perf_counter），用于统计显示延迟"""
+        reminder_type = get_reminder_type(kind)
+        if self._latency is not None:
+            self._fired_at[kind] = fired_at if fired_at is not None else time.perf_counter()
         try:
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] 显示体态提醒")
-            # 直接调用原始的体态提醒脚本
-            subprocess.Popen([sys.executable, "posture.py"])
+            log.info(f"显示{reminder_type.title}", kind=kind)
+            if self.notifier.notify([kind]):
+                self.record_event(kind, EVENT_SHOWN)
         except Exception as e:
-            print(f"显示体态提醒时出错: {e}")
+            log.error(f"显示{reminder_type.title}时出错: {e}", kind=kind)
     
     def show_startup_message(self):
         """显示启动消息"""
         self.tray_icon.showMessage(
             "健康提醒助手",
-            f"定时提醒已启动\n眼睛休息: {self.eye_interval}分钟\n喝水提醒: {self.water_interval}分钟\n体态提醒: {self.posture_interval}分钟",
+            "定时提醒已启动\n" + self.describe_intervals("\n"),
             QSystemTrayIcon.Information,
             3000
         )
     
+    def _diagnostics_running(self, kind):
+        if self.diagnostics is None:
+            return False
+        return self.diagnostics.cpu_running if kind == "cpu" else self.diagnostics.memory_running
+    
+    def update_diagnostics_menu(self):
+        self.cpu_profile_action.setText(
+            "停止 CPU 分析并保存报告" if self._diagnostics_running("cpu") else "开始 CPU 分析")
+        self.memory_profile_action.setText(
+            "停止内存分析并保存报告" if self._diagnostics_running("memory") else "开始内存分析")
+    
+    def run_diagnostics(self, action, notify=True):
+        """执行诊断命令（见 diagnostics.ACTIONS），返回回复文字"""
+        if self.diagnostics is None:
+            if action not in ("cpu-start", "mem-start", "dump", "status"):
+                return "没有进行中的诊断"
+            # 诊断模块在第一次使用时才导入
+            from diagnostics import Diagnostics
+            self.diagnostics = Diagnostics()
+        try:
+            reply = self.diagnostics.run(action)
+        except Exception as e:
+            reply = f"诊断时出错: {e}"
+            log.error(reply, action=action)
+        else:
+            log.info(reply, action=action)
+        if notify:
+            self.tray_icon.showMessage("诊断", reply, QSystemTrayIcon.Information, 3000)
+        return reply
+    
+    def open_diagnostics_dir(self):
+        """在文件管理器中打开诊断报告目录"""
+        from diagnostics import Diagnostics
+        root = (self.diagnostics or Diagnostics()).report_root
+        os.makedirs(root, exist_ok=True)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(root))
+    
     def format_remaining_time(self, minutes_float):
         """格式化剩余时间显示"""
         if minutes_float < 0:
@@ -170,122 +478,190 @@ class SimpleScheduler:
         else:
             return f"{seconds}秒"
     
-    def show_status(self):
-        """显示当前状态"""
-        next_eye = self.eye_timer.remainingTime() / 60000
-        next_water = self.water_timer.remainingTime() / 60000
-        next_posture = self.posture_timer.remainingTime() / 60000
+    def status_text(self):
+        """当前状态的文字描述"""
+        lines = []
+        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        for reminder_type in REMINDER_TYPES:
+            remaining = self.engine.remaining_ms(reminder_type.id) / 60000
+            line = (f"{reminder_type.name}: {self.format_remaining_time(remaining)}后 "
+                    f"(间隔: {self.intervals[reminder_type.id]}分钟)")
+            if self.history is not None:
+                shown = self.history.count(reminder_type.id, today_start, time.time() + 1, EVENT_SHOWN)
+                line += f"，今日已提醒{shown}次"
+            lines.append(line)
+        reminder_lines = "\n".join(lines)
         
         status_msg = f"""健康提醒助手状态
         
-眼睛休息提醒: {self.format_remaining_time(next_eye)}后 (间隔: {self.eye_interval}分钟)
-喝水提醒: {self.format_remaining_time(next_water)}后 (间隔: {self.water_interval}分钟)
-体态提醒: {self.format_remaining_time(next_posture)}后 (间隔: {self.posture_interval}分钟)
+{reminder_lines}
 
+内存: {format_bytes(rss_bytes())}
 运行时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"""
-        
-        QMessageBox.information(None, "状态信息", status_msg)
+        return status_msg
+    
+    def show_status(self):
+        """显示当前状态"""
+        QMessageBox.information(None, "状态信息", self.status_text())
+    
+    def handle_command(self, command, args):
+        """执行命令通道收到的命令，返回回复文字"""
+        if command == "trigger":
+            if not args or args[0] not in self.intervals:
+                return f"未知的提醒类型，可用: {', '.join(self.intervals)}"
+            self.show_reminder(args[0])
+            return f"已显示{get_reminder_type(args[0]).title}"
+        if command == "status":
+            return self.status_text()
+        if command == "reload":
+            self.reload_settings(force=True)
+            return f"设置已重新加载 - {self.describe_intervals(', ')}"
+        if command == "trim":
+            return self.trim_memory()
+        if command == "diag":
+            if not args:
+                return "用法: diag cpu-start|cpu-stop|mem-start|mem-stop|dump|status"
+            return self.run_diagnostics(args[0], notify=False)
+        if command == "quit":
+            # 先回复再退出
+            QTimer.singleShot(0, self.quit_app)
+            return "正在退出"
+        return f"未知的命令: {command}"
+    
+    def _forward_command(self, command, args):
+        """命令通道线程调用：在 GUI 线程中执行命令并等待结果"""
+        request = {"command": command, "args": args, "reply": None, "done": threading.Event()}
+        self.command_bridge.received.emit(request)
+        if not request["done"].wait(5.0):
+            return "执行命令超时"
+        return request["reply"]
+    
+    def _run_forwarded_command(self, request):
+        try:
+            request["reply"] = self.handle_command(request["command"], request["args"])
+        except Exception as e:
+            request["reply"] = f"执行命令时出错: {e}"
+        finally:
+            request["done"].set()
     
     def show_settings(self):
         """显示设置窗口"""
         try:
             from settings_window import SettingsWindow
             
-            settings_window = SettingsWindow(
-                self.eye_interval,
-                self.water_interval,
-                5,  # 显示时间（这个版本不需要）
-                True,  # 启动消息
-                self.posture_interval,  # 体态提醒间隔
-                self.app.activeWindow()
-            )
+            settings_window = SettingsWindow(self.settings, self.app.activeWindow())
             settings_window.settings_changed.connect(self.update_settings)
             settings_window.exec_()
+            # 设置窗口关闭后立即销毁，不随父窗口常驻
+            settings_window.deleteLater()
+            self.note_activity()
         except Exception as e:
-            print(f"显示设置窗口时出错: {e}")
+            log.error(f"显示设置窗口时出错: {e}")
             QMessageBox.critical(None, "错误", f"无法打开设置窗口: {e}")
     
-    def update_settings(self, eye_interval, water_interval, display_time, startup_msg, posture_interval=None):
-        """更新设置"""
+    def apply_settings(self, settings):
+        """应用新设置，只重新排期间隔有变化的提醒（保留已经过的时间），返回变化的提醒类型"""
+        changed = apply_intervals(self.engine, self.intervals, settings, REMINDER_TYPES)
+        display_time = self.display_time(settings)
+        if display_time is not None:
+            self.reminder_windows.set_display_time(display_time)
+        self.settings = dict(settings)
+        return changed
+    
+    @staticmethod
+    def display_time(settings):
+        """设置中的提醒窗口显示时间（秒），无效时返回 None（使用 config 中的默认值）"""
+        value = settings.get("display_time")
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0:
+            return value
+        return None
+    
+    def watch_settings_file(self):
+        """用 QFileSystemWatcher 监视设置文件及其所在目录"""
+        config_file = getattr(self.settings_manager, "config_file", None)
+        if config_file is None:
+            return
+        self.settings_watcher = QFileSystemWatcher()
+        self.settings_watcher.addPath(os.path.dirname(config_file))
+        if os.path.exists(config_file):
+            self.settings_watcher.addPath(config_file)
+        # 写文件时会连续触发多次变化通知，稍等片刻后只重新加载一次
+        self.reload_timer = QTimer()
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(200)
+        self.reload_timer.timeout.connect(self.reload_settings)
+        self.settings_watcher.fileChanged.connect(self.reload_timer.start)
+        self.settings_watcher.directoryChanged.connect(self.reload_timer.start)
+    
+    def reload_settings(self, force=False):
+        """设置文件被外部改写后重新加载，只重新排期有变化的提醒
+
+        程序自己保存设置也会触发文件监视，文件状态与保存时记录的一致时不重新解析；
+        force 为 True 时（reload 命令）总是重新读取。
+        """
         try:
-            if posture_interval is not None:
-                print(f"收到设置更新: 眼睛={eye_interval}分钟, 喝水={water_interval}分钟, 体态={posture_interval}分钟")
-                # 更新当前设置
-                self.eye_interval = eye_interval
-                self.water_interval = water_interval
-                self.posture_interval = posture_interval
-                
-                # 保存设置到文件
-                settings = {
-                    "eye_interval": eye_interval,
-                    "water_interval": water_interval,
-                    "posture_interval": posture_interval,
-                    "display_time": display_time,
-                    "startup_message": startup_msg
-                }
-            else:
-                print(f"收到设置更新: 眼睛={eye_interval}分钟, 喝水={water_interval}分钟")
-                # 更新当前设置
-                self.eye_interval = eye_interval
-                self.water_interval = water_interval
-                
-                # 保存设置到文件
-                settings = {
-                    "eye_interval": eye_interval,
-                    "water_interval": water_interval,
-                    "display_time": display_time,
-                    "startup_message": startup_msg
-                }
-            self.settings_manager.save_settings(settings)
-            
-            # 重新计算间隔
-            new_eye_interval = eye_interval * 60 * 1000
-            new_water_interval = water_interval * 60 * 1000
-            
-            # 停止当前定时器
-            self.eye_timer.stop()
-            self.water_timer.stop()
-            
-            # 更新间隔
-            self.eye_interval_ms = new_eye_interval
-            self.water_interval_ms = new_water_interval
-            
-            # 重新启动定时器
-            self.eye_timer.start(self.eye_interval_ms)
-            self.water_timer.start(self.water_interval_ms)
-            
-            # 如果包含体态提醒设置，也更新体态定时器
-            if posture_interval is not None:
-                new_posture_interval = posture_interval * 60 * 1000
-                self.posture_timer.stop()
-                self.posture_interval_ms = new_posture_interval
-                self.posture_timer.start(self.posture_interval_ms)
-                print(f"设置已更新并保存 - 眼睛休息: {eye_interval}分钟, 喝水提醒: {water_interval}分钟, 体态提醒: {posture_interval}分钟")
-            else:
-                print(f"设置已更新并保存 - 眼睛休息: {eye_interval}分钟, 喝水提醒: {water_interval}分钟")
-            
-            # 显示更新消息
-            if posture_interval is not None:
-                self.tray_icon.showMessage(
-                    "设置已更新",
-                    f"眼睛休息: {eye_interval}分钟\n喝水提醒: {water_interval}分钟\n体态提醒: {posture_interval}分钟",
-                    QSystemTrayIcon.Information,
-                    2000
-                )
-            else:
+            config_file = self.settings_manager.config_file
+            # 原子替换会使原文件的监视失效，需要重新添加
+            if os.path.exists(config_file) and config_file not in self.settings_watcher.files():
+                self.settings_watcher.addPath(config_file)
+            self.settings_manager.invalidate(force)
+            changed = self.apply_settings(self.settings_manager.load_settings())
+            if changed:
+                log.info(f"设置文件已变化，重新排期: {', '.join(changed)} - {self.describe_intervals(', ')}",
+                         changed=changed, intervals=self.intervals)
                 self.tray_icon.showMessage(
-                    "设置已更新",
-                    f"眼睛休息: {eye_interval}分钟\n喝水提醒: {water_interval}分钟",
+                    "设置已重新加载",
+                    self.describe_intervals("\n"),
                     QSystemTrayIcon.Information,
                     2000
                 )
+        except Exception as e:
+            log.error(f"重新加载设置时出错: {e}")
+    
+    def update_settings(self, settings):
+        """更新设置"""
+        try:
+            # 更新当前设置，只重新排期间隔有变化的提醒
+            changed = self.apply_settings(settings)
+            log.debug(f"收到设置更新: {self.describe_intervals(', ')}")
+            
+            # 保存设置到文件
+            self.settings_manager.save_settings(self.settings)
+            log.info(f"设置已更新并保存 - {self.describe_intervals(', ')}"
+                     + (f"，重新排期: {', '.join(changed)}" if changed else ""),
+                     changed=changed, intervals=self.intervals)
+            
+            # 显示更新消息
+            self.tray_icon.showMessage(
+                "设置已更新",
+                self.describe_intervals("\n"),
+                QSystemTrayIcon.Information,
+                2000
+            )
             
         except Exception as e:
-            print(f"更新设置时出错: {e}")
+            log.error(f"更新设置时出错: {e}")
             QMessageBox.critical(None, "错误", f"更新设置失败: {e}")
     
     def quit_app(self):
         """退出应用程序"""
+        self.engine.stop()
+        if self.schedule_state is not None:
+            self.schedule_state.close()
+        self.reminder_windows.close()
+        if self.history is not None:
+            self.history.close()
+        # 确保延迟写入的设置落盘
+        if hasattr(self.settings_manager, "flush"):
+            self.settings_manager.flush()
+        if self.instance_guard is not None:
+            self.instance_guard.close()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.close()
+        if self.diagnostics is not None:
+            # 退出时写出进行中的分析
+            for path in self.diagnostics.stop_all():
+                log.info(f"诊断报告: {path}")
         self.tray_icon.hide()
         self.app.quit()
     
@@ -293,6 +669,19 @@ class SimpleScheduler:
         """运行应用程序"""
         sys.exit(self.app.exec_())
 
-if __name__ == '__main__':
-    scheduler = SimpleScheduler()
+def main(argv=None, instance_guard=None, startup_command=None):
+    """启动托盘调度器（单实例检查由调用方先完成）"""
+    if argv is None:
+        argv = sys.argv[1:]
+    profiler = None
+    if "--profile-startup" in argv:
+        import startup_profiler
+        profiler = startup_profiler.StartupProfiler()
+    metrics_listen = next((arg.split("=", 1)[1] for arg in argv if arg.startswith("--metrics=")), None)
+    scheduler = SimpleScheduler(fast_start=True if "--fast-start" in argv else None,
+                                profiler=profiler, instance_guard=instance_guard,
+                                startup_command=startup_command, metrics_listen=metrics_listen)
     scheduler.run()
+
+if __name__ == '__main__':
+    main(instance_guard=_instance_guard, startup_command=_startup_command)
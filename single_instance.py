@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单实例保护和本地命令通道
+
+第一个启动的调度器持有锁文件，并在本机回环地址上监听命令；端口和令牌写入实例信息文件
+（只有当前用户可读）。之后再启动时拿不到锁，就把命令行中的命令转发给正在运行的实例后
+立即退出，不加载 Qt。进程退出（包括崩溃）时锁由操作系统自动释放。
+
+拿到锁后立即开始监听（在加载 Qt 之前），正在启动的实例收到的命令等启动完成后再执行，
+最多等待 STARTUP_TIMEOUT 秒，启动较慢时转发的命令也不会丢失。
+
+支持的命令:
+    trigger <类型>   立即显示一次提醒
+    status           返回当前状态
+    reload           重新加载设置文件
+    trim             整理内存
+    diag <动作>      运行诊断：cpu-start、cpu-stop、mem-start、mem-stop、dump、status（见 diagnostics.py）
+    quit             退出正在运行的实例
+
+本模块不依赖 Qt，只在需要时导入 socket 和 threading。
+"""
+
+import json
+import os
+import sys
+
+from app_paths import data_path
+
+LOCK_FILE = data_path(".scheduler.lock")
+INFO_FILE = data_path(".scheduler.instance")
+
+COMMANDS = ("trigger", "status", "reload", "trim", "diag", "quit")
+
+# 转发的命令最多等待正在启动的实例这么多秒
+STARTUP_TIMEOUT = 60.0
+
+
+def _lock(f):
+    """以非阻塞方式锁住文件，成功返回 True"""
+    try:
+        f.seek(0)
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+class InstanceGuard:
+    """持有单实例锁，并在回环地址上接收其他进程转发的命令"""
+
+    def __init__(self, lock_file):
+        self._lock_file = lock_file
+        self._server = None
+        self._thread = None
+        self._ready = None
+        self.handler = None
+
+    def serve(self, handler=None):
+        """开始接收命令；handler(命令, 参数列表) 返回回复文字，在后台线程中调用
+
+        可以先不带 handler 调用以尽早开始监听，收到的命令等到再次调用 serve(handler) 后执行。
+        """
+        import threading
+
+        if self._server is None:
+            self._ready = threading.Event()
+            self._listen()
+        if handler is not None:
+            self.handler = handler
+            self._ready.set()
+
+    def _listen(self):
+        import secrets
+        import socket
+        import threading
+
+        self._token = secrets.token_hex(16)
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(("127.0.0.1", 0))
+        self._server.listen(4)
+        info = {"pid": os.getpid(), "port": self._server.getsockname()[1], "token": self._token}
+        temp_path = INFO_FILE + ".tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        os.replace(temp_path, INFO_FILE)
+        self._thread = threading.Thread(target=self._serve_loop, name="instance-server", daemon=True)
+        self._thread.start()
+
+    def _serve_loop(self):
+        server = self._server
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return  # 服务已关闭
+            with conn:
+                conn.settimeout(2.0)
+                try:
+                    request = json.loads(conn.makefile("r", encoding="utf-8").readline())
+                    if request.get("token") != self._token:
+                        reply = {"ok": False, "reply": "令牌无效"}
+                    elif not self._ready.wait(STARTUP_TIMEOUT):
+                        reply = {"ok": False, "reply": "正在运行的实例还没有启动完成"}
+                    else:
+                        command = request.get("command") or []
+                        reply = {"ok": True, "reply": self.handler(command[0], command[1:])}
+                except Exception as e:
+                    reply = {"ok": False, "reply": str(e)}
+                try:
+                    conn.sendall((json.dumps(reply, ensure_ascii=False) + "\n").encode("utf-8"))
+                except OSError:
+                    pass
+
+    def close(self):
+        """停止接收命令并释放锁"""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            try:
+                os.remove(INFO_FILE)
+            except OSError:
+                pass
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+def acquire():
+    """尝试成为唯一实例，成功返回 InstanceGuard，已有实例在运行时返回 None"""
+    f = open(LOCK_FILE, "a+")
+    if _lock(f):
+        return InstanceGuard(f)
+    f.close()
+    return None
+
+
+def send_command(command, timeout=2.0):
+    """把命令发给正在运行的实例，返回 (是否成功, 回复文字)"""
+    import socket
+    import time
+
+    # 正在运行的实例可能还没写好实例信息文件，稍等片刻
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with open(INFO_FILE, "r", encoding="utf-8") as f:
+                info = json.load(f)
+            with socket.create_connection(("127.0.0.1", info["port"]), timeout=timeout) as conn:
+                # 实例可能还在启动，回复最多要等 STARTUP_TIMEOUT 秒
+                conn.settimeout(STARTUP_TIMEOUT + timeout)
+                message = {"token": info["token"], "command": command}
+                conn.sendall((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+                line = conn.makefile("r", encoding="utf-8").readline()
+            reply = json.loads(line)
+            return reply.get("ok", False), reply.get("reply", "")
+        except (OSError, ValueError, KeyError) as e:
+            if time.monotonic() > deadline:
+                return False, f"无法连接正在运行的实例: {e}"
+            time.sleep(0.05)
+
+
+def parse_command(argv):
+    """从命令行参数中取出命令（忽略 -- 开头的选项），没有命令时返回空列表"""
+    words = [arg for arg in argv if not arg.startswith("--")]
+    if words and words[0] not in COMMANDS:
+        raise SystemExit(f"未知的命令: {words[0]}（可用: {', '.join(COMMANDS)}）")
+    return words
+
+
+def acquire_or_forward(argv):
+    """启动入口：成为唯一实例时返回 (InstanceGuard, 命令)，否则转发命令后退出进程
+
+    没有实例在运行时，只有 trigger 命令会继续启动（启动后执行该命令），其余命令直接退出。
+    """
+    command = parse_command(argv)
+    guard = acquire()
+    if guard is not None:
+        if command and command[0] != "trigger":
+            print("健康提醒助手没有在运行")
+            sys.exit(1)
+        try:
+            # 立即开始监听，之后启动的进程不会因为本实例启动慢而丢掉命令
+            guard.serve()
+        except OSError:
+            pass  # 启动完成后再试一次（见 SimpleScheduler.finish_startup）
+        return guard, command
+    ok, reply = send_command(command or ["status"])
+    if not command and ok:
+        reply = "健康提醒助手已在运行\n" + reply
+    print(reply)
+    sys.exit(0 if ok else 1)
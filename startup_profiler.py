@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动耗时分析 - 统计启动各阶段耗时和模块导入耗时
+
+用法: python simple_scheduler.py --profile-startup
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+
+_start = time.perf_counter()
+
+
+class _ImportTimer(MetaPathFinder):
+    """记录每个模块的导入耗时（自身耗时，不含它导入的其他模块）"""
+
+    def __init__(self):
+        self.records = []  # (模块名, 自身耗时, 总耗时)
+        self._stack = []
+
+    def find_spec(self, fullname, path, target=None):
+        # 交给其余查找器查找，只包装找到的加载器
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+
+class _TimedLoader:
+    def __init__(self, loader, timer):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = self._timer._stack
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += total
+            self._timer.records.append((module.__name__, total - children, total))
+
+
+class StartupProfiler:
+    """按阶段记录启动耗时"""
+
+    def __init__(self):
+        self.phases = []  # (阶段名, 开始时间, 耗时)，时间均相对于进程导入本模块的时刻
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - _start, time.perf_counter() - start))
+
+    def mark(self, name):
+        """记录一个时间点（耗时为 0 的阶段）"""
+        self.phases.append((name, time.perf_counter() - _start, 0.0))
+
+    def report(self, top=15):
+        """生成报告文本"""
+        lines = ["启动耗时分析", "阶段:"]
+        for name, offset, duration in self.phases:
+            lines.append(f"  {offset * 1000:8.1f} ms  {name}: {duration * 1000:.1f} ms")
+        if _import_timer is not None and _import_timer.records:
+            records = sorted(_import_timer.records, key=lambda r: r[1], reverse=True)
+            total = sum(r[1] for r in records)
+            lines.append(f"模块导入: 共 {len(records)} 个，{total * 1000:.1f} ms，自身耗时最多的 {top} 个:")
+            for name, self_time, cumulative in records[:top]:
+                lines.append(f"  {self_time * 1000:8.1f} ms  (含子模块 {cumulative * 1000:.1f} ms)  {name}")
+        return "\n".join(lines)
+
+
+class _NullProfiler:
+    """未开启分析时使用，所有操作都是空操作"""
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def mark(self, name):
+        pass
+
+    def report(self, top=15):
+        return ""
+
+
+NULL_PROFILER = _NullProfiler()
+_import_timer = None
+
+
+def install():
+    """安装导入计时（应在导入 PyQt5 等重量级模块之前调用）"""
+    global _import_timer
+    if _import_timer is None:
+        _import_timer = _ImportTimer()
+        sys.meta_path.insert(0, _import_timer)
+    return _import_timer
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""测试公共设置：从项目根目录导入模块，日志不写文件也不输出到控制台，Qt 使用 offscreen 平台，可写文件放在临时目录"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# 设置、状态、缓存等可写文件放到临时目录，不改动项目目录中的文件
+os.environ.setdefault("EYECARE_DATA_DIR", tempfile.mkdtemp(prefix="eyecare-test-"))
+
+import app_log
+
+app_log.configure(app_log.LogPipeline(path=None, console=False))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """进程内共享的 QApplication（没有 PyQt5 时跳过测试）"""
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import app_paths
+
+
+def test_source_run_keeps_files_in_program_dir(monkeypatch):
+    monkeypatch.delattr(sys, "frozen", raising=False)
+    assert app_paths._default_data_dir() == app_paths.BASE_DIR
+
+
+def test_frozen_build_uses_user_data_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+    path = app_paths._default_data_dir()
+    assert not path.startswith(app_paths.BASE_DIR)
+    if os.name == "nt":
+        assert path == os.path.join(str(tmp_path), "Eyecare")
+    elif sys.platform != "darwin":
+        assert path == os.path.join(str(tmp_path), "eyecare")
+
+
+def test_env_override(monkeypatch, tmp_path):
+    monkeypatch.setattr(app_paths, "_data_dir", None)
+    monkeypatch.setenv("EYECARE_DATA_DIR", str(tmp_path / "data"))
+    assert app_paths.data_path("user_settings.json") == str(tmp_path / "data" / "user_settings.json")
+    assert os.path.isdir(tmp_path / "data")
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""资源包：生成后按名称和尺寸取回图片，缺少的缩放比例从源图片解码"""
+
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
+
+import asset_bundle
+from asset_bundle import APP_ICON, AssetBundle, build_bundle, bundle_specs, image_aspect_mode
+from reminder_types import get_reminder_type
+
+
+@pytest.fixture
+def bundle_file(qapp, tmp_path):
+    path = str(tmp_path / "assets.pak")
+    build_bundle(path, (1.0,), (16, 32))
+    return path
+
+
+def test_round_trip(bundle_file):
+    bundle = AssetBundle(bundle_file)
+    eye = get_reminder_type("eye")
+    _, _, width, height = eye.image_rect
+    image = bundle.image(eye.image, width, height, 1.0, image_aspect_mode(eye))
+    assert image is not None and not image.isNull()
+    # 保持宽高比时不超过图片区域
+    assert image.width() <= width and image.height() <= height
+    assert bundle.image(eye.image, width, height, 2.0, image_aspect_mode(eye)) is None
+    nearest = bundle.nearest_image(eye.image, width, height, 2.0, image_aspect_mode(eye))
+    assert nearest.devicePixelRatio() == 1.0
+    assert sorted(image.width() for image in bundle.icon_images(APP_ICON)) == [16, 32]
+    assert bundle.changed_sources() == []
+
+
+def test_missing_scale_decoded_from_source(bundle_file, monkeypatch):
+    monkeypatch.setattr(asset_bundle, "_bundle", AssetBundle(bundle_file))
+    monkeypatch.setattr(asset_bundle, "_bundle_loaded", True)
+    water = get_reminder_type("water")
+    _, _, width, height = water.image_rect
+    aspect = image_aspect_mode(water)
+
+    pixmap = asset_bundle.get_pixmap(water.image, width, height, 1.0, aspect)
+    assert (pixmap.width(), pixmap.height()) == (width, height)
+    pixmap = asset_bundle.get_pixmap(water.image, width, height, 2.0, aspect)
+    assert pixmap.devicePixelRatio() == 2.0
+    assert (pixmap.width(), pixmap.height()) == (width * 2, height * 2)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not.pak"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        AssetBundle(str(path))
+
+
+def load_bundle(monkeypatch, path):
+    """按 path 重新加载进程内共享的资源包"""
+    monkeypatch.setattr(asset_bundle, "bundle_path", lambda: path)
+    monkeypatch.setattr(asset_bundle, "_bundle", None)
+    monkeypatch.setattr(asset_bundle, "_bundle_loaded", False)
+    return asset_bundle.get_bundle()
+
+
+def test_stale_or_broken_bundle_is_ignored(qapp, tmp_path, monkeypatch):
+    # 用复制的图片生成资源包，记录的修改时间与程序目录中的源图片不同
+    copies = tmp_path / "copies"
+    for name in {spec[0] for spec in bundle_specs((1.0,), (16,))}:
+        os.makedirs(copies / os.path.dirname(name), exist_ok=True)
+        shutil.copy(os.path.join(asset_bundle.BASE_DIR, name), copies / name)
+    stale = str(tmp_path / "stale.pak")
+    build_bundle(stale, (1.0,), (16,), base_dir=str(copies))
+    assert AssetBundle(stale).changed_sources()
+    assert load_bundle(monkeypatch, stale) is None
+
+    broken = tmp_path / "broken.pak"
+    broken.write_bytes(b"EYEPAK01" + b"\xff" * 8)
+    assert load_bundle(monkeypatch, str(broken)) is None
+    assert load_bundle(monkeypatch, str(tmp_path / "missing.pak")) is None
+
+
+def test_nearest_scale_used_without_sources(bundle_file, tmp_path, monkeypatch):
+    # 打包后的程序没有对应尺寸的源图片时，用资源包中最接近的比例
+    load_bundle(monkeypatch, bundle_file)
+    monkeypatch.setattr(asset_bundle, "BASE_DIR", str(tmp_path / "frozen"))
+    posture = get_reminder_type("posture")
+    _, _, width, height = posture.image_rect
+    pixmap = asset_bundle.get_pixmap(posture.image, width, height, 2.0, image_aspect_mode(posture))
+    assert not pixmap.isNull()
+    assert pixmap.devicePixelRatio() == 1.0
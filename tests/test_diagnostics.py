@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""运行诊断：CPU 和内存分析报告"""
+
+import os
+import tracemalloc
+
+from diagnostics import Diagnostics
+
+
+def busy_work():
+    return sorted(str(i) for i in range(20000))
+
+
+def test_cpu_and_memory_reports_share_session_dir(tmp_path):
+    diagnostics = Diagnostics(report_root=str(tmp_path), frames=5)
+    assert diagnostics.run("cpu-start") == "CPU 分析已开始"
+    assert diagnostics.run("cpu-start") == "CPU 分析已在进行中"
+    assert diagnostics.run("mem-start") == "内存分析已开始"
+    assert "进行中" in diagnostics.run("status")
+    kept = busy_work()
+    busy_work()
+
+    cpu_reply = diagnostics.run("cpu-stop")
+    memory_reply = diagnostics.run("mem-stop")
+    cpu_path = cpu_reply.split(": ", 1)[1]
+    memory_path = memory_reply.split(": ", 1)[1]
+    assert os.path.basename(cpu_path) == "cpu.txt"
+    assert os.path.basename(memory_path) == "memory.txt"
+    session = os.path.dirname(cpu_path)
+    assert os.path.dirname(memory_path) == session
+    assert sorted(os.listdir(session)) == ["cpu.pstats", "cpu.txt", "memory.txt"]
+
+    with open(cpu_path, encoding="utf-8") as f:
+        cpu_report = f.read()
+    assert "busy_work" in cpu_report and "== 按自身耗时 ==" in cpu_report
+    with open(memory_path, encoding="utf-8") as f:
+        memory_report = f.read()
+    assert memory_report.startswith("内存分配对比")
+    assert "test_diagnostics.py" in memory_report
+    assert not tracemalloc.is_tracing()
+    assert len(kept) == 20000
+
+
+def test_stop_without_start_and_new_session(tmp_path):
+    diagnostics = Diagnostics(report_root=str(tmp_path), frames=5)
+    assert diagnostics.run("cpu-stop") == "CPU 分析没有在进行"
+    assert diagnostics.run("mem-stop") == "内存分析没有在进行"
+    assert diagnostics.run("bogus").startswith("未知的诊断命令")
+
+    first = diagnostics.run("dump").split(": ", 1)[1]
+    second = diagnostics.run("dump").split(": ", 1)[1]
+    # 没有进行中的分析时每次对象统计各用一个目录
+    assert os.path.basename(first) == "objects.txt"
+    assert os.path.dirname(first) != os.path.dirname(second)
+    with open(first, encoding="utf-8") as f:
+        assert "未开启内存分析" in f.read()
+
+
+def test_stop_all_writes_pending_reports(tmp_path):
+    diagnostics = Diagnostics(report_root=str(tmp_path), frames=5)
+    diagnostics.start_cpu()
+    diagnostics.start_memory()
+    paths = diagnostics.stop_all()
+    assert [os.path.basename(path) for path in paths] == ["cpu.txt", "memory.txt"]
+    assert not diagnostics.cpu_running and not diagnostics.memory_running
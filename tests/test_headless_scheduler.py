@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""无界面调度器：通知后端出错时写日志，不影响其他后端"""
+
+import asyncio
+
+import headless_scheduler
+from headless_scheduler import HeadlessScheduler
+from settings_manager import SettingsManager
+
+
+class _Recorder:
+    def __init__(self):
+        self.records = []
+
+    def info(self, message, **fields):
+        self.records.append(("info", message, fields))
+
+    def error(self, message, **fields):
+        self.records.append(("error", message, fields))
+
+
+class _Backend:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.notified = []
+
+    def notify(self, kinds):
+        if self.fail:
+            raise RuntimeError("boom")
+        self.notified.append(list(kinds))
+        return True
+
+    def close(self):
+        pass
+
+
+def test_backend_error_is_logged_not_printed(tmp_path, monkeypatch, capsys):
+    recorder = _Recorder()
+    monkeypatch.setattr(headless_scheduler, "log", recorder)
+    good = _Backend()
+    loop = asyncio.new_event_loop()
+    try:
+        scheduler = HeadlessScheduler([_Backend(fail=True), good], loop,
+                                      settings_manager=SettingsManager(str(tmp_path / "s.json")))
+        scheduler.on_reminders_due(["eye"])
+    finally:
+        loop.close()
+
+    assert good.notified == [["eye"]]
+    errors = [record for record in recorder.records if record[0] == "error"]
+    assert len(errors) == 1 and "boom" in errors[0][1]
+    assert errors[0][2] == {"kinds": ["eye"]}
+    captured = capsys.readouterr()
+    assert captured.out == "" and captured.err == ""
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""图片缓存：缩放尺寸、内存 LRU、磁盘缓存和源文件修改后失效"""
+
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
+
+from PyQt5.QtCore import Qt
+
+import image_cache
+from image_cache import ImageCache, PIXEL_FORMAT, decode_and_scale
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "water.jpg"
+    shutil.copy(os.path.join(ROOT_DIR, "drink_water.jpg"), path)
+    return str(path)
+
+
+def test_decode_and_scale(qapp, source):
+    image = decode_and_scale(source, 300, 200, 2.0, Qt.IgnoreAspectRatio)
+    assert (image.width(), image.height()) == (600, 400)
+    assert image.format() == PIXEL_FORMAT
+    assert decode_and_scale(source + ".missing", 10, 10) is None
+
+
+def test_memory_hit_returns_same_pixmap(qapp, source, tmp_path):
+    cache = ImageCache(disk_dir=str(tmp_path / "disk"))
+    first = cache.get_pixmap(source, 300, 200, 1.0, Qt.IgnoreAspectRatio)
+    assert (first.width(), first.height()) == (300, 200)
+    assert cache.get_pixmap(source, 300, 200, 1.0, Qt.IgnoreAspectRatio).cacheKey() == first.cacheKey()
+    assert cache.total_bytes == 300 * 200 * 4
+
+
+def test_disk_cache_skips_decoding(qapp, source, tmp_path, monkeypatch):
+    disk = str(tmp_path / "disk")
+    ImageCache(disk_dir=disk).get_pixmap(source, 120, 80, 1.0, Qt.IgnoreAspectRatio)
+    assert len(os.listdir(disk)) == 1
+
+    monkeypatch.setattr(image_cache, "decode_and_scale", lambda *args: pytest.fail("不应重新解码"))
+    pixmap = ImageCache(disk_dir=disk).get_pixmap(source, 120, 80, 1.0, Qt.IgnoreAspectRatio)
+    assert (pixmap.width(), pixmap.height()) == (120, 80)
+
+
+def test_modified_source_is_decoded_again(qapp, source, tmp_path):
+    cache = ImageCache(disk_dir=str(tmp_path / "disk"))
+    key = cache.make_key(source, 120, 80)
+    st = os.stat(source)
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cache.make_key(source, 120, 80) != key
+
+
+def test_lru_stays_within_budget(qapp, source, tmp_path):
+    cache = ImageCache(max_bytes=2 * 100 * 100 * 4, disk_dir="")
+    for size in (100, 99, 98):
+        cache.get_pixmap(source, size, size, 1.0, Qt.IgnoreAspectRatio)
+    assert cache.total_bytes <= cache.max_bytes
+    assert len(cache._entries) == 2
+    # 最早放入的被淘汰
+    assert all(key[2] != 100 for key in cache._entries)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""运行指标：Prometheus 文本格式和导出"""
+
+import socket
+
+import pytest
+
+from metrics import MetricsExporter, MetricsRegistry, parse_address, process_metrics
+
+
+def test_render_counters_and_gauges():
+    registry = MetricsRegistry()
+    registry.counter_func("eyecare_timer_wakeups_total", "定时器唤醒次数", lambda: 42)
+    registry.gauge_func("eyecare_next_reminder_seconds", "距下次提醒",
+                        lambda: [({"kind": "eye"}, 12.5), ({"kind": 'a"b'}, 3.0)])
+    registry.gauge_func("eyecare_skipped", "没有数据时不输出", lambda: None)
+    assert registry.render() == (
+        "# HELP eyecare_timer_wakeups_total 定时器唤醒次数\n"
+        "# TYPE eyecare_timer_wakeups_total counter\n"
+        "eyecare_timer_wakeups_total 42\n"
+        "# HELP eyecare_next_reminder_seconds 距下次提醒\n"
+        "# TYPE eyecare_next_reminder_seconds gauge\n"
+        'eyecare_next_reminder_seconds{kind="eye"} 12.5\n'
+        'eyecare_next_reminder_seconds{kind="a\\"b"} 3\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("eyecare_latency_seconds", "延迟", buckets=(0.1, 0.01, 1))
+    for value in (0.005, 0.05, 0.05, 0.5, 3.0):
+        latency.observe(value, kind="eye")
+    latency.observe(0.02, kind="water")
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP eyecare_latency_seconds 延迟", "# TYPE eyecare_latency_seconds histogram"]
+    assert lines[2:8] == [
+        'eyecare_latency_seconds_bucket{kind="eye",le="0.01"} 1',
+        'eyecare_latency_seconds_bucket{kind="eye",le="0.1"} 3',
+        'eyecare_latency_seconds_bucket{kind="eye",le="1"} 4',
+        'eyecare_latency_seconds_bucket{kind="eye",le="+Inf"} 5',
+        'eyecare_latency_seconds_sum{kind="eye"} 3.605',
+        'eyecare_latency_seconds_count{kind="eye"} 5',
+    ]
+    assert 'eyecare_latency_seconds_bucket{kind="water",le="0.01"} 0' in lines
+    assert 'eyecare_latency_seconds_count{kind="water"} 1' in lines
+
+
+def test_collector_error_does_not_break_output():
+    registry = MetricsRegistry()
+    registry.counter_func("broken_total", "出错", lambda: 1 / 0)
+    registry.counter_func("ok_total", "正常", lambda: 1)
+    lines = registry.render().splitlines()
+    assert lines[0].startswith("# broken_total 采集出错")
+    assert lines[-1] == "ok_total 1"
+
+
+def test_parse_address_only_accepts_loopback():
+    assert parse_address(":9464") == (socket.AF_INET, ("127.0.0.1", 9464))
+    assert parse_address("unix:/tmp/m.sock") == (socket.AF_UNIX, "/tmp/m.sock")
+    with pytest.raises(ValueError):
+        parse_address("0.0.0.0:9464")
+
+
+def test_exporter_serves_http_and_writes_snapshot(tmp_path):
+    registry = MetricsRegistry()
+    process_metrics(registry)
+    snapshot = tmp_path / "metrics.prom"
+    exporter = MetricsExporter(registry, listen="127.0.0.1:0", snapshot_file=str(snapshot))
+    exporter.start()
+    try:
+        with socket.create_connection(exporter.address, timeout=2) as conn:
+            conn.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := conn.recv(4096):
+                response += chunk
+        with socket.create_connection(exporter.address, timeout=2) as conn:
+            conn.sendall(b"GET /other HTTP/1.0\r\n\r\n")
+            missing = conn.recv(4096)
+    finally:
+        exporter.close()
+    header, _, body = response.decode("utf-8").partition("\r\n\r\n")
+    assert header.startswith("HTTP/1.0 200 OK")
+    assert "process_resident_memory_bytes " in body
+    assert missing.startswith(b"HTTP/1.0 404")
+    # 关闭时再写一次快照
+    assert "# TYPE eyecare_uptime_seconds gauge" in snapshot.read_text(encoding="utf-8")
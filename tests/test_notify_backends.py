@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""通知后端和 asyncio 驱动的调度核心：不依赖 Qt"""
+
+import asyncio
+import io
+import json
+import sys
+
+import pytest
+
+from headless_scheduler import HeadlessScheduler, create_backends
+from notify_backends import StdoutBackend, UnixSocketBackend
+from reminder_history import EVENT_FIRED, EVENT_SHOWN
+from scheduler_core import AsyncioTimer, SchedulerCore
+from settings_manager import SettingsManager
+
+unix_only = pytest.mark.skipif(sys.platform == "win32", reason="需要 Unix 套接字")
+
+
+class _History:
+    def __init__(self):
+        self.events = []
+
+    def record(self, kind, event):
+        self.events.append((kind, event))
+
+    def close(self):
+        pass
+
+
+def test_stdout_backend_prints_name_and_text():
+    stream = io.StringIO()
+    assert StdoutBackend(stream).notify(["eye", "water"]) is True
+    line = stream.getvalue()
+    assert line.count("\n") == 1
+    assert "眼睛休息、喝水提醒" in line and "喝点水吧" in line
+
+
+def test_socket_backend_without_clients_is_not_delivered(tmp_path):
+    backend = UnixSocketBackend(str(tmp_path / "eyecare.sock"))
+    assert backend.notify(["eye"]) is False
+
+
+@unix_only
+def test_socket_backend_broadcasts_json_lines(tmp_path):
+    path = str(tmp_path / "eyecare.sock")
+
+    async def scenario():
+        backend = UnixSocketBackend(path)
+        await backend.start()
+        reader, writer = await asyncio.open_unix_connection(path)
+        # 等服务端登记这个客户端
+        while not backend._writers:
+            await asyncio.sleep(0.01)
+        assert backend.notify(["water"]) is True
+        line = await asyncio.wait_for(reader.readline(), 2)
+        writer.close()
+        backend.close()
+        return json.loads(line)
+
+    message = asyncio.run(scenario())
+    assert message["event"] == "reminder"
+    assert message["kinds"] == ["water"]
+    assert message["texts"] == ["喝点水吧，对身体好哦！😘"]
+
+
+def test_shown_recorded_only_when_some_backend_delivers(tmp_path):
+    loop = asyncio.new_event_loop()
+    try:
+        history = _History()
+        scheduler = HeadlessScheduler([UnixSocketBackend(str(tmp_path / "none.sock"))], loop,
+                                      settings_manager=SettingsManager(str(tmp_path / "s.json")),
+                                      history=history)
+        scheduler.on_reminders_due(["eye"])
+        assert history.events == [("eye", EVENT_FIRED)]
+
+        # 套接字没有客户端时由终端输出兜底
+        scheduler.backends.append(StdoutBackend(io.StringIO()))
+        scheduler.on_reminders_due(["eye"])
+        assert history.events[1:] == [("eye", EVENT_FIRED), ("eye", EVENT_SHOWN)]
+    finally:
+        loop.close()
+
+
+def test_create_backends():
+    assert [type(b) for b in create_backends(None)] == [StdoutBackend]
+    backends = create_backends(["stdout", "socket:/tmp/x.sock"])
+    assert isinstance(backends[1], UnixSocketBackend) and backends[1].path == "/tmp/x.sock"
+    with pytest.raises(ValueError):
+        create_backends(["dbus"])
+
+
+def test_core_runs_on_asyncio_timer():
+    fired = []
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        core = SchedulerCore(fired.append, lambda callback: AsyncioTimer(callback, loop),
+                             coalesce_window=0)
+        core.add("eye", 50, first_delay_ms=20)
+        core.add("water", 1000)
+        core.start()
+        await asyncio.sleep(0.15)
+        core.stop()
+
+    asyncio.run(scenario())
+    assert 2 <= len(fired) <= 3
+    assert all(kinds == ["eye"] for kinds in fired)
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""守护进程的设置检查和套接字访问控制"""
+
+import asyncio
+import json
+import os
+import stat
+
+import pytest
+
+import reminder_daemon
+from reminder_daemon import ReminderDaemon, settings_errors
+
+
+class _Transport:
+    def __init__(self, pending=0):
+        self.pending = pending
+        self.aborted = False
+
+    def get_write_buffer_size(self):
+        return self.pending
+
+    def abort(self):
+        self.aborted = True
+
+
+class _Writer:
+    def __init__(self, pending=0):
+        self.data = b""
+        self.closed = False
+        self.transport = _Transport(pending)
+
+    def write(self, data):
+        self.data += data
+        self.transport.pending += len(data)
+
+    def is_closing(self):
+        return self.closed or self.transport.aborted
+
+    def close(self):
+        self.closed = True
+
+
+def test_settings_errors():
+    assert settings_errors({"eye_interval": 20, "posture_interval": 180}) == []
+    assert settings_errors([]) == ["设置必须是 JSON 对象"]
+    assert len(settings_errors({"eye_interval": 0})) == 1
+    assert len(settings_errors({"eye_interval": "20"})) == 1
+    assert len(settings_errors({"eye_interval": True})) == 1
+    assert len(settings_errors({"eye_interval": 121})) == 1
+    assert len(settings_errors({"display_time": 5, "__proto__": 1})) == 2
+
+
+def test_invalid_settings_are_not_saved(tmp_path):
+    daemon = ReminderDaemon(socket_path=str(tmp_path / "daemon.sock"), profile_dir=str(tmp_path))
+    writer = _Writer()
+    daemon._update_settings("alice", {"eye_interval": 20, "junk": "x"}, writer)
+    assert b'"error"' in writer.data
+    assert not (tmp_path / "alice.json").exists()
+
+    writer = _Writer()
+    daemon._update_settings("alice", {"eye_interval": 20}, writer)
+    assert b'"settings"' in writer.data
+    assert daemon.load_profile("alice") == {"eye_interval": 20}
+
+
+def _exchange(daemon, message):
+    """启动守护进程，以当前用户连接并发送一条消息，返回第一条回复"""
+    async def run():
+        await daemon.start()
+        try:
+            reader, writer = await asyncio.open_unix_connection(daemon.socket_path)
+            writer.write((json.dumps(message) + "\n").encode("utf-8"))
+            await writer.drain()
+            reply = json.loads(await asyncio.wait_for(reader.readline(), 5))
+            writer.close()
+            return reply
+        finally:
+            daemon.stop()
+
+    return asyncio.run(run())
+
+
+def test_socket_directory_is_private(tmp_path):
+    socket_path = tmp_path / "run" / "daemon.sock"
+    daemon = ReminderDaemon(socket_path=str(socket_path), profile_dir=str(tmp_path), socket_group="")
+    modes = {}
+
+    async def start_and_inspect():
+        await daemon.start()
+        modes["dir"] = stat.S_IMODE(os.stat(socket_path.parent).st_mode)
+        modes["sock"] = stat.S_IMODE(os.stat(socket_path).st_mode)
+        daemon.stop()
+
+    asyncio.run(start_and_inspect())
+    assert modes == {"dir": 0o700, "sock": 0o600}
+
+
+def test_shared_socket_directory_is_refused(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    daemon = ReminderDaemon(socket_path=str(shared / "daemon.sock"), profile_dir=str(tmp_path),
+                            socket_group="")
+    with pytest.raises(RuntimeError):
+        asyncio.run(daemon.start())
+
+
+def test_connections_without_peer_credentials_are_refused(tmp_path, monkeypatch):
+    monkeypatch.setattr(reminder_daemon, "peer_user", lambda writer: None)
+    daemon = ReminderDaemon(socket_path=str(tmp_path / "run" / "daemon.sock"),
+                            profile_dir=str(tmp_path), socket_group="", trust_client_user=False)
+    reply = _exchange(daemon, {"cmd": "status", "user": "bob"})
+    assert reply["event"] == "error"
+
+    daemon = ReminderDaemon(socket_path=str(tmp_path / "run" / "daemon.sock"),
+                            profile_dir=str(tmp_path), socket_group="", trust_client_user=True)
+    reply = _exchange(daemon, {"cmd": "status", "user": "bob"})
+    assert reply == {"event": "status", "user": "bob", "remaining": {}}
+
+
+def test_client_that_stops_reading_is_disconnected(tmp_path):
+    daemon = ReminderDaemon(socket_path=str(tmp_path / "daemon.sock"), profile_dir=str(tmp_path),
+                            buffer_limit=1024)
+    slow, fast = _Writer(), _Writer()
+    daemon.attach("alice", slow)
+    daemon.attach("alice", fast)
+    for _ in range(100):
+        daemon.send_reminder("alice", ["eye"])
+        fast.transport.pending = 0  # 这个客户端一直在读
+    assert slow.transport.aborted and slow.transport.pending <= 1024
+    assert not fast.is_closing() and fast.data.count(b"\n") == 100
+    daemon.stop()
+
+
+def test_unread_socket_buffer_stays_bounded(tmp_path):
+    daemon = ReminderDaemon(socket_path=str(tmp_path / "run" / "daemon.sock"),
+                            profile_dir=str(tmp_path), socket_group="", buffer_limit=16 * 1024)
+
+    async def run():
+        await daemon.start()
+        try:
+            reader, writer = await asyncio.open_unix_connection(daemon.socket_path)
+            writer.write(b'{"cmd": "hello"}\n')
+            await writer.drain()
+            user = None
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if daemon.users:
+                    user = next(iter(daemon.users))
+                    break
+            assert user is not None
+            # 客户端从不读取：内核缓冲区写满后守护进程断开连接并注销会话
+            for _ in range(20000):
+                if user not in daemon.users:
+                    break
+                daemon.send_reminder(user, ["eye", "water", "posture"])
+                await asyncio.sleep(0)
+            for _ in range(100):
+                if user not in daemon.users:
+                    break
+                await asyncio.sleep(0.01)
+            assert user not in daemon.users
+            writer.close()
+        finally:
+            daemon.stop()
+
+    asyncio.run(run())
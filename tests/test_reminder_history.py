@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""提醒事件历史的关闭"""
+
+import sqlite3
+import time
+
+from reminder_history import ReminderHistory, EVENT_FIRED
+
+
+def test_close_does_not_hang_when_writer_died(tmp_path):
+    # 路径是目录，后台线程连接数据库失败后退出，队列不再被取出
+    history = ReminderHistory(path=str(tmp_path), queue_size=2)
+    history._writer.join(5)
+    for _ in range(3):
+        history.record("eye", EVENT_FIRED)
+    started = time.monotonic()
+    history.close(timeout=0.2)
+    assert time.monotonic() - started < 1.0
+
+
+def test_close_flushes_queued_events(tmp_path):
+    history = ReminderHistory(path=str(tmp_path / "history.db"))
+    history.record("eye", EVENT_FIRED, ts=1000.0)
+    history.close()
+    with sqlite3.connect(str(tmp_path / "history.db")) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1
+
+
+def test_identical_events_in_same_millisecond_are_kept(tmp_path):
+    history = ReminderHistory(path=str(tmp_path / "history.db"))
+    for _ in range(3):
+        history.record("eye", EVENT_FIRED, ts=1000.0)
+    history.close()
+    history = ReminderHistory(path=str(tmp_path / "history.db"))
+    assert history.count("eye", 999, 1001, EVENT_FIRED) == 3
+    assert history.query("eye", 999, 1001) == [(1000.0, EVENT_FIRED)] * 3
+    history.close()
+
+
+def test_old_schema_is_migrated(tmp_path):
+    path = str(tmp_path / "history.db")
+    with sqlite3.connect(path) as conn:
+        conn.executescript("""
+            CREATE TABLE kinds (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+            CREATE TABLE events (kind INTEGER NOT NULL, ts INTEGER NOT NULL, event INTEGER NOT NULL,
+                                 PRIMARY KEY (kind, ts, event)) WITHOUT ROWID;
+            INSERT INTO kinds (id, name) VALUES (1, 'eye');
+            INSERT INTO events VALUES (1, 1000000, 1);
+        """)
+    conn.close()
+    history = ReminderHistory(path=path)
+    history.record("eye", EVENT_FIRED, ts=1000.0)
+    history.close()
+    history = ReminderHistory(path=path)
+    assert history.count("eye", 999, 1001, EVENT_FIRED) == 2
+    history.close()
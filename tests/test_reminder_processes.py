@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""提醒子进程监管的退出"""
+
+import sys
+import time
+
+from reminder_processes import ReminderProcessSupervisor
+
+
+def test_terminate_all_after_reaper_exit():
+    supervisor = ReminderProcessSupervisor(max_processes=3, lifetime=0, poll_interval=0.01)
+    assert supervisor.launch("eye", [sys.executable, "-c", "pass"])
+    deadline = time.monotonic() + 10
+    # 子进程退出后回收线程也会退出，并把 _reaper 置为 None
+    while supervisor._reaper is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert supervisor._reaper is None
+    supervisor.terminate_all(timeout=1.0)
+
+
+def test_terminate_all_while_reaping():
+    supervisor = ReminderProcessSupervisor(max_processes=3, lifetime=0, poll_interval=0.001)
+    for _ in range(5):
+        assert supervisor.launch("eye", [sys.executable, "-c", "import time; time.sleep(5)"])
+        time.sleep(0.02)
+        supervisor.terminate_all(timeout=2.0)
+        assert supervisor.count() == 0
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""用虚拟时钟重放提醒计划：触发次数、休眠唤醒策略、不漂移的重新排期和设置修改"""
+
+from reminder_simulator import ReminderSimulator, VirtualClock, VirtualTimer
+from scheduler_core import SchedulerCore
+
+START = 1_767_600_000.0
+DAY = 86400
+SETTINGS = {"eye_interval": 40, "water_interval": 30, "posture_interval": 60}
+
+
+def fire_counts(simulator):
+    counts = {}
+    for _, kinds in simulator.fired:
+        for kind in kinds:
+            counts[kind] = counts.get(kind, 0) + 1
+    return counts
+
+
+def simulate_suspend(resume_policy):
+    """运行 10 分钟后休眠 2 小时，唤醒后再运行 1 小时"""
+    simulator = ReminderSimulator(START, SETTINGS, coalesce_window=0, resume_policy=resume_policy)
+    simulator.core.max_sleep = 0  # 只在提醒到期时发现休眠，结果不依赖 config
+    simulator.run_until(START + 10 * 60)
+    simulator.suspend(2 * 3600)
+    simulator.run_until(simulator.clock.time() + 3600)
+    resumed = [detail for _, event, detail in simulator.timeline if event == "resumed"]
+    return simulator, resumed
+
+
+def test_fire_counts_over_a_week():
+    simulator = ReminderSimulator(START, SETTINGS, coalesce_window=0)
+    simulator.run_scenario(7 * DAY)
+    assert fire_counts(simulator) == {"eye": 7 * DAY // 2400, "water": 7 * DAY // 1800,
+                                      "posture": 7 * DAY // 3600}
+
+
+def test_coalescing_merges_nearby_reminders():
+    simulator = ReminderSimulator(START, SETTINGS, coalesce_window=0)
+    simulator.run_scenario(DAY)
+    merged = ReminderSimulator(START, SETTINGS, coalesce_window=60)
+    merged.run_scenario(DAY)
+    # 合并不丢失提醒，只减少弹出次数
+    assert fire_counts(merged) == fire_counts(simulator)
+    assert len(merged.fired) <= len(simulator.fired)
+
+
+def test_resume_fire_once():
+    simulator, resumed = simulate_suspend("fire_once")
+    assert len(resumed) == 1
+    overdue = set(resumed[0]["overdue"])
+    assert overdue == {"eye", "water", "posture"}
+    resume_batch = [kinds for ts, kinds in simulator.fired if ts > START + 10 * 60][0]
+    # 错过多次也只提醒一次，且一起显示
+    assert sorted(resume_batch) == sorted(overdue)
+
+
+def test_resume_skip():
+    simulator, resumed = simulate_suspend("skip")
+    assert len(resumed) == 1
+    assert set(resumed[0]["skipped"]) == {"eye", "water", "posture"}
+    skipped = [detail for _, event, detail in simulator.timeline if event == "skipped"]
+    assert set(skipped) == {"eye", "water", "posture"}
+    wake = [ts for ts, event, _ in simulator.timeline if event == "resumed"][0]
+    # 跳过的提醒不在唤醒时触发
+    assert all(ts > wake for ts, _ in simulator.fired if ts >= START + 10 * 60)
+
+
+def test_resume_spread():
+    simulator, resumed = simulate_suspend("spread")
+    assert len(resumed) == 1
+    wake = [ts for ts, event, _ in simulator.timeline if event == "resumed"][0]
+    after = [(ts, kinds) for ts, kinds in simulator.fired if ts >= wake][:3]
+    # 到期的提醒逐个显示，间隔不小于 spread_interval
+    assert [len(kinds) for _, kinds in after] == [1, 1, 1]
+    step = simulator.core.spread_interval
+    assert all(b[0] - a[0] >= step for a, b in zip(after, after[1:]))
+
+
+class _LateTimer(VirtualTimer):
+    """每次都晚 50 毫秒触发的定时器"""
+
+    __slots__ = ()
+
+    def start(self, delay):
+        super().start(delay + 0.05)
+
+
+def test_anchored_rearm_does_not_drift():
+    clock = VirtualClock(START)
+    clock.timer_factory = lambda callback: _LateTimer(clock, callback)
+    fired = []
+    core = SchedulerCore(lambda kinds: fired.append(clock.monotonic()), clock.timer_factory,
+                         coalesce_window=0, clock=clock.monotonic, wall_clock=clock.time)
+    core.max_sleep = 0
+    core.add("eye", 40 * 60 * 1000)
+    core.start()
+    clock.run_until(START + 30 * DAY)
+    # 最后一次计划在第 30 天整点，加上误差后落在模拟结束之后
+    assert len(fired) == 30 * DAY // 2400 - 1
+    # 每次触发都只比计划晚一个定时器误差，误差不累积
+    for index, ts in enumerate(fired, 1):
+        assert abs(ts - index * 2400 - 0.05) < 1e-6
+
+
+def test_update_settings_reschedules_only_changed_kinds():
+    simulator = ReminderSimulator(START, SETTINGS, coalesce_window=0)
+    simulator.run_until(START + 25 * 60)
+    before = {kind: simulator.core.remaining_ms(kind) for kind in simulator.intervals}
+    simulator.update_settings({"eye_interval": 20, "water_interval": 30})
+    rescheduled = simulator.timeline[-1][2]["rescheduled"]
+    assert rescheduled == ["eye"]
+    after = {kind: simulator.core.remaining_ms(kind) for kind in simulator.intervals}
+    assert after["water"] == before["water"]
+    assert after["posture"] == before["posture"]
+    # 保留已经过的 25 分钟：新间隔 20 分钟已到，立即到期
+    assert after["eye"] == 0
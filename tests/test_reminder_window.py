@@ -0,0 +1,54 @@
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
+
+from PyQt5.QtCore import Qt
+
+from reminder_types import get_reminder_type
+from reminder_window import ReminderWin
+from reminder_windows import ReminderWindowManager
+
+
+def test_reshow_during_fade_restarts_display(qapp):
+    manager = ReminderWindowManager(mode="inprocess", display_time=30, dismiss_mode="pool")
+    hidden = []
+    manager.on_hidden = hidden.append
+    manager.show_reminder("eye")
+    window = manager.windows["eye"]
+    qapp.processEvents()
+
+    window.fade_out()
+    window._dismiss_timer.stop()
+    window.setWindowOpacity(0.3)
+
+    # 淡出过程中同类提醒再次触发：淡出停止，窗口恢复不透明并重新计时
+    manager.show_reminder("eye")
+    assert window._fade.state() == window._fade.Stopped
+    assert window.windowOpacity() == pytest.approx(1.0)
+    assert window._dismiss_timer.isActive()
+    assert window._dismiss_timer.remainingTime() > 29000
+    assert window.isVisible() and not hidden
+
+    manager.close()
+    assert hidden == [["eye"]]
+
+
+def test_reshow_restarts_timer_for_combined(qapp):
+    manager = ReminderWindowManager(mode="inprocess", display_time=30, dismiss_mode="close")
+    manager.show_reminder("eye")
+    window = manager.windows["eye"]
+    window._dismiss_timer.start(10)
+    manager.show_combined(["eye", "water"])
+    assert window._dismiss_timer.remainingTime() > 29000
+    assert window.text_label.text().count(get_reminder_type("water").text) == 1
+    manager.close()
+
+
+def test_window_flags_follow_registry(qapp):
+    eye = ReminderWin(get_reminder_type("eye"))
+    water = ReminderWin(get_reminder_type("water"))
+    assert eye.windowFlags() & Qt.WindowStaysOnTopHint
+    assert water.windowFlags() & Qt.FramelessWindowHint
+    assert not water.windowFlags() & Qt.WindowStaysOnTopHint
+    eye.deleteLater()
+    water.deleteLater()
@@ -0,0 +1,35 @@
+import pytest
+
+from reminder_types import ReminderType
+from schedule_state import KIND_MAX_BYTES, ScheduleStateStore
+
+
+def test_long_kind_rejected_without_writing(tmp_path):
+    store = ScheduleStateStore(str(tmp_path / "state.bin"))
+    with pytest.raises(ValueError):
+        store.update("x" * (KIND_MAX_BYTES + 1), 100.0)
+    # 多字节字符不会被截断成半个字符
+    with pytest.raises(ValueError):
+        store.update("护" * 6, 100.0)
+    assert store.load() == {}
+    store.close()
+
+
+def test_kinds_up_to_limit_survive_reload(tmp_path):
+    path = str(tmp_path / "state.bin")
+    kinds = ["x" * KIND_MAX_BYTES, "护眼" * 2]
+    store = ScheduleStateStore(path)
+    for i, kind in enumerate(kinds):
+        store.update(kind, 100.0 + i, last_fired=50.0)
+    store.close()
+
+    store = ScheduleStateStore(path)
+    assert store.load() == {kinds[0]: (50.0, 100.0), kinds[1]: (50.0, 101.0)}
+    store.close()
+
+
+def test_registry_rejects_long_ids():
+    with pytest.raises(ValueError):
+        ReminderType(id="stretch_and_walk_x", name="", menu_text="", title="",
+                     default_interval=30, image="", text="", window_size=(1, 1),
+                     image_rect=(0, 0, 1, 1), text_rect=(0, 0, 1, 1))
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""调度核心在虚拟时钟上的行为"""
+
+from reminder_simulator import VirtualClock
+from scheduler_core import SchedulerCore
+
+START = 1_767_600_000.0  # 2026-01-05 附近的墙上时间
+MINUTE = 60 * 1000
+
+
+def make_core(clock, fired, **kwargs):
+    kwargs.setdefault("coalesce_window", 0)
+    return SchedulerCore(fired.append, timer_factory=clock.timer_factory,
+                         clock=clock.monotonic, wall_clock=clock.time, **kwargs)
+
+
+def test_tuple_keys_survive_resume():
+    """守护进程以 (用户, 类型) 为键，休眠唤醒后仍要继续提醒"""
+    clock = VirtualClock(START)
+    fired = []
+    resumed = []
+    core = make_core(clock, fired, resume_policy="fire_once",
+                     on_resume=lambda gap, overdue, skipped: resumed.append(overdue))
+    core.add(("alice", "eye"), 40 * MINUTE)
+    core.add(("bob", "water"), 30 * MINUTE)
+    core.start()
+
+    clock.run_until(START + 10 * 60)
+    clock.suspend(2 * 3600)
+    clock.run_until(START + 4 * 3600)
+
+    assert resumed and ("alice", "eye") in resumed[0]
+    kinds = [kind for batch in fired for kind in batch]
+    # 唤醒后定时器重新设置，提醒继续按间隔触发
+    assert kinds.count(("alice", "eye")) >= 3
+    assert kinds.count(("bob", "water")) >= 4
+
+
+def test_idle_wakeups_follow_deadlines():
+    """空闲时定时器只在提醒到期（和长间隔的休眠检查）时醒来"""
+    clock = VirtualClock(START)
+    fired = []
+    core = make_core(clock, fired)
+    core.max_sleep = 15 * 60
+    core.add("eye", 40 * MINUTE)
+    core.start()
+    clock.run_until(START + 86400)
+    assert len(fired) == 36
+    # 每个 40 分钟的间隔最多醒来 3 次（两次检查加一次到期）
+    assert core.wakeups <= len(fired) * 3
+
+
+def test_resume_detected_on_deadline_without_periodic_check():
+    """不额外检查时，休眠在下一个提醒到期时被发现"""
+    clock = VirtualClock(START)
+    fired = []
+    resumed = []
+    core = make_core(clock, fired, resume_policy="skip",
+                     on_resume=lambda gap, overdue, skipped: resumed.append((gap, skipped)))
+    core.max_sleep = 0
+    core.add("eye", 40 * MINUTE)
+    core.start()
+    clock.run_until(START + 30 * 60)
+    clock.suspend(3 * 3600)
+    clock.run_until(START + 3 * 3600 + 60 * 60)
+    # 一次是休眠前就设好的到期（发现休眠、跳过错过的提醒），一次是下一个到期
+    assert core.wakeups == 2 and fired == [["eye"]]
+    assert len(resumed) == 1
+    gap, skipped = resumed[0]
+    assert gap >= 3 * 3600 - 1
+    assert skipped == ["eye"]
+
+
+def test_single_timer_for_all_reminders():
+    clock = VirtualClock(START)
+    timers = []
+
+    def factory(callback):
+        timers.append(clock.timer_factory(callback))
+        return timers[-1]
+
+    core = SchedulerCore(lambda kinds: None, timer_factory=factory, coalesce_window=0,
+                         clock=clock.monotonic, wall_clock=clock.time)
+    for index, kind in enumerate(("eye", "water", "posture")):
+        core.add(kind, (20 + index) * MINUTE)
+    core.start()
+    clock.run_until(START + 3 * 3600)
+    assert len(timers) == 1
+
+
+def test_near_deadlines_are_coalesced():
+    clock = VirtualClock(START)
+    fired = []
+    core = make_core(clock, fired, coalesce_window=60)
+    core.max_sleep = 0
+    core.add("eye", 40 * MINUTE)
+    core.add("water", 40 * MINUTE + 30 * 1000)
+    core.add("posture", 60 * MINUTE)
+    core.start()
+    clock.run_until(START + 41 * 60)
+    # water 在合并窗口内，与 eye 一起提醒；posture 不受影响
+    assert fired == [["eye", "water"]]
+    clock.run_until(START + 61 * 60)
+    assert fired == [["eye", "water"], ["posture"]]
+
+
+def test_remove_and_remaining():
+    clock = VirtualClock(START)
+    fired = []
+    core = make_core(clock, fired)
+    core.add("eye", 40 * MINUTE)
+    core.add("water", 30 * MINUTE, first_delay_ms=5 * MINUTE)
+    core.start()
+    assert core.remaining_ms("water") == 5 * MINUTE
+    core.remove("water")
+    assert core.remaining_ms("water") == -1
+    assert core.kinds() == ["eye"]
+    clock.run_until(START + 3600)
+    assert fired == [["eye"]]
+
+
+def test_reschedule_keeps_elapsed_time():
+    clock = VirtualClock(START)
+    fired = []
+    core = make_core(clock, fired)
+    core.add("eye", 40 * MINUTE)
+    core.start()
+    clock.run_until(START + 30 * 60)
+    # 已经过 30 分钟，改为 35 分钟间隔后还剩 5 分钟
+    core.reschedule("eye", 35 * MINUTE, keep_elapsed=True)
+    assert core.remaining_ms("eye") == 5 * MINUTE
+    # 改得比已经过的时间还短时立即到期
+    core.reschedule("eye", 20 * MINUTE, keep_elapsed=True)
+    assert core.remaining_ms("eye") == 0
+    core.reschedule("eye", 20 * MINUTE)
+    assert core.remaining_ms("eye") == 20 * MINUTE
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""设置管理器的缓存和写入"""
+
+import gc
+import json
+import time
+import weakref
+
+import pytest
+
+import settings_manager
+from settings_manager import SettingsManager
+
+
+def make_manager(tmp_path):
+    return SettingsManager(str(tmp_path / "settings.json"), check_interval=0, write_delay=0)
+
+
+def test_own_writes_are_not_reparsed(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.save_settings({"eye_interval": 45})
+    assert manager.flush()
+    reads = manager.file_reads
+    manager.invalidate()
+    assert manager.load_settings()["eye_interval"] == 45
+    assert manager.file_reads == reads
+
+
+def test_external_writes_are_reparsed(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.save_settings({"eye_interval": 45})
+    manager.flush()
+    with open(manager.config_file, "w", encoding="utf-8") as f:
+        json.dump({"eye_interval": 20, "padding": "x" * 10}, f)
+    manager.invalidate()
+    assert manager.load_settings()["eye_interval"] == 20
+
+
+def test_forced_reload_rereads_file(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.save_settings({"eye_interval": 45})
+    manager.flush()
+    manager.load_settings()
+    reads = manager.file_reads
+    manager.invalidate(force=True)
+    manager.load_settings()
+    assert manager.file_reads == reads + 1
+
+
+def test_unused_managers_are_collected(tmp_path):
+    manager = make_manager(tmp_path)
+    ref = weakref.ref(manager)
+    del manager
+    gc.collect()
+    assert ref() is None
+
+
+def test_managers_that_saved_are_collected(tmp_path):
+    manager = SettingsManager(str(tmp_path / "settings.json"), check_interval=0, write_delay=0.05)
+    manager.save_settings({"eye_interval": 45})
+    writer = manager._writer
+    ref = weakref.ref(manager)
+    # 写入线程写完后退出，不再引用管理器
+    writer.join(5)
+    assert not writer.is_alive()
+    assert json.loads((tmp_path / "settings.json").read_text(encoding="utf-8")) == {"eye_interval": 45}
+    del manager
+    gc.collect()
+    assert ref() is None
+    assert all(m is not None and m.config_file != str(tmp_path / "settings.json")
+               for m in settings_manager._managers)
+
+
+def test_writer_restarts_for_later_saves(tmp_path):
+    manager = SettingsManager(str(tmp_path / "settings.json"), check_interval=0, write_delay=0.05)
+    manager.save_settings({"eye_interval": 45})
+    manager._writer.join(5)
+    manager.save_settings({"eye_interval": 30})
+    manager.save_settings({"eye_interval": 25})
+    deadline = time.monotonic() + 5
+    while manager._writer is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert manager.file_writes == 2
+    assert json.loads((tmp_path / "settings.json").read_text(encoding="utf-8")) == {"eye_interval": 25}
+
+
+def test_snapshot_is_read_only_and_cached(tmp_path):
+    manager = SettingsManager(str(tmp_path / "settings.json"), check_interval=60, write_delay=0)
+    manager.save_settings({"eye_interval": 45})
+    manager.flush()
+    snapshot = manager.snapshot()
+    with pytest.raises(TypeError):
+        snapshot["eye_interval"] = 1
+    # 检查间隔内外部修改不会被读到，也不会重新解析
+    (tmp_path / "settings.json").write_text('{"eye_interval": 20, "x": 1}', encoding="utf-8")
+    reads = manager.file_reads
+    assert manager.get_setting("eye_interval") == 45
+    assert manager.file_reads == reads
+    assert manager.get_setting("display_time") == 5
+
+
+def test_saves_within_delay_are_written_once(tmp_path):
+    manager = SettingsManager(str(tmp_path / "settings.json"), check_interval=0, write_delay=0.2)
+    for minutes in (41, 42, 43):
+        manager.save_settings({"eye_interval": minutes})
+    # 快照立即更新，文件还没写
+    assert manager.load_settings()["eye_interval"] == 43
+    assert not (tmp_path / "settings.json").exists()
+    assert manager.flush()
+    assert manager.file_writes == 1
+
+
+def test_transaction_writes_once_and_rolls_back(tmp_path):
+    manager = make_manager(tmp_path)
+    with manager.transaction() as settings:
+        settings["eye_interval"] = 45
+        settings["water_interval"] = 25
+    manager.flush()
+    assert manager.file_writes == 1
+    with pytest.raises(RuntimeError):
+        with manager.transaction() as settings:
+            settings["eye_interval"] = 10
+            raise RuntimeError
+    manager.flush()
+    assert manager.file_writes == 1
+    assert manager.load_settings()["eye_interval"] == 45
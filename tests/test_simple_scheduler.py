@@ -0,0 +1,109 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
+
+from reminder_simulator import VirtualClock
+from reminder_types import REMINDER_TYPES
+from reminder_windows import ReminderWindowManager
+from scheduler_core import SchedulerCore, intervals_from_settings, start_schedule
+from settings_manager import SettingsManager
+from simple_scheduler import SimpleScheduler
+
+
+def make_scheduler(dismiss_mode="pool"):
+    """只带提醒窗口管理器的调度器替身，用于测试内存整理"""
+    scheduler = SimpleNamespace(note_activity=lambda: None)
+    scheduler.reminder_windows = ReminderWindowManager(mode="inprocess", display_time=0,
+                                                       dismiss_mode=dismiss_mode)
+    return scheduler
+
+
+def test_trim_after_dismiss_keeps_pooled_windows(qapp):
+    scheduler = make_scheduler()
+    manager = scheduler.reminder_windows
+    manager.show_reminder("eye")
+    window = manager.windows["eye"]
+    window.hide()
+
+    SimpleScheduler.trim_memory(scheduler, drop_windows=False)
+    assert manager.windows.get("eye") is window
+    assert not window._image_loaded
+
+    SimpleScheduler.trim_memory(scheduler)
+    assert "eye" not in manager.windows
+
+
+def test_trim_skipped_while_reminder_visible(qapp):
+    scheduler = make_scheduler()
+    manager = scheduler.reminder_windows
+    manager.show_reminder("water")
+    assert "稍后" in SimpleScheduler.trim_memory(scheduler)
+    assert "water" in manager.windows
+    manager.close()
+
+
+class _Tray:
+    def __init__(self):
+        self.messages = []
+
+    def showMessage(self, title, text, *args):
+        self.messages.append(title)
+
+
+def make_reloading_scheduler(tmp_path, clock):
+    """只带设置文件监视和调度核心的调度器（不创建托盘和窗口）"""
+    scheduler = SimpleScheduler.__new__(SimpleScheduler)
+    scheduler.settings_manager = SettingsManager(str(tmp_path / "settings.json"),
+                                                 check_interval=0, write_delay=0)
+    scheduler.settings_manager.save_settings({"eye_interval": 40, "water_interval": 30})
+    scheduler.settings_manager.flush()
+    scheduler.settings = scheduler.settings_manager.load_settings()
+    scheduler.intervals = intervals_from_settings(scheduler.settings, REMINDER_TYPES)
+    scheduler.engine = SchedulerCore(lambda kinds: None, timer_factory=clock.timer_factory,
+                                     coalesce_window=0, clock=clock.monotonic, wall_clock=clock.time)
+    start_schedule(scheduler.engine, scheduler.intervals, now=clock.time())
+    scheduler.reminder_windows = SimpleNamespace(set_display_time=lambda seconds: None)
+    scheduler.tray_icon = _Tray()
+    scheduler.watch_settings_file()
+    return scheduler
+
+
+def wait_for(qapp, condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+def test_external_edit_reschedules_only_changed_reminders(qapp, tmp_path):
+    clock = VirtualClock(1_767_600_000.0)
+    scheduler = make_reloading_scheduler(tmp_path, clock)
+    clock.run_until(clock.time() + 10 * 60)
+    eye_before = scheduler.engine.remaining_ms("eye")
+
+    # 其他程序原子替换设置文件，只改了喝水间隔
+    temp = tmp_path / "settings.json.new"
+    temp.write_text(json.dumps({"eye_interval": 40, "water_interval": 15}), encoding="utf-8")
+    temp.replace(tmp_path / "settings.json")
+
+    assert wait_for(qapp, lambda: scheduler.intervals["water"] == 15)
+    assert scheduler.engine.remaining_ms("eye") == eye_before
+    # 已经过 10 分钟，改为 15 分钟后还剩 5 分钟
+    assert scheduler.engine.remaining_ms("water") == 5 * 60 * 1000
+    assert scheduler.tray_icon.messages == ["设置已重新加载"]
+
+
+def test_own_save_does_not_reload(qapp, tmp_path):
+    clock = VirtualClock(1_767_600_000.0)
+    scheduler = make_reloading_scheduler(tmp_path, clock)
+    reads = scheduler.settings_manager.file_reads
+    scheduler.settings_manager.save_settings(dict(scheduler.settings, display_time=9))
+    scheduler.settings_manager.flush()
+    wait_for(qapp, lambda: False, timeout=0.5)
+    assert scheduler.settings_manager.file_reads == reads
+    assert scheduler.tray_icon.messages == []
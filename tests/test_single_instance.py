@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""单实例锁和命令转发"""
+
+import json
+import threading
+import time
+
+import pytest
+
+import single_instance
+
+
+@pytest.fixture
+def guard():
+    guard = single_instance.acquire()
+    assert guard is not None
+    yield guard
+    guard.close()
+
+
+def test_second_instance_cannot_lock(guard):
+    assert single_instance.acquire() is None
+    guard.close()
+    again = single_instance.acquire()
+    assert again is not None
+    again.close()
+
+
+def test_command_forwarded_to_running_instance(guard):
+    received = []
+    guard.serve(lambda command, args: received.append((command, args)) or "已显示")
+    assert single_instance.send_command(["trigger", "eye"]) == (True, "已显示")
+    assert received == [("trigger", ["eye"])]
+
+
+def test_command_waits_for_slow_startup(guard):
+    # 拿到锁后立即监听，但调度器还没启动完成
+    guard.serve()
+    result = {}
+    sender = threading.Thread(target=lambda: result.update(reply=single_instance.send_command(["status"])))
+    sender.start()
+    time.sleep(2.5)  # 比连接重试的时间长
+    assert sender.is_alive()
+    guard.serve(lambda command, args: f"{command} ok")
+    sender.join(5)
+    assert result["reply"] == (True, "status ok")
+
+
+def test_wrong_token_is_rejected(guard):
+    guard.serve(lambda command, args: "ok")
+    with open(single_instance.INFO_FILE, "r", encoding="utf-8") as f:
+        info = json.load(f)
+    info["token"] = "0" * 32
+    with open(single_instance.INFO_FILE, "w", encoding="utf-8") as f:
+        json.dump(info, f)
+    ok, reply = single_instance.send_command(["status"])
+    assert not ok and reply == "令牌无效"
+
+
+def test_parse_command():
+    assert single_instance.parse_command(["--fast-start", "trigger", "eye"]) == ["trigger", "eye"]
+    with pytest.raises(SystemExit):
+        single_instance.parse_command(["bogus"])
+
+
+def test_acquire_or_forward_forwards_to_running_instance(guard, capsys):
+    guard.serve(lambda command, args: f"{command} {' '.join(args)}")
+    with pytest.raises(SystemExit) as exit_info:
+        single_instance.acquire_or_forward(["trigger", "water"])
+    assert exit_info.value.code == 0
+    assert capsys.readouterr().out == "trigger water\n"
+
+
+def test_acquire_or_forward_without_running_instance(monkeypatch, capsys):
+    # 真实进程退出时会释放锁，这里手动关闭
+    acquired = []
+    acquire = single_instance.acquire
+    monkeypatch.setattr(single_instance, "acquire", lambda: acquired.append(acquire()) or acquired[-1])
+    with pytest.raises(SystemExit) as exit_info:
+        single_instance.acquire_or_forward(["status"])
+    assert exit_info.value.code == 1
+    assert "没有在运行" in capsys.readouterr().out
+    acquired.pop().close()
+
+    # trigger 命令会启动新实例，并立即开始监听后续命令
+    guard, command = single_instance.acquire_or_forward(["trigger", "eye"])
+    try:
+        assert command == ["trigger", "eye"]
+        guard.serve(lambda command, args: "ok")
+        assert single_instance.send_command(["status"]) == (True, "ok")
+    finally:
+        guard.close()
+
+
+def test_send_command_gives_up_without_instance():
+    ok, reply = single_instance.send_command(["status"], timeout=0.2)
+    assert not ok and reply.startswith("无法连接")
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""分层时间轮和基于时间轮的调度核心"""
+
+import random
+
+from reminder_simulator import VirtualClock
+from scheduler_core import SchedulerCore, WheelSchedulerCore
+from timing_wheel import TimingWheel
+
+
+def drain(wheel, last, first=1):
+    """逐刻度推进到第 last 个刻度，返回 (刻度, 键) 列表"""
+    fired = []
+    for tick in range(first, last + 1):
+        fired.extend((tick, entry.key) for entry in wheel.advance(tick * wheel.tick))
+    return fired
+
+
+def test_entries_expire_on_their_tick():
+    wheel = TimingWheel()
+    wheel.insert("a", 3)
+    wheel.insert("b", 1)
+    wheel.insert("c", 2.5)  # 向上取整到第 3 个刻度
+    assert len(wheel) == 3
+    assert drain(wheel, 5) == [(1, "b"), (3, "a"), (3, "c")]
+    assert len(wheel) == 0
+
+
+def test_cascade_matches_reference():
+    # 很小的轮子（每层 4 槽、3 层）让级联频繁发生
+    wheel = TimingWheel(bits=2, levels=3)
+    rng = random.Random(7)
+    delays = {f"k{i}": rng.randint(1, 63) for i in range(200)}
+    for key, delay in delays.items():
+        wheel.insert(key, delay)
+    fired = drain(wheel, 64)
+    assert sorted(fired) == sorted((delay, key) for key, delay in delays.items())
+
+
+def test_delay_beyond_range_waits_in_top_level():
+    wheel = TimingWheel(bits=2, levels=2)  # 范围 15 个刻度
+    wheel.insert("far", 40)
+    assert drain(wheel, 39) == []
+    assert drain(wheel, 40, first=40) == [(40, "far")]
+
+
+def test_cancel_and_reschedule():
+    wheel = TimingWheel(bits=2, levels=3)
+    a = wheel.insert("a", 5)
+    b = wheel.insert("b", 20)
+    wheel.cancel(a)
+    wheel.cancel(a)  # 重复取消忽略
+    assert not a.active and len(wheel) == 1
+    wheel.reschedule(b, 2)
+    wheel.reschedule(a, 30)  # 已取消的定时项重新加入
+    assert len(wheel) == 2
+    assert drain(wheel, 40) == [(2, "b"), (30, "a")]
+
+
+def test_next_expiry():
+    wheel = TimingWheel(tick=0.5, bits=2, levels=3, start=100.0)
+    assert wheel.next_expiry() is None
+    wheel.insert("a", 1.0)
+    assert wheel.next_expiry() == 101.0
+    wheel.advance(101.0)
+    wheel.insert("b", 10.0)
+    # 第 0 层为空时返回下一次级联的时间
+    assert wheel.next_expiry() == 102.0
+
+
+def test_advance_without_entries_jumps():
+    wheel = TimingWheel()
+    assert wheel.advance(1_000_000) == []
+    assert wheel.current == 1_000_000
+    wheel.insert("a", 1)
+    assert drain(wheel, 1_000_001, first=1_000_001) == [(1_000_001, "a")]
+
+
+def run_core(core_class, clock, hours, **kwargs):
+    fired = []
+    core = core_class(fired.append, timer_factory=clock.timer_factory, clock=clock.monotonic, **kwargs)
+    core.add("eye", 20 * 60 * 1000)
+    core.add("water", 45 * 60 * 1000)
+    core.add("posture", 30 * 60 * 1000)
+    core.start()
+    clock.run_until(clock.time() + hours * 3600)
+    core.stop()
+    return core, fired
+
+
+def test_wheel_core_fires_like_heap_core():
+    start = 1_767_600_000.0
+    _, heap_fired = run_core(SchedulerCore, VirtualClock(start), 8, coalesce_window=0)
+    wheel_core, wheel_fired = run_core(WheelSchedulerCore, VirtualClock(start), 8)
+    assert wheel_fired == heap_fired
+    assert sum(kinds.count("eye") for kinds in wheel_fired) == 8 * 3
+    assert sum(kinds.count("water") for kinds in wheel_fired) == 8 * 60 // 45
+    assert sum(kinds.count("posture") for kinds in wheel_fired) == 8 * 2
+    # 同一刻度到期的提醒合并为一次回调
+    assert ["eye", "posture"] in wheel_fired or ["posture", "eye"] in wheel_fired
+    # 级联只在第 0 层转完一圈时多醒一次
+    assert wheel_core.wakeups <= len(wheel_fired) + 8 * 3600 // 256 + 1
+
+
+def test_wheel_core_reschedule_keeps_elapsed():
+    clock = VirtualClock(1_767_600_000.0)
+    core = WheelSchedulerCore(lambda kinds: None, timer_factory=clock.timer_factory,
+                              clock=clock.monotonic)
+    core.add("eye", 20 * 60 * 1000)
+    core.start()
+    clock.run_until(clock.time() + 5 * 60)
+    core.reschedule("eye", 30 * 60 * 1000, keep_elapsed=True)
+    assert core.remaining_ms("eye") == 25 * 60 * 1000
+    core.remove("eye")
+    assert core.remaining_ms("eye") == -1 and core.kinds() == []
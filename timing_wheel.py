@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分层时间轮 - 管理大量定时提醒的数据结构
+
+每层有 2^bits 个槽，第 0 层一个槽对应一个刻度，第 n 层一个槽对应 2^(bits*n) 个刻度。
+定时项按到期刻度放进能容纳它的最低一层；低层转完一圈时，把高层当前槽中的定时项
+重新分配到低层（级联）。每个槽是一个侵入式双向链表，插入、取消和重新排期都是 O(1)，
+每个刻度到期的定时项一次取出。
+
+定时项只有四个字段（__slots__），不另外建索引；调用方保存 insert() 返回的定时项，
+用它来取消或重新排期。
+"""
+
+import math
+
+
+class WheelEntry:
+    """时间轮中的一个定时项（同时是所在槽链表的节点）"""
+
+    __slots__ = ("key", "deadline", "prev", "next")
+
+    def __init__(self, key=None, deadline=0):
+        self.key = key
+        self.deadline = deadline  # 到期刻度
+        self.prev = None          # 不在任何槽中时为 None
+        self.next = None
+
+    @property
+    def active(self):
+        return self.prev is not None
+
+
+class TimingWheel:
+    """分层时间轮
+
+    tick: 一个刻度的秒数；bits: 每层槽数的位数；levels: 层数。
+    默认 1 秒一个刻度、4 层 256 槽，可表示约 136 年，超出的定时项在最高层循环等待。
+    """
+
+    def __init__(self, tick=1.0, bits=8, levels=4, start=0.0):
+        self.tick = tick
+        self.bits = bits
+        self.levels = levels
+        self.mask = (1 << bits) - 1
+        self.start = start
+        self.current = 0  # 已处理到的刻度
+        self._count = 0
+        self._max_delta = (1 << (bits * levels)) - 1
+        # 每个槽是一个带哨兵的环形双向链表
+        self._slots = []
+        for _ in range(levels << bits):
+            head = WheelEntry()
+            head.prev = head.next = head
+            self._slots.append(head)
+
+    def __len__(self):
+        return self._count
+
+    def ticks(self, seconds):
+        """把时长（秒）换算为刻度数（向上取整，至少为 1）"""
+        return max(1, math.ceil(seconds / self.tick - 1e-9))
+
+    def time_of(self, tick):
+        """刻度对应的时间（秒）"""
+        return self.start + tick * self.tick
+
+    # ---- 插入与取消 ----
+
+    def _link(self, entry):
+        deadline = entry.deadline
+        if deadline < self.current:
+            deadline = entry.deadline = self.current
+        delta = min(deadline - self.current, self._max_delta)
+        level = 0
+        while delta >> (self.bits * (level + 1)) and level < self.levels - 1:
+            level += 1
+        if level == self.levels - 1 and entry.deadline - self.current > self._max_delta:
+            # 超出时间轮范围：先放在最高层最远的槽，级联时再重新分配
+            deadline = self.current + self._max_delta
+        index = (deadline >> (self.bits * level)) & self.mask
+        head = self._slots[(level << self.bits) + index]
+        tail = head.prev
+        entry.prev = tail
+        entry.next = head
+        tail.next = entry
+        head.prev = entry
+
+    @staticmethod
+    def _unlink(entry):
+        entry.prev.next = entry.next
+        entry.next.prev = entry.prev
+        entry.prev = entry.next = None
+
+    def insert(self, key, delay):
+        """添加一个 delay 秒后到期的定时项，返回定时项"""
+        entry = WheelEntry(key, self.current + self.ticks(delay))
+        self._link(entry)
+        self._count += 1
+        return entry
+
+    def cancel(self, entry):
+        """取消定时项（已到期或已取消的定时项忽略）"""
+        if entry.prev is not None:
+            self._unlink(entry)
+            self._count -= 1
+
+    def reschedule(self, entry, delay):
+        """把定时项改为 delay 秒后到期（已到期或已取消的定时项重新加入）"""
+        if entry.prev is not None:
+            self._unlink(entry)
+        else:
+            self._count += 1
+        entry.deadline = self.current + self.ticks(delay)
+        self._link(entry)
+
+    def schedule_at(self, entry, when):
+        """把定时项安排在时间 when（秒）到期，未在时间轮中的定时项会被加入"""
+        if entry.prev is not None:
+            self._unlink(entry)
+        else:
+            self._count += 1
+        entry.deadline = max(self.current + 1, math.ceil((when - self.start) / self.tick - 1e-9))
+        self._link(entry)
+
+    # ---- 推进 ----
+
+    def _take(self, head):
+        """取出一个槽中的全部定时项"""
+        entries = []
+        entry = head.next
+        while entry is not head:
+            following = entry.next
+            entry.prev = entry.next = None
+            entries.append(entry)
+            entry = following
+        head.prev = head.next = head
+        return entries
+
+    def _cascade(self, tick):
+        """第 0 层转完一圈时，把高层当前槽中的定时项重新分配到低层"""
+        for level in range(1, self.levels):
+            index = (tick >> (self.bits * level)) & self.mask
+            for entry in self._take(self._slots[(level << self.bits) + index]):
+                self._link(entry)
+            if index:
+                break
+
+    def advance(self, now):
+        """推进到时间 now（秒），返回期间到期的定时项列表（按刻度顺序）"""
+        target = int((now - self.start) / self.tick + 1e-9)
+        expired = []
+        while self.current < target:
+            if not self._count:
+                # 没有定时项时直接跳到目标刻度
+                self.current = target
+                break
+            self.current += 1
+            tick = self.current
+            if not tick & self.mask:
+                self._cascade(tick)
+            due = self._take(self._slots[tick & self.mask])
+            if due:
+                self._count -= len(due)
+                expired.extend(due)
+        return expired
+
+    def next_expiry(self):
+        """下一次需要调用 advance 的时间（秒），没有定时项时返回 None
+
+        在第 0 层找到的槽是准确的到期时间；第 0 层为空时返回下一次级联的时间。
+        """
+        if not self._count:
+            return None
+        for offset in range(1, self.mask + 2):
+            tick = self.current + offset
+            if not tick & self.mask:
+                return self.time_of(tick)
+            head = self._slots[tick & self.mask]
+            if head.next is not head:
+                return self.time_of(tick)
+        return self.time_of(self.current + 1)